@@ -0,0 +1,210 @@
+"""Arquivamento de eventos encerrados em arquivos compactados.
+
+Cada tabela do evento vira um arquivo <tabela>.jsonl.gz, com contagem e
+sha256. A cópia durável fica no próprio banco, na tabela arquivo_evento
+(migração 13), porque o disco do servidor pode ser apagado a cada
+reinício; a pasta arquivo/evento_<id>/ é só uma cópia local, refeita a
+partir do banco quando falta. Só depois de gravada e conferida a cópia no
+banco as linhas do evento saem das tabelas operacionais. As consultas e
+gravações passam pelo disjuntor de banco.py (BancoIndisponivel sem banco).
+"""
+import base64
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+
+from banco import buscar_em_paginas, executar_escrita, executar_leitura
+
+PASTA_ARQUIVO = Path("arquivo")
+
+# Caracteres base64 por linha de arquivo_evento: mantém cada envio pequeno
+TAMANHO_PARTE = 512 * 1024
+
+TABELAS_ARQUIVADAS = ['caixa', 'estoque', 'estornos_caixa', 'historico_pagamentos']
+
+# Tabelas filhas saem antes das tabelas que elas referenciam
+ORDEM_EXCLUSAO = ['estornos_caixa', 'estoque', 'historico_pagamentos', 'caixa']
+
+# --- Arquivos JSONL compactados ---
+
+
+def gravar_jsonl_gz(caminho, linhas):
+    """Grava as linhas como JSON por linha em gzip; retorna (quantidade, sha256)"""
+    caminho = Path(caminho)
+    temporario = caminho.with_suffix(caminho.suffix + ".tmp")
+    quantidade = 0
+    with gzip.open(temporario, "wt", encoding="utf-8") as arquivo:
+        for linha in linhas:
+            arquivo.write(json.dumps(linha, ensure_ascii=False, default=str))
+            arquivo.write("\n")
+            quantidade += 1
+    os.replace(temporario, caminho)
+    return quantidade, calcular_sha256(caminho)
+
+
+def ler_jsonl_gz(caminho):
+    """Lê, uma a uma, as linhas de um arquivo JSONL compactado"""
+    with gzip.open(caminho, "rt", encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                yield json.loads(linha)
+
+
+def calcular_sha256(caminho):
+    """sha256 do conteúdo do arquivo, lido em blocos"""
+    resumo = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1024 * 1024), b""):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+# --- Arquivamento ---
+
+
+def buscar_linhas_evento(cliente, tabela, evento_id, tamanho_pagina=1000):
+    """Busca em páginas todas as linhas de uma tabela no evento"""
+    return buscar_em_paginas(
+        lambda: cliente.table(tabela).select('*').eq('evento_id', evento_id).order('id'),
+        tamanho_pagina)
+
+
+def gravar_copia_no_banco(cliente, evento_id, tabela, caminho, info, arquivado_em):
+    """Grava o arquivo compactado em arquivo_evento, em partes; um reenvio sobrescreve as partes"""
+    conteudo = base64.b64encode(Path(caminho).read_bytes()).decode("ascii")
+    partes = [conteudo[inicio:inicio + TAMANHO_PARTE]
+              for inicio in range(0, len(conteudo), TAMANHO_PARTE)]
+    for numero, parte in enumerate(partes):
+        executar_escrita(cliente.table('arquivo_evento').upsert({
+            'evento_id': evento_id, 'tabela': tabela, 'parte': numero,
+            'linhas': info['linhas'], 'sha256': info['sha256'],
+            'conteudo': parte, 'arquivado_em': arquivado_em,
+        }, on_conflict='evento_id,tabela,parte'))
+    # Partes que sobraram de uma tentativa anterior com outro conteúdo
+    executar_escrita(cliente.table('arquivo_evento').delete().eq('evento_id', evento_id).eq(
+        'tabela', tabela).gte('parte', len(partes)))
+
+
+def ler_copia_no_banco(cliente, evento_id, tabela):
+    """Conteúdo do arquivo compactado guardado em arquivo_evento"""
+    partes = executar_leitura(cliente.table('arquivo_evento').select('conteudo').eq(
+        'evento_id', evento_id).eq('tabela', tabela).order('parte')).data
+    return base64.b64decode("".join(parte['conteudo'] for parte in partes))
+
+
+def arquivar_evento(cliente, evento, pasta=PASTA_ARQUIVO, tamanho_lote=500):
+    """
+    Move caixas, estoque, estornos e histórico de pagamentos de um evento
+    encerrado para arquivos compactados guardados no banco e os remove das
+    tabelas operacionais. Retorna o manifesto.
+    """
+    if not evento.get('encerrado'):
+        raise ValueError("Só é possível arquivar eventos encerrados")
+
+    pasta_evento = Path(pasta) / f"evento_{evento['id']}"
+    pasta_evento.mkdir(parents=True, exist_ok=True)
+
+    manifesto = {
+        'evento': evento,
+        'arquivado_em': datetime.now(timezone.utc).isoformat(),
+        # Arquivos anteriores a esta marca guardam os valores em reais
+        'valores_em_centavos': True,
+        'tabelas': {},
+    }
+    ids_por_tabela = {}
+
+    for tabela in TABELAS_ARQUIVADAS:
+        linhas = buscar_linhas_evento(cliente, tabela, evento['id'])
+        nome_arquivo = f"{tabela}.jsonl.gz"
+        quantidade, sha256 = gravar_jsonl_gz(pasta_evento / nome_arquivo, linhas)
+        manifesto['tabelas'][tabela] = {
+            'arquivo': nome_arquivo, 'linhas': quantidade, 'sha256': sha256}
+        ids_por_tabela[tabela] = [linha['id'] for linha in linhas]
+
+    for tabela, info in manifesto['tabelas'].items():
+        gravar_copia_no_banco(cliente, evento['id'], tabela, pasta_evento / info['arquivo'],
+                              info, manifesto['arquivado_em'])
+
+    # Confere a cópia do banco antes de apagar qualquer linha
+    for tabela, info in manifesto['tabelas'].items():
+        conteudo = ler_copia_no_banco(cliente, evento['id'], tabela)
+        if hashlib.sha256(conteudo).hexdigest() != info['sha256'] or \
+                sum(1 for _ in ler_jsonl_gz(pasta_evento / info['arquivo'])) != info['linhas']:
+            raise IOError(f"Arquivo de {tabela} não confere; nada foi removido")
+
+    with open(pasta_evento / "manifesto.json", "w", encoding="utf-8") as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, indent=2, default=str)
+
+    for tabela in ORDEM_EXCLUSAO:
+        ids = ids_por_tabela[tabela]
+        for inicio in range(0, len(ids), tamanho_lote):
+            executar_escrita(cliente.table(tabela).delete().in_(
+                'id', ids[inicio:inicio + tamanho_lote]))
+
+    executar_escrita(cliente.table('evento').update({'arquivado_em': manifesto['arquivado_em']}).eq(
+        'id', evento['id']))
+
+    return manifesto
+
+# --- Consulta aos arquivos ---
+
+
+def listar_eventos_arquivados(cliente, pasta=PASTA_ARQUIVO):
+    """
+    Manifestos dos eventos arquivados, do mais recente ao mais antigo: os
+    guardados no banco e, para os arquivados antes da migração 13, os que
+    só existem na pasta local
+    """
+    manifestos = {}
+    copias = executar_leitura(cliente.table('arquivo_evento').select(
+        'evento_id, tabela, linhas, sha256, arquivado_em').eq('parte', 0)).data
+    if copias:
+        eventos = {evento['id']: evento for evento in executar_leitura(
+            cliente.table('evento').select('*').in_(
+                'id', sorted({copia['evento_id'] for copia in copias}))).data}
+        for copia in copias:
+            manifesto = manifestos.setdefault(copia['evento_id'], {
+                'evento': eventos.get(copia['evento_id'], {'id': copia['evento_id'], 'nome': '?'}),
+                'arquivado_em': copia['arquivado_em'],
+                'valores_em_centavos': True,
+                'tabelas': {},
+                'pasta': str(Path(pasta) / f"evento_{copia['evento_id']}"),
+            })
+            manifesto['tabelas'][copia['tabela']] = {
+                'arquivo': f"{copia['tabela']}.jsonl.gz",
+                'linhas': copia['linhas'], 'sha256': copia['sha256']}
+
+    for caminho in Path(pasta).glob("evento_*/manifesto.json"):
+        with open(caminho, encoding="utf-8") as arquivo:
+            manifesto = json.load(arquivo)
+        if manifesto['evento']['id'] not in manifestos:
+            manifesto['pasta'] = str(caminho.parent)
+            manifestos[manifesto['evento']['id']] = manifesto
+    return sorted(manifestos.values(), key=lambda m: m['arquivado_em'], reverse=True)
+
+
+@lru_cache(maxsize=8)
+def _ler_arquivo(caminho, modificado_em):
+    """Linhas do arquivo; a data de modificação na chave descarta cópias refeitas"""
+    return list(ler_jsonl_gz(caminho))
+
+
+def ler_tabela_arquivada(cliente, manifesto, tabela):
+    """
+    Linhas arquivadas de uma tabela do evento (somente leitura), lidas da
+    cópia local, que é refeita a partir do banco quando falta
+    """
+    info = manifesto['tabelas'][tabela]
+    caminho = Path(manifesto['pasta']) / info['arquivo']
+    if not caminho.exists():
+        conteudo = ler_copia_no_banco(cliente, manifesto['evento']['id'], tabela)
+        if hashlib.sha256(conteudo).hexdigest() != info['sha256']:
+            raise IOError(f"Cópia de {tabela} no banco não confere")
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = caminho.with_suffix(caminho.suffix + ".tmp")
+        temporario.write_bytes(conteudo)
+        os.replace(temporario, caminho)
+    return _ler_arquivo(str(caminho), caminho.stat().st_mtime_ns)
@@ -0,0 +1,221 @@
+"""Backup completo do banco em um único arquivo local e restauração.
+
+Uso:
+    python backup.py gerar [--destino backups/]      # cria backup_<data>.tar
+    python backup.py restaurar backups/backup_....tar
+
+As tabelas são lidas em paralelo, em páginas por id, e gravadas como JSONL
+compactado (um .jsonl.gz por tabela) dentro de um .tar, junto de um
+manifesto.json com a contagem de linhas e o sha256 de cada arquivo. O maior
+id de cada tabela é anotado antes da leitura e as páginas param nele, então
+linhas inseridas durante o backup ficam de fora de todas as tabelas. Alterações
+e exclusões feitas durante o backup ainda podem aparecer; para uma cópia
+exata, gere o backup com o evento encerrado. A
+restauração confere os checksums e grava as linhas em lotes, respeitando a
+ordem das chaves estrangeiras. Backups anteriores à migração de valores em
+centavos têm os valores convertidos de reais para centavos na restauração.
+
+As credenciais vêm de SUPABASE_URL/SUPABASE_KEY (.env) ou, na falta delas,
+de .streamlit/secrets.toml.
+"""
+import argparse
+import io
+import json
+import os
+import tarfile
+import tempfile
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from arquivamento import calcular_sha256, gravar_jsonl_gz, ler_jsonl_gz
+from migracoes import COLUNAS_MONETARIAS, MIGRACOES, VERSAO_CENTAVOS, VERSAO_VALOR_PAGO
+from utilitarios import reais_para_centavos
+
+# Ordem de restauração: tabelas referenciadas antes das que as referenciam
+TABELAS_BACKUP = ['evento', 'arquivo_evento', 'produto', 'caixa', 'fornecedor', 'investidores',
+                  'estoque', 'historico_pagamentos', 'estornos_caixa']
+
+TAMANHO_PAGINA = 1000
+TAMANHO_LOTE = 500
+
+# --- Conexão ---
+
+
+def criar_cliente():
+    """Cria um cliente Supabase fora do Streamlit"""
+    from supabase import create_client
+
+    load_dotenv()
+    url = os.environ.get("SUPABASE_URL")
+    chave = os.environ.get("SUPABASE_KEY")
+    if not (url and chave):
+        with open(".streamlit/secrets.toml", "rb") as arquivo:
+            segredos = tomllib.load(arquivo)["supabase"]
+        url, chave = segredos["url"], segredos["key"]
+    return create_client(url, chave)
+
+# --- Geração ---
+
+
+def _maior_id(cliente, tabela):
+    """Maior id da tabela neste momento; None se estiver vazia"""
+    linhas = cliente.table(tabela).select('id').order('id', desc=True).limit(1).execute().data
+    return linhas[0]['id'] if linhas else None
+
+
+def _paginas_tabela(cliente, tabela, ate_id, tamanho_pagina=TAMANHO_PAGINA):
+    """Percorre a tabela até o id ate_id em páginas ordenadas por id (paginação por chave)"""
+    if ate_id is None:
+        return
+    ultimo_id = None
+    while True:
+        query = cliente.table(tabela).select('*').lte('id', ate_id)
+        if ultimo_id is not None:
+            query = query.gt('id', ultimo_id)
+        pagina = query.order('id').limit(tamanho_pagina).execute().data
+        yield from pagina
+        if len(pagina) < tamanho_pagina:
+            return
+        ultimo_id = pagina[-1]['id']
+
+
+def gerar_backup(cliente, caminho, tabelas=TABELAS_BACKUP, max_paralelo=4):
+    """Grava o backup de todas as tabelas no arquivo .tar informado e retorna o manifesto"""
+    # Marcas de todas as tabelas antes de qualquer leitura: o ponto comum do backup
+    ate_id = {tabela: _maior_id(cliente, tabela) for tabela in tabelas}
+
+    with tempfile.TemporaryDirectory() as pasta:
+        def copiar(tabela):
+            linhas, sha256 = gravar_jsonl_gz(
+                Path(pasta) / f"{tabela}.jsonl.gz", _paginas_tabela(cliente, tabela, ate_id[tabela]))
+            return tabela, {'arquivo': f"{tabela}.jsonl.gz", 'linhas': linhas, 'sha256': sha256,
+                            'ate_id': ate_id[tabela]}
+
+        with ThreadPoolExecutor(max_workers=max_paralelo) as executor:
+            resultados = dict(executor.map(copiar, tabelas))
+
+        manifesto = {
+            'gerado_em': datetime.now(timezone.utc).isoformat(),
+            'versao_schema': max(m['versao'] for m in MIGRACOES),
+            'tabelas': {tabela: resultados[tabela] for tabela in tabelas},
+        }
+
+        with tarfile.open(caminho, "w") as pacote:
+            conteudo = json.dumps(manifesto, ensure_ascii=False, indent=2).encode("utf-8")
+            info = tarfile.TarInfo("manifesto.json")
+            info.size = len(conteudo)
+            pacote.addfile(info, io.BytesIO(conteudo))
+            for tabela in tabelas:
+                pacote.add(Path(pasta) / f"{tabela}.jsonl.gz", arcname=f"{tabela}.jsonl.gz")
+
+    return manifesto
+
+# --- Restauração ---
+
+
+def _valores_para_centavos(tabela, linha):
+    """Converte para centavos os valores em reais de uma linha de backup antigo"""
+    for coluna in COLUNAS_MONETARIAS.get(tabela, []):
+        if linha.get(coluna) is not None:
+            linha[coluna] = reais_para_centavos(linha[coluna])
+    return linha
+
+
+def _acumular_saldo(saldos, tabela, linha):
+    """Valor pago e soma do histórico por fornecedor, para backups anteriores à versão 12"""
+    if tabela == 'fornecedor':
+        saldo = saldos.setdefault(linha['id'], {'historico': 0})
+        saldo.update(valor_pago=linha.get('valor_pago') or 0, evento_id=linha.get('evento_id'),
+                     data_pagamento=linha.get('data_pagamento') or date.today().isoformat())
+    elif tabela == 'historico_pagamentos':
+        saldo = saldos.setdefault(linha['fornecedor_id'], {'historico': 0, 'valor_pago': 0})
+        saldo['historico'] += linha.get('valor_pago') or 0
+
+
+def restaurar_backup(cliente, caminho, tamanho_lote=TAMANHO_LOTE):
+    """Confere e grava no banco as linhas do backup; retorna {tabela: linhas restauradas}"""
+    restauradas = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        with tarfile.open(caminho, "r") as pacote:
+            pacote.extractall(pasta, filter="data")
+
+        with open(Path(pasta) / "manifesto.json", encoding="utf-8") as arquivo:
+            manifesto = json.load(arquivo)
+
+        for tabela, info in manifesto['tabelas'].items():
+            if calcular_sha256(Path(pasta) / info['arquivo']) != info['sha256']:
+                raise IOError(f"Checksum de {tabela} não confere; nada foi restaurado")
+
+        em_reais = manifesto.get('versao_schema', 0) < VERSAO_CENTAVOS
+        # Antes da versão 12, parte do valor pago podia não estar no histórico
+        saldos = {} if manifesto.get('versao_schema', 0) < VERSAO_VALOR_PAGO else None
+        ordem = [t for t in TABELAS_BACKUP if t in manifesto['tabelas']]
+        for tabela in ordem:
+            lote = []
+            restauradas[tabela] = 0
+            for linha in ler_jsonl_gz(Path(pasta) / manifesto['tabelas'][tabela]['arquivo']):
+                if em_reais:
+                    linha = _valores_para_centavos(tabela, linha)
+                if saldos is not None:
+                    _acumular_saldo(saldos, tabela, linha)
+                lote.append(linha)
+                if len(lote) == tamanho_lote:
+                    cliente.table(tabela).upsert(lote).execute()
+                    restauradas[tabela] += len(lote)
+                    lote = []
+            if lote:
+                cliente.table(tabela).upsert(lote).execute()
+                restauradas[tabela] += len(lote)
+
+    if saldos:
+        # O valor pago é recalculado pelo banco a partir do histórico; o que só
+        # estava no fornecedor entra no histórico, como na migração 12
+        pagamentos = [
+            {'fornecedor_id': fornecedor_id, 'valor_pago': saldo['valor_pago'] - saldo['historico'],
+             'origem_pagamento': None, 'data_pagamento': saldo['data_pagamento'],
+             'observacao': 'Pago antes do histórico', 'evento_id': saldo['evento_id']}
+            for fornecedor_id, saldo in saldos.items()
+            if saldo['valor_pago'] > saldo['historico']]
+        for inicio in range(0, len(pagamentos), tamanho_lote):
+            cliente.table('historico_pagamentos').insert(pagamentos[inicio:inicio + tamanho_lote]).execute()
+
+    # Ids gravados explicitamente não avançam as sequências no Postgres
+    try:
+        cliente.rpc('ajustar_sequencias').execute()
+    except Exception as e:
+        print(f"Aviso: não foi possível ajustar as sequências de id ({e})")
+
+    return restauradas
+
+# --- Linha de comando ---
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backup do Sistema EventoCaixa")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    gerar = comandos.add_parser("gerar")
+    gerar.add_argument("--destino", default="backups")
+    restaurar = comandos.add_parser("restaurar")
+    restaurar.add_argument("arquivo")
+    args = parser.parse_args(argv)
+
+    cliente = criar_cliente()
+    if args.comando == "gerar":
+        Path(args.destino).mkdir(parents=True, exist_ok=True)
+        caminho = Path(args.destino) / \
+            f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.tar"
+        manifesto = gerar_backup(cliente, caminho)
+        for tabela, info in manifesto['tabelas'].items():
+            print(f"{tabela}: {info['linhas']} linhas")
+        print(f"Backup gravado em {caminho}")
+    else:
+        for tabela, linhas in restaurar_backup(cliente, args.arquivo).items():
+            print(f"{tabela}: {linhas} linhas restauradas")
+
+
+if __name__ == "__main__":
+    main()
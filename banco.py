@@ -0,0 +1,848 @@
+"""Acesso ao Supabase: conexão, disjuntor, evento ativo, cópias locais das
+tabelas e as operações de leitura e gravação usadas pelas páginas."""
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import httpx
+import streamlit as st
+from postgrest.exceptions import APIError
+from supabase import create_client, Client, ClientOptions
+
+from modelos import MODELOS, Caixa, modelar
+from utilitarios import obter_horario_brasilia, formatar_hora_brasilia
+
+# --- Conexão com Supabase ---
+
+# Com esta variável (caminho de um arquivo SQLite), o sistema usa banco_local.py no
+# lugar do Supabase; serve ao teste de carga (carga.py) e ao desenvolvimento
+VARIAVEL_BANCO_LOCAL = "EVENTOCAIXA_BANCO_LOCAL"
+
+# Valores padrão; podem ser ajustados na seção [http] do secrets.toml
+CONFIG_HTTP_PADRAO = {
+    "timeout": 10.0,              # segundos por requisição
+    "timeout_conexao": 5.0,       # segundos para abrir a conexão
+    "max_conexoes": 20,           # conexões simultâneas no pool
+    "max_conexoes_ociosas": 10,   # conexões mantidas abertas (keep-alive)
+    "keepalive": 30.0,            # segundos até fechar uma conexão ociosa
+    "tentativas": 3,              # tentativas para leituras
+    "espera_base": 0.3,           # segundos; dobra a cada nova tentativa
+    "falhas_para_abrir": 3,       # falhas ou lentidões seguidas até o modo somente leitura
+    "limite_lentidao": 5.0,       # segundos; acima disso a resposta conta como lenta
+    "intervalo_sonda": 10.0,      # segundos entre os testes do banco em segundo plano
+}
+
+
+def config_http():
+    """Configuração HTTP com os valores do secrets.toml sobre os padrões"""
+    # Com o banco local pode não haver secrets.toml; valem os padrões
+    ajustes = st.secrets.get("http", {}) if st.secrets.load_if_toml_exists() else {}
+    return {**CONFIG_HTTP_PADRAO, **ajustes}
+
+
+@st.cache_resource
+def init_transporte_http():
+    """Pool de conexões keep-alive compartilhado por todos os clientes"""
+    config = config_http()
+    return httpx.HTTPTransport(limits=httpx.Limits(
+        max_connections=config["max_conexoes"],
+        max_keepalive_connections=config["max_conexoes_ociosas"],
+        keepalive_expiry=config["keepalive"],
+    ))
+
+
+@st.cache_resource
+def init_supabase():
+    """
+    Cliente Supabase único, compartilhado por todas as sessões e threads (o
+    Streamlit executa cada rerun numa thread nova). O httpx.Client é seguro
+    entre threads e cada consulta monta o seu próprio request builder; as
+    requisições simultâneas usam conexões diferentes do mesmo pool.
+    """
+    if os.environ.get(VARIAVEL_BANCO_LOCAL):
+        from banco_local import cliente_local
+
+        return cliente_local(os.environ[VARIAVEL_BANCO_LOCAL])
+
+    config = config_http()
+    timeout = httpx.Timeout(config["timeout"], connect=config["timeout_conexao"])
+    return create_client(
+        st.secrets["supabase"]["url"],
+        st.secrets["supabase"]["key"],
+        options=ClientOptions(
+            httpx_client=httpx.Client(transport=init_transporte_http(), timeout=timeout),
+            postgrest_client_timeout=timeout,
+        ),
+    )
+
+
+class _ClienteCompartilhado:
+    """Encaminha cada uso de `supabase` para o cliente compartilhado"""
+
+    def __getattr__(self, nome):
+        return getattr(init_supabase(), nome)
+
+
+supabase: Client = _ClienteCompartilhado()
+
+# --- Disjuntor: modo somente leitura com o banco fora do ar ---
+
+
+class BancoIndisponivel(Exception):
+    """O disjuntor está aberto: o banco falhou ou ficou lento demais"""
+
+
+@st.cache_resource
+def _disjuntor():
+    """Estado do disjuntor, compartilhado por todas as sessões do servidor"""
+    return {'trava': threading.Lock(), 'aberto': False, 'falhas': 0,
+            'aberto_desde': None, 'ultimo_sucesso': None}
+
+
+def banco_disponivel():
+    return not _disjuntor()['aberto']
+
+
+def situacao_disjuntor():
+    """Cópia do estado do disjuntor, para exibição"""
+    return {chave: valor for chave, valor in _disjuntor().items() if chave != 'trava'}
+
+
+def _registrar_resultado(sucesso, duracao=0.0):
+    """Conta falhas e lentidões seguidas; abre o disjuntor ao atingir o limite"""
+    config = config_http()
+    disjuntor = _disjuntor()
+    with disjuntor['trava']:
+        if sucesso:
+            disjuntor['ultimo_sucesso'] = time.time()
+        if sucesso and duracao <= config["limite_lentidao"]:
+            disjuntor['falhas'] = 0
+            return
+        disjuntor['falhas'] += 1
+        if disjuntor['aberto'] or disjuntor['falhas'] < config["falhas_para_abrir"]:
+            return
+        disjuntor['aberto'] = True
+        disjuntor['aberto_desde'] = time.time()
+    threading.Thread(target=_sondar_banco, args=(init_supabase(),), daemon=True).start()
+
+
+def _sondar_banco(cliente):
+    """Em segundo plano, testa o banco até ele responder em tempo e fecha o disjuntor"""
+    config = config_http()
+    disjuntor = _disjuntor()
+    while True:
+        time.sleep(config["intervalo_sonda"])
+        inicio = time.monotonic()
+        try:
+            cliente.table('evento').select('id').limit(1).execute()
+        except Exception:
+            continue
+        if time.monotonic() - inicio <= config["limite_lentidao"]:
+            with disjuntor['trava']:
+                disjuntor.update(aberto=False, falhas=0, aberto_desde=None,
+                                 ultimo_sucesso=time.time())
+            return
+
+
+# Classes de SQLSTATE que o PostgREST devolve com status 5xx; as demais são
+# erros da requisição (4xx), que não dizem nada sobre a saúde do banco
+CLASSES_SQLSTATE_SERVIDOR = ('08', '09', '25', '2D', '38', '39', '3B', '40', '53', '54',
+                             '55', '57', '58', 'F0', 'HV', 'P0', 'XX')
+CODIGOS_SERVIDOR_POSTGREST = ('PGRST000', 'PGRST001', 'PGRST002', 'PGRST003')
+
+
+def _falha_do_servidor(erro):
+    """A exceção indica banco fora do ar: rede, timeout ou resposta com status >= 500"""
+    if isinstance(erro, httpx.TransportError):
+        return True
+    if not isinstance(erro, APIError):
+        return False
+    if isinstance(erro.code, int):
+        # Resposta sem o JSON do PostgREST (gateway): o código é o status HTTP
+        return erro.code >= 500
+    codigo = erro.code or ''
+    if codigo.startswith('PGRST'):
+        return codigo in CODIGOS_SERVIDOR_POSTGREST
+    # 25006 (transação somente leitura) é 405 e P0001 (raise exception) é 400
+    return codigo not in ('25006', 'P0001') and codigo[:2] in CLASSES_SQLSTATE_SERVIDOR
+
+
+def _executar(query, tentativas=1):
+    """
+    Executa a query passando pelo disjuntor. Falhas do servidor (rede, timeout
+    ou status >= 500) são repetidas até `tentativas` vezes, com espera
+    exponencial aleatória, e contam para o disjuntor uma única vez, quando as
+    tentativas acabam.
+    """
+    if not banco_disponivel():
+        raise BancoIndisponivel(
+            "Banco de dados indisponível; exibindo os últimos dados salvos")
+    config = config_http()
+    for tentativa in range(tentativas):
+        inicio = time.monotonic()
+        try:
+            resposta = query.execute()
+        except (httpx.TransportError, APIError) as erro:
+            if not _falha_do_servidor(erro):
+                raise
+            if tentativa == tentativas - 1:
+                _registrar_resultado(False)
+                raise
+            time.sleep(random.uniform(0, config["espera_base"] * 2 ** tentativa))
+            continue
+        _registrar_resultado(True, time.monotonic() - inicio)
+        return resposta
+
+
+def executar_leitura(query):
+    """
+    Executa uma consulta de leitura, repetindo-a em falhas de rede ou timeout.
+    Só use para leituras: uma escrita repetida pode ser gravada duas vezes.
+    """
+    return _executar(query, config_http()["tentativas"])
+
+
+def executar_escrita(query):
+    """Executa uma escrita, uma única vez; recusada enquanto o banco estiver indisponível"""
+    if not banco_disponivel():
+        raise BancoIndisponivel(
+            "Banco de dados indisponível; alterações bloqueadas até a conexão voltar")
+    resposta = _executar(query)
+    descartar_dados_execucao()
+    return resposta
+
+# --- EVENTO ATIVO ---
+
+
+def evento_ativo_id():
+    """Id do evento selecionado na sessão"""
+    return st.session_state.get('evento_id')
+
+
+def no_evento(query):
+    """Restringe a consulta às linhas do evento ativo"""
+    return query.eq('evento_id', evento_ativo_id())
+
+
+def com_evento(dados):
+    """Acrescenta o evento ativo ao(s) registro(s) a inserir"""
+    if isinstance(dados, list):
+        return [com_evento(registro) for registro in dados]
+    return {**dados, 'evento_id': evento_ativo_id()}
+
+
+def buscar_eventos():
+    """Lista os eventos, do mais recente ao mais antigo (uma busca por execução)"""
+    dados = _dados_execucao()
+    if 'eventos' in dados:
+        return dados['eventos']
+    try:
+        response = executar_leitura(supabase.table('evento').select('*').order(
+            'data_inicio', desc=True, nullsfirst=False).order('id', desc=True))
+        _snapshots()['eventos'] = dados['eventos'] = response.data
+        return response.data
+    except Exception as e:
+        # Sem banco, usa a última lista carregada por qualquer sessão
+        if 'eventos' in _snapshots():
+            return _snapshots()['eventos']
+        st.error(f"Erro ao buscar eventos: {e}")
+        return []
+
+
+def paginas_consulta(montar_query, tamanho_pagina=1000):
+    """Gera, uma a uma, as páginas de range() da consulta até esgotar os resultados.
+    montar_query deve devolver uma query nova e ordenada a cada chamada."""
+    inicio = 0
+    while True:
+        pagina = executar_leitura(montar_query().range(inicio, inicio + tamanho_pagina - 1)).data
+        yield pagina
+        if len(pagina) < tamanho_pagina:
+            return
+        inicio += tamanho_pagina
+
+
+def buscar_em_paginas(montar_query, tamanho_pagina=1000):
+    """Executa a consulta em páginas de range() e junta todos os resultados"""
+    return [linha for pagina in paginas_consulta(montar_query, tamanho_pagina)
+            for linha in pagina]
+
+# --- CÓPIA LOCAL INCREMENTAL DAS TABELAS ---
+
+
+TABELAS_SNAPSHOT = ['caixa', 'estoque', 'fornecedor', 'investidores']
+
+# Recuo aplicado à marca d'água: transações que gravaram updated_at antes da
+# última leitura mas só confirmaram depois ainda entram no delta seguinte
+MARGEM_MARCA_DAGUA = timedelta(seconds=30)
+
+
+@st.cache_resource
+def _snapshots():
+    """Cópias locais das tabelas por evento, compartilhadas por todas as sessões do servidor"""
+    return {'trava': threading.Lock(), 'copias': {}}
+
+
+def _snapshot(tabela, evento_id):
+    snapshots = _snapshots()
+    with snapshots['trava']:
+        return snapshots['copias'].setdefault((tabela, evento_id), {
+            'linhas': {}, 'marca': None, 'marca_exclusoes': None,
+            'carregado': False, 'trava': threading.Lock()})
+
+
+def _recuar_marca(marca):
+    return (datetime.fromisoformat(marca.replace('Z', '+00:00')) - MARGEM_MARCA_DAGUA).isoformat()
+
+
+def obter_snapshot(tabela):
+    """
+    Atualiza a cópia local da tabela no evento ativo só com as linhas alteradas desde a última
+    marca d'água (updated_at) e aplica as exclusões registradas em 'exclusoes'.
+    Retorna a lista de linhas; trate-as como somente leitura, pois são
+    compartilhadas entre sessões.
+    """
+    snapshot = _snapshot(tabela, evento_ativo_id())
+    with snapshot['trava']:
+        try:
+            if not snapshot['carregado']:
+                # Carga inicial: a marca das exclusões começa no registro mais
+                # recente, pois linhas já excluídas não vêm na carga
+                ultima_exclusao = executar_leitura(supabase.table('exclusoes').select('excluido_em').eq(
+                    'tabela', tabela).order('excluido_em', desc=True).limit(1)).data
+                alteradas = buscar_em_paginas(
+                    lambda: no_evento(supabase.table(tabela).select('*')).order('updated_at').order('id'))
+                exclusoes = []
+                if ultima_exclusao:
+                    snapshot['marca_exclusoes'] = ultima_exclusao[0]['excluido_em']
+            else:
+                # Em páginas: um delta grande (importação em lote) passa do max-rows do PostgREST
+                def consulta_alteradas():
+                    query = no_evento(supabase.table(tabela).select('*'))
+                    if snapshot['marca']:
+                        query = query.gte('updated_at', _recuar_marca(snapshot['marca']))
+                    return query.order('updated_at').order('id')
+
+                def consulta_exclusoes():
+                    query = supabase.table('exclusoes').select(
+                        'registro_id, excluido_em').eq('tabela', tabela)
+                    if snapshot['marca_exclusoes']:
+                        query = query.gte('excluido_em', _recuar_marca(snapshot['marca_exclusoes']))
+                    return query.order('excluido_em').order('id')
+
+                alteradas = buscar_em_paginas(consulta_alteradas)
+                exclusoes = buscar_em_paginas(consulta_exclusoes)
+        except BancoIndisponivel:
+            # Modo somente leitura: serve a última cópia carregada
+            _marcar_desatualizada(tabela)
+            return list(snapshot['linhas'].values())
+        except Exception as e:
+            if banco_disponivel():
+                st.error(f"Erro ao atualizar dados de {tabela}: {e}")
+            _marcar_desatualizada(tabela)
+            return list(snapshot['linhas'].values())
+
+        linhas = snapshot['linhas']
+        de_linha = MODELOS[tabela].de_linha
+        for linha in alteradas:
+            linhas[linha['id']] = de_linha(linha)
+        for exclusao in exclusoes:
+            linhas.pop(exclusao['registro_id'], None)
+
+        if alteradas:
+            snapshot['marca'] = max(snapshot['marca'] or '', *(l['updated_at'] for l in alteradas))
+        if exclusoes:
+            snapshot['marca_exclusoes'] = max(
+                snapshot['marca_exclusoes'] or '', *(e['excluido_em'] for e in exclusoes))
+        snapshot['carregado'] = True
+
+        return list(linhas.values())
+
+# --- DADOS DA EXECUÇÃO ATUAL ---
+
+
+def iniciar_execucao():
+    """Descarta os dados da execução anterior; chamado no início de cada rerun completo"""
+    st.session_state['_dados_execucao'] = {}
+
+
+def _dados_execucao():
+    """Dados já buscados na execução atual desta sessão"""
+    return st.session_state.setdefault('_dados_execucao', {})
+
+
+def dados_tabela(tabela):
+    """
+    Linhas da tabela no evento ativo (modelos de modelos.py), buscadas no máximo
+    uma vez por execução do script. Filtros e ordenações devem ser feitos sobre
+    esta lista, que é compartilhada; as linhas são somente leitura.
+    """
+    dados = _dados_execucao()
+    if tabela not in dados:
+        # Versões lidas antes dos dados: nenhum resultado guardado com a versão
+        # desta execução é calculado sobre linhas mais antigas que ela
+        versao_dados()
+        if tabela in TABELAS_SNAPSHOT:
+            dados[tabela] = obter_snapshot(tabela)
+        else:
+            dados[tabela] = _buscar_tabela_evento(tabela)
+    return dados[tabela]
+
+
+def _marcar_desatualizada(tabela):
+    """A carga falhou e a execução usa uma cópia anterior da tabela, de versão desconhecida"""
+    _dados_execucao().setdefault('desatualizadas', set()).add(tabela)
+
+
+def _buscar_tabela_evento(tabela):
+    """Carga completa de uma tabela sem cópia incremental; sem banco, usa a última carga"""
+    ultimas = _snapshots().setdefault('ultimas_cargas', {})
+    chave = (tabela, evento_ativo_id())
+    try:
+        # Cada página vira modelos assim que chega, sem juntar todos os dicionários antes
+        ultimas[chave] = modelar(tabela, (linha for pagina in paginas_consulta(
+            lambda: no_evento(supabase.table(tabela).select('*')).order('id')) for linha in pagina))
+    except Exception as e:
+        if banco_disponivel():
+            st.error(f"Erro ao buscar dados de {tabela}: {e}")
+        _marcar_desatualizada(tabela)
+    return ultimas.get(chave, [])
+
+
+def agrupar_por(tabela, coluna):
+    """Linhas da tabela agrupadas pelo valor da coluna, calculado uma vez por execução"""
+    dados = _dados_execucao()
+    chave = (tabela, 'agrupado', coluna)
+    if chave not in dados:
+        grupos = {}
+        for linha in dados_tabela(tabela):
+            grupos.setdefault(getattr(linha, coluna), []).append(linha)
+        dados[chave] = grupos
+    return dados[chave]
+
+
+def filtrar(tabela, **valores):
+    """Linhas da tabela cujas colunas têm exatamente os valores informados"""
+    return [linha for linha in dados_tabela(tabela)
+            if all(getattr(linha, coluna) == valor for coluna, valor in valores.items())]
+
+
+def descartar_dados_execucao():
+    """Força novas buscas nesta execução (após gravar algo)"""
+    _dados_execucao().clear()
+
+# --- VERSÃO DOS DADOS ---
+
+
+def versao_dados(*tabelas):
+    """
+    Contadores de alteração das tabelas (gatilhos de contador_alteracoes),
+    lidos uma vez por execução, antes de qualquer tabela. Servem de chave para
+    resultados em cache: qualquer gravação numa tabela muda a sua versão. Sem
+    banco, repete os últimos contadores lidos. None para tabelas cuja carga
+    falhou nesta execução, que não devem ir para o cache.
+    """
+    dados = _dados_execucao()
+    if 'versoes' not in dados:
+        try:
+            response = executar_leitura(
+                supabase.table('contador_alteracoes').select('tabela, versao'))
+            _snapshots()['versoes'] = {linha['tabela']: linha['versao'] for linha in response.data}
+        except Exception as e:
+            if banco_disponivel():
+                st.error(f"Erro ao ler versões dos dados: {e}")
+        dados['versoes'] = _snapshots().get('versoes', {})
+    desatualizadas = dados.get('desatualizadas', ())
+    return tuple(None if tabela in desatualizadas else dados['versoes'].get(tabela)
+                 for tabela in tabelas)
+
+# --- CACHE DE RELATÓRIOS ---
+
+
+LIMITE_CACHE_RELATORIOS = 64
+
+
+@st.cache_resource
+def _cache_relatorios():
+    """Relatórios calculados, do menos ao mais recentemente usado, compartilhados entre sessões"""
+    return {'trava': threading.Lock(), 'resultados': OrderedDict()}
+
+
+def relatorio_em_cache(tipo, parametros, tabelas, calcular):
+    """
+    Resultado de calcular() para o relatório no evento ativo, reaproveitado
+    enquanto as versões das tabelas de que ele depende não mudarem. Guarda no
+    máximo LIMITE_CACHE_RELATORIOS resultados, descartando os usados há mais
+    tempo. Trate o resultado como somente leitura.
+    """
+    versao = versao_dados(*tabelas)
+    if None in versao:
+        return calcular()
+
+    chave = (tipo, evento_ativo_id(), parametros, versao)
+    cache = _cache_relatorios()
+    with cache['trava']:
+        if chave in cache['resultados']:
+            cache['resultados'].move_to_end(chave)
+            return cache['resultados'][chave]
+
+    resultado = calcular()
+    if versao_dados(*tabelas) != versao:
+        # Uma carga falhou ou uma gravação desta execução descartou os dados
+        return resultado
+    with cache['trava']:
+        cache['resultados'][chave] = resultado
+        while len(cache['resultados']) > LIMITE_CACHE_RELATORIOS:
+            cache['resultados'].popitem(last=False)
+    return resultado
+
+# --- FUNÇÕES DE RASTREAMENTO DE PAGAMENTOS ---
+
+
+def registrar_pagamento_fornecedor(fornecedor_id, valor_pago, origem_pagamento, observacao=None,
+                                   chave_idempotencia=None):
+    """
+    Registra pagamento de fornecedor com origem do dinheiro (None se não
+    informada). valor_pago, pago e data_pagamento do fornecedor são
+    recalculados pelo banco a partir do histórico, na mesma transação
+    (migração 12). Com chave_idempotencia, um segundo envio com a mesma
+    chave não grava nada.
+    """
+    try:
+        response = executar_leitura(supabase.table('fornecedor').select(
+            'id').eq('id', fornecedor_id))
+        if not response.data:
+            st.error("Fornecedor não encontrado!")
+            return False
+
+        historico_pagamento = {
+            'fornecedor_id': fornecedor_id,
+            'valor_pago': valor_pago,
+            'origem_pagamento': origem_pagamento,
+            'data_pagamento': obter_horario_brasilia().date().isoformat(),
+            'observacao': observacao,
+            'chave_idempotencia': chave_idempotencia
+        }
+        executar_escrita(supabase.table('historico_pagamentos').upsert(
+            com_evento(historico_pagamento), on_conflict='chave_idempotencia',
+            ignore_duplicates=True))
+        return True
+
+    except BancoIndisponivel:
+        raise
+    except Exception as e:
+        st.error(f"Erro ao registrar pagamento: {e}")
+        return False
+
+
+def obter_historico_pagamentos(fornecedor_id):
+    """Obtém histórico de pagamentos de um fornecedor"""
+    historico = agrupar_por('historico_pagamentos', 'fornecedor_id').get(fornecedor_id, [])
+    return sorted(historico, key=lambda h: h.data_pagamento or '', reverse=True)
+
+# --- FUNÇÕES DE ESTOQUE POR CAIXA ---
+
+
+def buscar_estoque_por_caixa(caixa_id):
+    """Busca itens de estoque relacionados a um caixa específico"""
+    return agrupar_por('estoque', 'caixa_id').get(caixa_id, [])
+
+
+def buscar_caixas_com_estoque():
+    """Busca caixas que têm estoque relacionado"""
+    fechados = sorted((c for c in dados_tabela('caixa') if c.hora_fechamento is not None),
+                      key=lambda c: c.data, reverse=True)
+
+    caixas_com_estoque = []
+    for caixa in fechados:
+        estoque = buscar_estoque_por_caixa(caixa.id)
+        if estoque:
+            caixas_com_estoque.append({
+                **caixa,
+                'itens_estoque': estoque,
+                'total_itens': sum(item.quantidade for item in estoque),
+            })
+
+    return caixas_com_estoque
+
+
+def obter_caixa_aberto_hoje(funcionaria_nome):
+    """Obtém o caixa aberto hoje para uma funcionária"""
+    data_hoje = obter_horario_brasilia().date().isoformat()
+    abertos = [c for c in filtrar('caixa', data=data_hoje, nome_funcionario=funcionaria_nome)
+               if c.hora_fechamento is None]
+    return abertos[0] if abertos else None
+
+
+def calcular_totais_investimentos():
+    """Calcula totais relacionados aos investimentos"""
+    try:
+        investidores = dados_tabela('investidores')
+        total_investido = 0
+        total_devolvido = 0
+        total_a_devolver = 0
+
+        for item in investidores:
+            total_investido += item.valor_investido
+            total_devolvido += item.valor_devolvido
+            if not item.devolvido:
+                total_a_devolver += item.valor_investido - item.valor_devolvido
+
+        return {
+            'total_investido': total_investido,
+            'total_devolvido': total_devolvido,
+            'total_a_devolver': total_a_devolver
+        }
+    except Exception as e:
+        st.error(f"Erro ao calcular investimentos: {e}")
+        return {'total_investido': 0, 'total_devolvido': 0, 'total_a_devolver': 0}
+
+
+def valores_corrigidos(caixa, estornos_por_caixa):
+    """Dinheiro, maquineta e retiradas do caixa descontados os estornos (nunca negativos)"""
+    corrigidos = {'dinheiro': caixa.dinheiro, 'maquineta': caixa.maquineta,
+                  'retiradas': caixa.retiradas}
+    for estorno in estornos_por_caixa.get(caixa.id, []):
+        if estorno.tipo_lancamento in corrigidos:
+            corrigidos[estorno.tipo_lancamento] -= estorno.valor_estorno
+    return {tipo: max(0, valor) for tipo, valor in corrigidos.items()}
+
+
+def _totais_caixas_fechados(caixas):
+    """(entradas líquidas, conta bancária) dos caixas fechados, considerando estornos"""
+    estornos_por_caixa = agrupar_por('estornos_caixa', 'caixa_id')
+    total_caixa = 0
+    total_conta_bancaria = 0
+    for caixa in caixas:
+        if caixa.hora_fechamento is not None:
+            valores = valores_corrigidos(caixa, estornos_por_caixa)
+            total_caixa += valores['dinheiro'] + valores['maquineta'] - valores['retiradas']
+            total_conta_bancaria += caixa.conta_bancaria
+    return total_caixa, total_conta_bancaria
+
+
+def calcular_totais():
+    """Calcula todos os totais financeiros considerando estornos"""
+    dados = _dados_execucao()
+    if 'totais' in dados:
+        return dados['totais']
+    try:
+        total_caixa, total_conta_bancaria = _totais_caixas_fechados(dados_tabela('caixa'))
+
+        total_fornecedores = 0
+        total_pago = 0
+        for item in dados_tabela('fornecedor'):
+            total_fornecedores += item.valor
+            total_pago += item.valor_pago
+
+        total_a_pagar = total_fornecedores - total_pago
+        totais_invest = calcular_totais_investimentos()
+
+        saldo_disponivel = total_caixa + total_conta_bancaria - \
+            total_a_pagar - totais_invest['total_a_devolver']
+
+        dados['totais'] = {
+            'total_caixa': total_caixa,
+            'total_conta_bancaria': total_conta_bancaria,
+            'total_fornecedores': total_fornecedores,
+            'total_pago': total_pago,
+            'total_a_pagar': total_a_pagar,
+            'saldo_disponivel': saldo_disponivel,
+            'total_investido': totais_invest['total_investido'],
+            'total_devolvido': totais_invest['total_devolvido'],
+            'total_a_devolver': totais_invest['total_a_devolver']
+        }
+        return dados['totais']
+    except Exception as e:
+        st.error(f"Erro ao calcular totais: {e}")
+        return {
+            'total_caixa': 0, 'total_conta_bancaria': 0, 'total_fornecedores': 0,
+            'total_pago': 0, 'total_a_pagar': 0, 'saldo_disponivel': 0,
+            'total_investido': 0, 'total_devolvido': 0, 'total_a_devolver': 0
+        }
+
+# --- FLUXO DE CAIXA POR PERÍODO ---
+
+
+TABELAS_FLUXO = ('caixa', 'estornos_caixa', 'fornecedor', 'historico_pagamentos', 'investidores')
+
+
+def calcular_fluxo_caixa(data_inicio, data_fim):
+    """
+    Fluxo de caixa do período, em centavos: entradas dos caixas fechados (com
+    estornos), depósitos bancários, saídas pagas no período (pagamentos a
+    fornecedores e devoluções concluídas a investidores), obrigações em aberto,
+    fluxo médio por dia com movimento e dias para zerar as obrigações.
+    O resultado é reaproveitado enquanto a versão dos dados não mudar.
+    """
+    inicio, fim = data_inicio.isoformat(), data_fim.isoformat()
+    return relatorio_em_cache('fluxo_caixa', (inicio, fim), TABELAS_FLUXO,
+                              lambda: _calcular_fluxo_caixa(inicio, fim))
+
+
+def _calcular_fluxo_caixa(inicio, fim):
+    estornos_por_caixa = agrupar_por('estornos_caixa', 'caixa_id')
+    composicao = {'dinheiro': 0, 'maquineta': 0, 'retiradas': 0, 'conta_bancaria': 0}
+    entradas_por_dia = {}
+    for caixa in dados_tabela('caixa'):
+        if caixa.hora_fechamento is None or not inicio <= caixa.data <= fim:
+            continue
+        valores = valores_corrigidos(caixa, estornos_por_caixa)
+        for tipo, valor in valores.items():
+            composicao[tipo] += valor
+        composicao['conta_bancaria'] += caixa.conta_bancaria
+        entradas_por_dia[caixa.data] = entradas_por_dia.get(caixa.data, 0) + \
+            valores['dinheiro'] + valores['maquineta'] - valores['retiradas']
+
+    pagamentos_fornecedores = sum(
+        p.valor_pago for p in dados_tabela('historico_pagamentos')
+        if p.data_pagamento and inicio <= p.data_pagamento <= fim)
+    devolucoes_investidores = sum(
+        i.valor_devolvido for i in dados_tabela('investidores')
+        if i.data_devolucao and inicio <= i.data_devolucao <= fim)
+
+    a_pagar = sum(f.valor - f.valor_pago for f in dados_tabela('fornecedor'))
+    a_devolver = calcular_totais_investimentos()['total_a_devolver']
+
+    entradas_caixa = sum(entradas_por_dia.values())
+    saidas = pagamentos_fornecedores + devolucoes_investidores
+    obrigacoes = a_pagar + a_devolver
+    saldo_periodo = entradas_caixa + composicao['conta_bancaria'] - saidas
+    fluxo_medio_diario = round(entradas_caixa / len(entradas_por_dia)) if entradas_por_dia else 0
+
+    return {
+        'entradas_caixa': entradas_caixa,
+        'conta_bancaria': composicao['conta_bancaria'],
+        'pagamentos_fornecedores': pagamentos_fornecedores,
+        'devolucoes_investidores': devolucoes_investidores,
+        'saidas': saidas,
+        'a_pagar': a_pagar,
+        'a_devolver': a_devolver,
+        'obrigacoes': obrigacoes,
+        'saldo_periodo': saldo_periodo,
+        'saldo_projetado': saldo_periodo - obrigacoes,
+        'dias_com_movimento': len(entradas_por_dia),
+        'fluxo_medio_diario': fluxo_medio_diario,
+        'dias_para_zerar': obrigacoes / fluxo_medio_diario
+        if fluxo_medio_diario > 0 and obrigacoes > 0 else None,
+        'composicao': composicao,
+    }
+
+# --- FUNÇÕES DE ESTORNO ---
+
+
+def registrar_estorno_caixa(caixa_id, valor_estorno, motivo_estorno, tipo_lancamento):
+    """
+    Registra um estorno para corrigir lançamento incorreto no caixa
+    tipo_lancamento: 'dinheiro', 'maquineta' ou 'retiradas'
+    """
+    try:
+        # Buscar dados atuais do caixa
+        response = executar_leitura(supabase.table('caixa').select(
+            '*').eq('id', caixa_id))
+        caixa = Caixa.de_linha(response.data[0]) if response.data else None
+
+        if not caixa:
+            return False, "Caixa não encontrado"
+
+        # Registrar o estorno
+        dados_estorno = {
+            'caixa_id': caixa_id,
+            'valor_estorno': valor_estorno,
+            'tipo_lancamento': tipo_lancamento,
+            'motivo': motivo_estorno,
+            'data_estorno': obter_horario_brasilia().date().isoformat(),
+            'hora_estorno': formatar_hora_brasilia()
+        }
+
+        executar_escrita(supabase.table('estornos_caixa').insert(com_evento(dados_estorno)))
+
+        # Atualizar o caixa com o valor corrigido
+        novo_valor = caixa[tipo_lancamento] - valor_estorno
+        if novo_valor < 0:
+            novo_valor = 0
+
+        executar_escrita(supabase.table('caixa').update({
+            tipo_lancamento: novo_valor
+        }).eq('id', caixa_id))
+
+        return True, "Estorno registrado com sucesso"
+
+    except BancoIndisponivel:
+        raise
+    except Exception as e:
+        return False, f"Erro ao registrar estorno: {e}"
+
+
+def buscar_estornos_caixa(caixa_id=None):
+    """Busca estornos registrados para um caixa específico ou todos"""
+    if caixa_id:
+        estornos = agrupar_por('estornos_caixa', 'caixa_id').get(caixa_id, [])
+    else:
+        estornos = dados_tabela('estornos_caixa')
+    return sorted(estornos, key=lambda e: (e.data_estorno, e.hora_estorno or ''), reverse=True)
+
+# --- SELETOR DE CAIXA PAGINADO ---
+
+
+def buscar_caixas_paginado(data_inicio=None, data_fim=None, prefixo_nome="", nome_exato=None,
+                           apenas_abertos=False, limite=20, deslocamento=0):
+    """Busca uma página de caixas filtrada por período e nome, dos mais recentes aos mais antigos.
+    Traz um registro além do limite para indicar se existe próxima página. Filtro,
+    ordem e página ficam no banco (índices da migração 3); sem banco, usa a
+    última cópia local da tabela."""
+    query = no_evento(supabase.table('caixa').select('*'))
+    if data_inicio:
+        query = query.gte('data', data_inicio.isoformat())
+    if data_fim:
+        query = query.lte('data', data_fim.isoformat())
+    if nome_exato:
+        query = query.eq('nome_funcionario', nome_exato)
+    elif prefixo_nome.strip():
+        prefixo = re.sub(r'([%_\\])', r'\\\1', prefixo_nome.strip())
+        query = query.ilike('nome_funcionario', f"{prefixo}%")
+    if apenas_abertos:
+        query = query.is_('hora_fechamento', 'null')
+
+    try:
+        response = executar_leitura(query.order('data', desc=True).order(
+            'hora_abertura', desc=True).order('id', desc=True).range(
+            deslocamento, deslocamento + limite))
+        return modelar('caixa', response.data)
+    except Exception as e:
+        if banco_disponivel():
+            st.error(f"Erro ao buscar caixas: {e}")
+        return _caixas_em_memoria(data_inicio, data_fim, prefixo_nome, nome_exato,
+                                  apenas_abertos)[deslocamento:deslocamento + limite + 1]
+
+
+def _caixas_em_memoria(data_inicio, data_fim, prefixo_nome, nome_exato, apenas_abertos):
+    prefixo = prefixo_nome.strip().casefold()
+    caixas = [
+        c for c in dados_tabela('caixa')
+        if (not data_inicio or c.data >= data_inicio.isoformat())
+        and (not data_fim or c.data <= data_fim.isoformat())
+        and (c.nome_funcionario == nome_exato if nome_exato
+             else c.nome_funcionario.casefold().startswith(prefixo))
+        and (not apenas_abertos or c.hora_fechamento is None)
+    ]
+    caixas.sort(key=lambda c: (c.data, c.hora_abertura or '', c.id), reverse=True)
+    return caixas
+
+# --- IMPORTAÇÃO EM LOTE ---
+
+
+TAMANHO_LOTE_INSERCAO = 500
+
+
+def inserir_em_lotes(tabela, registros, tamanho_lote=TAMANHO_LOTE_INSERCAO):
+    """Insere os registros em poucas requisições e retorna as linhas gravadas"""
+    gravadas = []
+    for inicio in range(0, len(registros), tamanho_lote):
+        response = executar_escrita(supabase.table(tabela).insert(
+            com_evento(registros[inicio:inicio + tamanho_lote])))
+        gravadas.extend(response.data)
+    return gravadas
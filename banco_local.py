@@ -0,0 +1,268 @@
+"""Banco local em SQLite no lugar do Supabase, para testes de carga e desenvolvimento.
+
+Implementa só a parte do cliente supabase-py que o sistema usa (table(),
+select/insert/upsert/update/delete, filtros eq/neq/gt/gte/lt/lte/is_/in_/
+ilike, not_, order, limit, range e count), sobre o mesmo esquema criado por
+migracoes.py. É ativado pela variável de ambiente EVENTOCAIXA_BANCO_LOCAL
+com o caminho do arquivo SQLite (ou ":memory:"):
+
+    EVENTOCAIXA_BANCO_LOCAL=local.db streamlit run sistema_caixa.py
+
+Todas as threads de um processo compartilham um único cliente. Cada chamada
+pode esperar uma latência artificial, para imitar a ida e volta pela rede, e
+é contada por (rótulo, tabela, operação) para os relatórios do teste de carga.
+"""
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from migracoes import aplicar_migracoes
+
+_clientes = {}
+_trava_clientes = threading.Lock()
+
+
+def cliente_local(caminho=":memory:"):
+    """Cliente compartilhado do arquivo SQLite informado, criado e migrado no primeiro uso"""
+    with _trava_clientes:
+        if caminho not in _clientes:
+            _clientes[caminho] = ClienteLocal(caminho)
+        return _clientes[caminho]
+
+
+class Resposta:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class ClienteLocal:
+    """
+    Cliente com a interface do supabase-py sobre uma conexão SQLite.
+    latencia: segundos de espera por chamada (fora da trava do banco).
+    rotulo(): se informado, agrupa a contagem de chamadas (ex.: por operação do teste).
+    """
+
+    def __init__(self, caminho=":memory:", latencia=0.0, rotulo=None):
+        # timeout: outros processos (teste de carga) podem estar gravando no mesmo arquivo
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False, timeout=30)
+        self.conexao.row_factory = sqlite3.Row
+        if caminho != ":memory:":
+            self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.trava = threading.RLock()
+        self.latencia = latencia
+        self.rotulo = rotulo
+        self.chamadas = Counter()
+        self._colunas_booleanas = {}
+        aplicar_migracoes(self.conexao, 'sqlite')
+
+    def table(self, tabela):
+        return _Consulta(self, tabela)
+
+    from_ = table
+
+    def colunas_booleanas(self, tabela):
+        """SQLite devolve BOOLEAN como 0/1; estas colunas voltam como bool"""
+        if tabela not in self._colunas_booleanas:
+            with self.trava:
+                self._colunas_booleanas[tabela] = {
+                    coluna[1] for coluna in self.conexao.execute(f"PRAGMA table_info({tabela})")
+                    if (coluna[2] or '').upper() == 'BOOLEAN'}
+        return self._colunas_booleanas[tabela]
+
+    def registrar_chamada(self, tabela, operacao):
+        rotulo = self.rotulo() if self.rotulo else None
+        with self.trava:
+            self.chamadas[(rotulo, tabela, operacao)] += 1
+
+# --- Consultas ---
+
+
+class _Negacao:
+    """Encaminha o próximo filtro para a consulta com NOT (consulta.not_.is_(...))"""
+
+    def __init__(self, consulta):
+        self.consulta = consulta
+
+    def __getattr__(self, nome):
+        filtro = getattr(self.consulta, nome)
+
+        def negado(*args, **kwargs):
+            self.consulta._negar = True
+            return filtro(*args, **kwargs)
+        return negado
+
+
+class _Consulta:
+    def __init__(self, cliente, tabela):
+        self.cliente = cliente
+        self.tabela = tabela
+        self.operacao = 'select'
+        self.colunas = '*'
+        self.contar = None
+        self.dados = None
+        self.filtros = []
+        self.ordenacao = []
+        self.limite = None
+        self.deslocamento = None
+        self.conflito = ''
+        self.ignorar_duplicados = False
+        self._negar = False
+
+    # --- Operações ---
+
+    def select(self, *colunas, count=None, **kwargs):
+        if self.operacao == 'select':
+            texto = ','.join(colunas) if colunas else '*'
+            self.colunas = ', '.join(coluna.strip() for coluna in texto.split(','))
+            self.contar = count
+        return self
+
+    def insert(self, dados, **kwargs):
+        self.operacao, self.dados = 'insert', dados
+        return self
+
+    def upsert(self, dados, on_conflict='', ignore_duplicates=False, **kwargs):
+        self.operacao, self.dados = 'upsert', dados
+        self.conflito, self.ignorar_duplicados = on_conflict, ignore_duplicates
+        return self
+
+    def update(self, dados, **kwargs):
+        self.operacao, self.dados = 'update', dados
+        return self
+
+    def delete(self, **kwargs):
+        self.operacao = 'delete'
+        return self
+
+    # --- Filtros ---
+
+    @property
+    def not_(self):
+        return _Negacao(self)
+
+    def _filtro(self, sql, *parametros):
+        if self._negar:
+            sql, self._negar = f"NOT ({sql})", False
+        self.filtros.append((sql, parametros))
+        return self
+
+    def eq(self, coluna, valor):
+        return self._filtro(f"{coluna} = ?", valor)
+
+    def neq(self, coluna, valor):
+        return self._filtro(f"{coluna} <> ?", valor)
+
+    def gt(self, coluna, valor):
+        return self._filtro(f"{coluna} > ?", valor)
+
+    def gte(self, coluna, valor):
+        return self._filtro(f"{coluna} >= ?", valor)
+
+    def lt(self, coluna, valor):
+        return self._filtro(f"{coluna} < ?", valor)
+
+    def lte(self, coluna, valor):
+        return self._filtro(f"{coluna} <= ?", valor)
+
+    def is_(self, coluna, valor):
+        if valor is None or valor == 'null':
+            return self._filtro(f"{coluna} IS NULL")
+        return self._filtro(f"{coluna} IS ?", 1 if valor in (True, 'true') else 0)
+
+    def in_(self, coluna, valores):
+        valores = list(valores)
+        if not valores:
+            return self._filtro("0")
+        return self._filtro(f"{coluna} IN ({', '.join('?' * len(valores))})", *valores)
+
+    def ilike(self, coluna, padrao):
+        # LIKE do SQLite já ignora maiúsculas/minúsculas em ASCII
+        return self._filtro(f"{coluna} LIKE ? ESCAPE '\\'", padrao)
+
+    like = ilike
+
+    def order(self, coluna, desc=False, **kwargs):
+        self.ordenacao.append(f"{coluna} {'DESC' if desc else 'ASC'}")
+        return self
+
+    def limit(self, quantidade, **kwargs):
+        self.limite = quantidade
+        return self
+
+    def range(self, inicio, fim, **kwargs):
+        self.deslocamento, self.limite = inicio, fim - inicio + 1
+        return self
+
+    # --- Execução ---
+
+    def _where(self):
+        if not self.filtros:
+            return '', []
+        return (" WHERE " + " AND ".join(sql for sql, _ in self.filtros),
+                [parametro for _, parametros in self.filtros for parametro in parametros])
+
+    def _linha(self, linha):
+        linha = dict(linha)
+        for coluna in self.cliente.colunas_booleanas(self.tabela):
+            if linha.get(coluna) is not None:
+                linha[coluna] = bool(linha[coluna])
+        return linha
+
+    def execute(self):
+        cliente = self.cliente
+        cliente.registrar_chamada(self.tabela, self.operacao)
+        if cliente.latencia:
+            time.sleep(cliente.latencia)
+
+        where, parametros = self._where()
+        with cliente.trava:
+            conexao = cliente.conexao
+            if self.operacao == 'select':
+                sql = f"SELECT {self.colunas} FROM {self.tabela}{where}"
+                if self.ordenacao:
+                    sql += " ORDER BY " + ", ".join(self.ordenacao)
+                if self.limite is not None:
+                    sql += f" LIMIT {int(self.limite)}"
+                    if self.deslocamento:
+                        sql += f" OFFSET {int(self.deslocamento)}"
+                linhas = [self._linha(linha) for linha in conexao.execute(sql, parametros)]
+                total = None
+                if self.contar:
+                    total = conexao.execute(
+                        f"SELECT COUNT(*) FROM {self.tabela}{where}", parametros).fetchone()[0]
+                return Resposta(linhas, total)
+
+            if self.operacao in ('insert', 'upsert'):
+                registros = self.dados if isinstance(self.dados, list) else [self.dados]
+                gravadas = []
+                for registro in registros:
+                    colunas = list(registro)
+                    sql = (f"INSERT INTO {self.tabela} ({', '.join(colunas)}) "
+                           f"VALUES ({', '.join('?' * len(colunas))})")
+                    if self.operacao == 'upsert':
+                        alvo = self.conflito or 'id'
+                        if self.ignorar_duplicados:
+                            sql += f" ON CONFLICT ({alvo}) DO NOTHING"
+                        else:
+                            sql += f" ON CONFLICT ({alvo}) DO UPDATE SET " + ", ".join(
+                                f"{coluna} = excluded.{coluna}" for coluna in colunas)
+                    gravadas += [self._linha(linha) for linha in conexao.execute(
+                        sql + " RETURNING *", [registro[c] for c in colunas]).fetchall()]
+                conexao.commit()
+                return Resposta(gravadas)
+
+            if self.operacao == 'update':
+                colunas = list(self.dados)
+                sql = (f"UPDATE {self.tabela} SET {', '.join(f'{c} = ?' for c in colunas)}"
+                       f"{where} RETURNING *")
+                alteradas = [self._linha(linha) for linha in conexao.execute(
+                    sql, [self.dados[c] for c in colunas] + parametros).fetchall()]
+                conexao.commit()
+                return Resposta(alteradas)
+
+            removidas = [self._linha(linha) for linha in conexao.execute(
+                f"DELETE FROM {self.tabela}{where} RETURNING *", parametros).fetchall()]
+            conexao.commit()
+            return Resposta(removidas)
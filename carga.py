@@ -0,0 +1,253 @@
+"""Teste de carga: muitas funcionárias abrindo, lançando estoque e fechando caixas juntas.
+
+Uso:
+    python carga.py [--sessoes 30] [--itens 3] [--latencia-ms 20] [--banco carga.db]
+
+Cada sessão é um AppTest (a API de testes do Streamlit, sem navegador)
+executando o sistema_caixa.py de verdade sobre o banco local em SQLite
+(banco_local.py), com uma latência artificial por chamada para imitar a rede
+até o Supabase. Todas as sessões abrem o caixa e importam itens de estoque e,
+como no fim de um show, esperam umas pelas outras para fechar os caixas ao
+mesmo tempo. No fim são impressos, por operação, a vazão, os percentis de
+latência e as chamadas ao banco.
+
+O AppTest não aceita execuções simultâneas no mesmo processo, então cada
+sessão roda no seu, todas sobre o mesmo arquivo SQLite. Os recursos que o
+servidor compartilha entre sessões (st.cache_resource, como as cópias locais
+das tabelas) ficam separados por sessão: as chamadas ao banco medidas são um
+teto do que o servidor real faria. As latências incluem a pausa de 1 segundo
+que as páginas fazem depois de cada gravação, antes de recarregar.
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+SCRIPT = Path(__file__).with_name("sistema_caixa.py")
+TIMEOUT_EXECUCAO = 60  # segundos por execução do script numa sessão
+TIMEOUT_LARGADA = 300  # segundos esperando as outras sessões ficarem prontas
+OPERACOES = ['abrir página', 'abrir caixa', 'lançar estoque', 'fechar caixa']
+PRODUTOS = ['Cerveja', 'Refrigerante', 'Água', 'Espetinho', 'Gelo']
+
+
+class FalhaOperacao(Exception):
+    """A execução do script terminou com exceção ou mensagem de erro"""
+
+# --- Sessões simuladas ---
+
+
+# Operação em andamento na sessão deste processo, usada para agrupar as chamadas ao banco
+_operacao_atual = {'nome': None}
+
+
+def _executar(sessao, operacao):
+    """Reexecuta o script da sessão e falha se a página mostrar erro"""
+    _operacao_atual['nome'] = operacao
+    sessao.run()
+    if len(sessao.exception) or len(sessao.error):
+        mensagens = [e.value for e in sessao.exception] + [e.value for e in sessao.error]
+        raise FalhaOperacao(f"{operacao}: {'; '.join(map(str, mensagens))}")
+
+
+def _medir(medicoes, operacao, passos):
+    """Executa os passos de uma operação e registra (operacao, inicio, duracao, sucesso)"""
+    # monotonic: o mesmo relógio em todos os processos, para medir a vazão
+    inicio = time.monotonic()
+    try:
+        passos()
+    except Exception:
+        medicoes.append((operacao, inicio, time.monotonic() - inicio, False))
+        raise
+    medicoes.append((operacao, inicio, time.monotonic() - inicio, True))
+
+
+def sessao_caixa(numero, itens, largada, medicoes):
+    """
+    Uma funcionária: abre o caixa e importa o estoque, espera as outras e fecha
+    o caixa junto com elas. Retorna a falha, se houver.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    nome = f"Carga {numero:03d}"
+    sessao = AppTest.from_file(str(SCRIPT), default_timeout=TIMEOUT_EXECUCAO)
+
+    def abrir_caixa():
+        sessao.text_input(key="nome_funcionaria").input(nome)
+        _executar(sessao, 'abrir caixa')
+        sessao.button(key="abrir_caixa").click()
+        _executar(sessao, 'abrir caixa')
+
+    def lancar_estoque():
+        planilha = "produto,quantidade,responsavel\n" + "".join(
+            f"{PRODUTOS[(numero + i) % len(PRODUTOS)]},{i + 1},{nome}\n" for i in range(itens))
+        sessao.switch_page("paginas/estoque.py")
+        _executar(sessao, 'lançar estoque')
+        sessao.file_uploader(key="arquivo_estoque").set_value(
+            (f"estoque_{numero}.csv", planilha.encode("utf-8"), "text/csv"))
+        _executar(sessao, 'lançar estoque')
+        sessao.button(key="btn_importar_estoque").click()
+        _executar(sessao, 'lançar estoque')
+
+    def fechar_caixa():
+        sessao.switch_page("paginas/caixa.py")
+        _executar(sessao, 'fechar caixa')
+        sessao.text_input(key="fechar_caixa_prefixo").input(nome)
+        _executar(sessao, 'fechar caixa')
+        sessao.text_input(key="text_dinheiro_input").input(f"{100 + numero},50")
+        _executar(sessao, 'fechar caixa')
+        sessao.button(key="fechar_caixa").click()
+        _executar(sessao, 'fechar caixa')
+
+    falhou = None
+    largada.wait(TIMEOUT_LARGADA)
+    try:
+        _medir(medicoes, 'abrir página', lambda: _executar(sessao, 'abrir página'))
+        _medir(medicoes, 'abrir caixa', abrir_caixa)
+        _medir(medicoes, 'lançar estoque', lancar_estoque)
+    except Exception as e:
+        falhou = e
+
+    # Fim do show: todas fecham juntas (quem falhou antes só libera a largada)
+    largada.wait(TIMEOUT_LARGADA)
+    if falhou is None:
+        try:
+            _medir(medicoes, 'fechar caixa', fechar_caixa)
+        except Exception as e:
+            falhou = e
+    return falhou
+
+
+def _processo_sessao(numero, itens, latencia, banco, largada, resultados):
+    """Corpo de cada processo: prepara o banco local e devolve medições e chamadas pela fila"""
+    import streamlit.logger
+
+    from banco_local import cliente_local
+
+    # Sem servidor, o Streamlit avisa a cada uso fora de uma execução do script
+    streamlit.logger.set_log_level("error")
+    cliente = cliente_local(banco)
+    cliente.latencia = latencia
+    cliente.rotulo = lambda: _operacao_atual['nome']
+    medicoes = []
+    try:
+        falha = sessao_caixa(numero, itens, largada, medicoes)
+    except Exception as e:
+        largada.abort()
+        falha = e
+    resultados.put((medicoes, dict(cliente.chamadas), str(falha) if falha else None))
+
+# --- Relatório ---
+
+
+def _percentil(valores, p):
+    if len(valores) == 1:
+        return valores[0]
+    return statistics.quantiles(valores, n=100, method='inclusive')[p - 1]
+
+
+def imprimir_relatorio(medicoes, chamadas, duracao_total, sessoes):
+    print(f"\n{'Operação':<16}{'ok':>5}{'falhas':>8}{'op/s':>8}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'p99 ms':>9}{'máx ms':>9}{'chamadas/op':>13}")
+    for operacao in OPERACOES:
+        registros = [m for m in medicoes if m[0] == operacao]
+        sucessos = sorted(d * 1000 for _, _, d, ok in registros if ok)
+        falhas = len(registros) - len(sucessos)
+        if not registros:
+            continue
+        janela = max(i + d for _, i, d, _ in registros) - min(i for _, i, _, _ in registros)
+        total_chamadas = sum(n for (rotulo, _, _), n in chamadas.items() if rotulo == operacao)
+        if sucessos:
+            print(f"{operacao:<16}{len(sucessos):>5}{falhas:>8}{len(registros) / janela:>8.1f}"
+                  f"{_percentil(sucessos, 50):>9.0f}{_percentil(sucessos, 95):>9.0f}"
+                  f"{_percentil(sucessos, 99):>9.0f}{sucessos[-1]:>9.0f}"
+                  f"{total_chamadas / len(registros):>13.1f}")
+        else:
+            print(f"{operacao:<16}{0:>5}{falhas:>8}")
+
+    print("\nChamadas ao banco por operação (média por sessão):")
+    por_operacao = defaultdict(Counter)
+    for (rotulo, tabela, tipo), n in chamadas.items():
+        por_operacao[rotulo][f"{tabela}.{tipo}"] += n
+    for operacao in OPERACOES:
+        if por_operacao[operacao]:
+            detalhes = ", ".join(f"{nome} {n / sessoes:.1f}"
+                                 for nome, n in por_operacao[operacao].most_common())
+            print(f"  {operacao}: {detalhes}")
+
+    concluidas = sum(1 for m in medicoes if m[0] == 'fechar caixa' and m[3])
+    print(f"\n{concluidas}/{sessoes} caixas fechados em {duracao_total:.1f} s "
+          f"({concluidas / duracao_total:.2f} caixas/s no total)")
+
+# --- Linha de comando ---
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do Sistema EventoCaixa")
+    parser.add_argument("--sessoes", type=int, default=30, help="funcionárias simultâneas")
+    parser.add_argument("--itens", type=int, default=3, help="itens de estoque por funcionária")
+    parser.add_argument("--latencia-ms", type=float, default=20.0,
+                        help="latência simulada por chamada ao banco")
+    parser.add_argument("--banco", help="arquivo SQLite do banco local (padrão: temporário)")
+    args = parser.parse_args(argv)
+
+    pasta = tempfile.TemporaryDirectory()
+    banco = args.banco or str(Path(pasta.name) / "carga.db")
+
+    # Herdada pelos processos das sessões; precisa valer antes de importar banco.py
+    os.environ["EVENTOCAIXA_BANCO_LOCAL"] = banco
+
+    from banco_local import cliente_local
+    from utilitarios import obter_horario_brasilia
+
+    # Esquema e evento criados antes, para as sessões não disputarem as migrações
+    cliente_local(banco).table('evento').insert({
+        'nome': f"Teste de carga {obter_horario_brasilia():%d/%m %H:%M}",
+        'data_inicio': obter_horario_brasilia().date().isoformat(),
+        'encerrado': False,
+    }).execute()
+
+    print(f"{args.sessoes} sessões, {args.itens} itens de estoque cada, "
+          f"{args.latencia_ms:.0f} ms por chamada ao banco")
+    contexto = multiprocessing.get_context("spawn")
+    largada = contexto.Barrier(args.sessoes + 1)
+    resultados = contexto.Queue()
+    processos = [contexto.Process(target=_processo_sessao, args=(
+        numero, args.itens, args.latencia_ms / 1000, banco, largada, resultados))
+        for numero in range(1, args.sessoes + 1)]
+    for processo in processos:
+        processo.start()
+
+    # As medições começam quando todas as sessões terminaram de carregar
+    inicio = time.monotonic()
+    try:
+        largada.wait(TIMEOUT_LARGADA)
+        inicio = time.monotonic()
+        largada.wait(TIMEOUT_LARGADA)
+    except threading.BrokenBarrierError:
+        print("⚠️ Alguma sessão não chegou à largada; os resultados estão incompletos")
+
+    medicoes, chamadas, falhas = [], Counter(), []
+    for _ in processos:
+        medicoes_sessao, chamadas_sessao, falha = resultados.get()
+        medicoes += medicoes_sessao
+        chamadas.update(chamadas_sessao)
+        if falha:
+            falhas.append(falha)
+    duracao_total = time.monotonic() - inicio
+    for processo in processos:
+        processo.join()
+    pasta.cleanup()
+
+    imprimir_relatorio(medicoes, chamadas, duracao_total, args.sessoes)
+    for falha in falhas[:5]:
+        print(f"❌ {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+"""Catálogo de produtos do estoque: um id por produto, seja qual for a grafia digitada.
+
+Os nomes são comparados pela chave (sem espaços extras, em minúsculas), então
+"Cerveja", "cerveja " e "CERVEJA" são o mesmo produto. Nomes novos que só
+diferem de um produto do catálogo por um erro de digitação ("Cervja") são
+reconhecidos por semelhança (difflib); nomes com números diferentes
+("Refri 1L" e "Refri 2L") nunca são considerados o mesmo produto.
+
+O estoque guarda o produto_id e o nome do catálogo, e as somas por produto
+são feitas sobre o id.
+"""
+import difflib
+import re
+import threading
+
+import streamlit as st
+
+from banco import (banco_disponivel, buscar_em_paginas, executar_escrita, executar_leitura,
+                   supabase, versao_dados)
+from modelos import modelar
+from utilitarios import chave_produto
+
+# Semelhança mínima (0 a 1) para um nome digitado ser tratado como produto do catálogo
+SEMELHANCA_MINIMA = 0.85
+NAO_CATALOGADO = "Não catalogado"
+
+
+def _numeros(texto):
+    return re.findall(r"\d+", texto)
+
+# --- Catálogo em memória ---
+
+
+@st.cache_resource
+def _catalogo():
+    """Última versão do catálogo, compartilhada entre sessões"""
+    return {'trava': threading.Lock(), 'versao': None, 'produtos': [], 'por_chave': {}}
+
+
+def _carregar_catalogo():
+    versao = versao_dados('produto')
+    cache = _catalogo()
+    with cache['trava']:
+        if None not in versao and cache['versao'] == versao:
+            return cache
+    try:
+        produtos = modelar('produto', buscar_em_paginas(
+            lambda: supabase.table('produto').select('*').order('nome').order('id')))
+    except Exception as e:
+        if banco_disponivel():
+            st.error(f"Erro ao buscar o catálogo de produtos: {e}")
+        return cache
+    with cache['trava']:
+        cache['versao'] = versao if None not in versao else None
+        cache['produtos'] = produtos
+        # A chave é recalculada a partir do nome: bancos ainda sem a migração
+        # 15 guardam a chave calculada em SQL, que pode não coincidir
+        cache['por_chave'] = {chave_produto(produto.nome): produto for produto in produtos}
+    return cache
+
+
+def produtos_catalogo():
+    """Produtos do catálogo (modelos Produto) em ordem de nome; somente leitura"""
+    return _carregar_catalogo()['produtos']
+
+
+def nomes_produtos():
+    """Nome do catálogo por produto_id"""
+    return {produto.id: produto.nome for produto in produtos_catalogo()}
+
+# --- Correspondência de nomes ---
+
+
+def produtos_parecidos(nome, limite=3):
+    """Produtos do catálogo cujo nome se parece com o digitado, do mais ao menos parecido"""
+    chave = chave_produto(nome)
+    por_chave = _carregar_catalogo()['por_chave']
+    candidatas = [outra for outra in por_chave if _numeros(outra) == _numeros(chave)]
+    return [por_chave[outra] for outra in
+            difflib.get_close_matches(chave, candidatas, n=limite, cutoff=SEMELHANCA_MINIMA)]
+
+
+def produto_correspondente(nome):
+    """Produto do catálogo com a mesma chave ou, se não houver, o mais parecido; None se nenhum"""
+    produto = _carregar_catalogo()['por_chave'].get(chave_produto(nome))
+    if produto is None:
+        parecidos = produtos_parecidos(nome, limite=1)
+        produto = parecidos[0] if parecidos else None
+    return produto
+
+
+def garantir_produtos(nomes):
+    """
+    Produtos do catálogo para os nomes informados, por chave, cadastrando os
+    que ainda não existem. Vários cadastros simultâneos do mesmo nome geram
+    um único produto.
+    """
+    por_chave = dict(_carregar_catalogo()['por_chave'])
+    novos = {}
+    for nome in nomes:
+        chave = chave_produto(nome)
+        if chave and chave not in por_chave:
+            novos.setdefault(chave, " ".join(str(nome).split()))
+
+    if novos:
+        registros = [{'nome': nome, 'chave': chave} for chave, nome in novos.items()]
+        executar_escrita(supabase.table('produto').upsert(
+            registros, on_conflict='chave', ignore_duplicates=True))
+        # Lidos de volta: os já cadastrados por outra sessão não voltam no upsert
+        chaves = list(novos)
+        for inicio in range(0, len(chaves), 200):
+            gravados = executar_leitura(supabase.table('produto').select('*').in_(
+                'chave', chaves[inicio:inicio + 200])).data
+            por_chave.update((produto.chave, produto) for produto in modelar('produto', gravados))
+
+    return {chave_produto(nome): por_chave[chave_produto(nome)]
+            for nome in nomes if chave_produto(nome) in por_chave}
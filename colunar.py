@@ -0,0 +1,169 @@
+"""Tabelas do evento em colunas Arrow, para relatórios e gráficos.
+
+Cada tabela é convertida para uma pyarrow.Table uma única vez por versão dos
+dados (contador_alteracoes) e compartilhada entre as sessões. Na conversão, as
+datas viram date32 e os textos que se repetem (funcionária, produto, origem do
+pagamento) são codificados como dicionário. Os relatórios filtram, somam e
+agrupam essas colunas com pyarrow.compute, sem montar DataFrames a partir de
+dicionários, e entregam as tabelas Arrow direto ao st.dataframe e aos
+gráficos.
+
+O pyarrow já vem com o Streamlit; importe este módulo só nas páginas que o usam.
+"""
+import threading
+from operator import attrgetter
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import streamlit as st
+
+from banco import dados_tabela, evento_ativo_id, versao_dados
+from catalogo import NAO_CATALOGADO, nomes_produtos
+from utilitarios import formatar_moeda
+
+CENTAVOS = pa.int64()
+TEXTO_REPETIDO = pa.dictionary(pa.int32(), pa.string())
+
+# Colunas carregadas por tabela; as datas são convertidas de texto ISO na carga
+ESQUEMAS = {
+    'caixa': pa.schema([
+        ('id', pa.int64()), ('data', pa.date32()), ('hora_abertura', pa.string()),
+        ('hora_fechamento', pa.string()), ('nome_funcionario', TEXTO_REPETIDO),
+        ('dinheiro', CENTAVOS), ('maquineta', CENTAVOS), ('conta_bancaria', CENTAVOS),
+        ('retiradas', CENTAVOS), ('observacoes', pa.string()),
+    ]),
+    'estoque': pa.schema([
+        ('id', pa.int64()), ('data', pa.date32()), ('produto', TEXTO_REPETIDO),
+        ('quantidade', pa.int64()), ('responsavel', TEXTO_REPETIDO), ('caixa_id', pa.int64()),
+        ('produto_id', pa.int64()),
+    ]),
+    'fornecedor': pa.schema([
+        ('id', pa.int64()), ('nome', pa.string()), ('valor', CENTAVOS),
+        ('valor_pago', CENTAVOS), ('pago', pa.bool_()), ('data_pagamento', pa.date32()),
+        ('observacoes', pa.string()),
+    ]),
+    'historico_pagamentos': pa.schema([
+        ('id', pa.int64()), ('fornecedor_id', pa.int64()), ('valor_pago', CENTAVOS),
+        ('origem_pagamento', TEXTO_REPETIDO), ('data_pagamento', pa.date32()),
+        ('observacao', pa.string()),
+    ]),
+    'investidores': pa.schema([
+        ('id', pa.int64()), ('nome', pa.string()), ('valor_investido', CENTAVOS),
+        ('valor_devolvido', CENTAVOS), ('devolvido', pa.bool_()),
+        ('data_devolucao', pa.date32()),
+    ]),
+    'estornos_caixa': pa.schema([
+        ('id', pa.int64()), ('caixa_id', pa.int64()), ('valor_estorno', CENTAVOS),
+        ('tipo_lancamento', TEXTO_REPETIDO), ('motivo', pa.string()),
+        ('data_estorno', pa.date32()), ('hora_estorno', pa.string()),
+    ]),
+}
+
+# --- Conversão ---
+
+
+def para_arrow(tabela, linhas):
+    """Linhas (modelos de modelos.py) como pyarrow.Table com o esquema da tabela"""
+    esquema = ESQUEMAS[tabela]
+    colunas = []
+    for campo in esquema:
+        valores = list(map(attrgetter(campo.name), linhas))
+        if campo.type == pa.date32():
+            coluna = pa.array(valores, pa.string()).cast(pa.date32())
+        elif campo.type == TEXTO_REPETIDO:
+            coluna = pa.array(valores, pa.string()).dictionary_encode()
+        else:
+            coluna = pa.array(valores, campo.type)
+        colunas.append(coluna)
+    return pa.Table.from_arrays(colunas, schema=esquema)
+
+
+@st.cache_resource
+def _tabelas_colunares():
+    """Última versão colunar de cada tabela por evento, compartilhada entre sessões"""
+    return {'trava': threading.Lock(), 'tabelas': {}}
+
+
+def tabela_colunar(tabela):
+    """
+    Tabela do evento ativo em colunas Arrow, refeita só quando a versão dos
+    dados muda. Guarda apenas a versão mais recente de cada tabela.
+    """
+    versao = versao_dados(tabela)
+    chave = (tabela, evento_ativo_id())
+    cache = _tabelas_colunares()
+    with cache['trava']:
+        guardada = cache['tabelas'].get(chave)
+    if guardada and None not in versao and guardada[0] == versao:
+        return guardada[1]
+
+    resultado = para_arrow(tabela, dados_tabela(tabela))
+    # Relida depois da carga: None se ela falhou e serviu uma cópia anterior
+    versao = versao_dados(tabela)
+    if None not in versao:
+        with cache['trava']:
+            cache['tabelas'][chave] = (versao, resultado)
+    return resultado
+
+# --- Operações comuns dos relatórios ---
+
+
+def no_periodo(tabela, coluna, data_inicio, data_fim):
+    """Linhas com a data da coluna entre data_inicio e data_fim (inclusive)"""
+    return tabela.filter((pc.field(coluna) >= data_inicio) & (pc.field(coluna) <= data_fim))
+
+
+def somar_por(tabela, chave, colunas, contar=None):
+    """
+    Soma das colunas por valor da chave, ordenada pela chave. Com contar,
+    inclui a quantidade de valores preenchidos dessa coluna em cada grupo.
+    """
+    agregacoes = [(coluna, 'sum') for coluna in colunas]
+    if contar:
+        agregacoes.append((contar, 'count'))
+    grupos = tabela.group_by(chave).aggregate(agregacoes)
+    chaves = grupos[chave]
+    if pa.types.is_dictionary(chaves.type):
+        # Arrow não ordena colunas de dicionário; os grupos são poucos
+        chaves = pc.cast(chaves, pa.string())
+    resultado = pa.table({
+        chave: chaves,
+        **{coluna: grupos[f"{coluna}_sum"] for coluna in colunas},
+        **({contar: grupos[f"{contar}_count"]} if contar else {}),
+    })
+    return resultado.sort_by(chave)
+
+
+def somar_por_produto(tabela, colunas, contar=None):
+    """
+    somar_por agrupando o estoque pelo produto_id (inteiro) e trocando o id
+    pelo nome do catálogo, ordenado pelo nome
+    """
+    grupos = somar_por(tabela, 'produto_id', colunas, contar)
+    nomes = nomes_produtos()
+    produtos = pa.array([nomes.get(produto_id, NAO_CATALOGADO)
+                         for produto_id in grupos['produto_id'].to_pylist()], pa.string())
+    return grupos.set_column(0, 'produto', produtos).sort_by('produto')
+
+
+def soma(coluna):
+    """Soma de uma coluna de inteiros (0 se vazia)"""
+    return pc.sum(coluna).as_py() or 0
+
+
+def em_reais(coluna):
+    """Centavos para reais, só para os eixos dos gráficos"""
+    return pc.divide(pc.cast(coluna, pa.float64()), 100)
+
+
+def moeda_em_texto(tabela, colunas):
+    """
+    Colunas de centavos trocadas por texto no formato R$ 1.234,56, para exibição
+    (os formatos numéricos do st.dataframe não seguem o padrão brasileiro)
+    """
+    for coluna in colunas:
+        indice = tabela.schema.get_field_index(coluna)
+        textos = pa.array([None if valor is None else formatar_moeda(valor)
+                           for valor in tabela[coluna].to_pylist()], pa.string())
+        tabela = tabela.set_column(indice, coluna, textos)
+    return tabela
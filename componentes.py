@@ -0,0 +1,358 @@
+"""Componentes de interface compartilhados pelas páginas"""
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from banco import (BancoIndisponivel, banco_disponivel, buscar_caixas_paginado, com_evento,
+                   executar_escrita, filtrar, situacao_disjuntor, supabase)
+from utilitarios import (formatar_hora_brasilia, formatar_moeda, obter_horario_brasilia,
+                         texto_para_centavos)
+
+# --- Entrada de valores ---
+
+
+def entrada_monetaria(label, key, valor_minimo=0):
+    """Campo de texto para valores em reais; retorna o valor digitado em centavos"""
+    if key not in st.session_state:
+        st.session_state[key] = ""
+
+    valor_input = st.text_input(
+        label,
+        value=st.session_state[key],
+        key=f"text_{key}",
+        placeholder="0,00"
+    )
+
+    centavos = texto_para_centavos(valor_input) if valor_input else None
+    if centavos is None:
+        st.session_state[key] = ""
+        return 0
+    return max(centavos, valor_minimo)
+
+# --- Envios idempotentes ---
+
+
+def chave_envio(formulario, enviado):
+    """
+    Estado do envio do formulário nesta sessão: {'chave', 'enviada', 'gravada'}.
+    Cliques repetidos enquanto a página ainda processa o primeiro chegam como
+    novos envios com a mesma chave, que o banco usa para ignorar a duplicata;
+    só uma execução sem envio, depois de um envio, troca a chave. Deve ser
+    chamada a cada execução, logo depois do botão de envio.
+    """
+    envios = st.session_state.setdefault('_envios', {})
+    envio = envios.get(formulario)
+    if envio is None or (envio['enviada'] and not enviado):
+        envio = envios[formulario] = {
+            'chave': uuid.uuid4().hex, 'enviada': False, 'gravada': False}
+    if enviado:
+        envio['enviada'] = True
+    return envio
+
+# --- Aviso de modo somente leitura ---
+
+
+def aviso_modo_somente_leitura():
+    """Faixa de aviso com a idade dos dados enquanto o disjuntor estiver aberto"""
+    disjuntor = situacao_disjuntor()
+    if not disjuntor['aberto']:
+        return
+    if disjuntor['ultimo_sucesso']:
+        minutos = int((time.time() - disjuntor['ultimo_sucesso']) // 60)
+        idade = f"dados de {minutos} min atrás" if minutos else "dados de menos de 1 min atrás"
+    else:
+        idade = "nenhum dado carregado ainda"
+    st.warning(f"⚠️ Banco de dados lento ou fora do ar. Modo somente leitura ({idade}); "
+               "alterações estão bloqueadas e a conexão é testada em segundo plano.")
+    if st.button("🔄 Verificar novamente", key="btn_verificar_banco"):
+        st.rerun()
+
+
+@contextmanager
+def gravacao():
+    """
+    Bloco que grava no banco: se o disjuntor abrir, mostra o aviso em vez do
+    erro. Os botões de gravação usam disabled=not banco_disponivel().
+    """
+    try:
+        yield
+    except BancoIndisponivel as e:
+        st.warning(f"⚠️ {e}")
+
+# --- Seletor de caixa paginado ---
+
+
+def rotulo_caixa(caixa):
+    """Texto exibido para um caixa nos seletores"""
+    total = caixa['dinheiro'] + caixa['maquineta']
+    situacao = '(Fechado)' if caixa['hora_fechamento'] else '(Aberto)'
+    return f"{caixa['data']} - {caixa['hora_abertura']} - {caixa['nome_funcionario']} - {formatar_moeda(total)} {situacao}"
+
+
+def seletor_caixa(chave, rotulo, apenas_abertos=False, nome_exato=None, dias_padrao=30, limite=20):
+    """
+    Seletor de caixa com filtros e paginação feitos no banco.
+    A seleção é guardada pelo id do caixa, então rótulos repetidos não se confundem.
+    Retorna o registro do caixa escolhido ou None.
+    """
+    chave_pagina = f"{chave}_pagina"
+    if chave_pagina not in st.session_state:
+        st.session_state[chave_pagina] = 0
+
+    col_filtro1, col_filtro2, col_filtro3 = st.columns(3)
+    data_inicio = data_fim = None
+    if dias_padrao is not None:
+        hoje = obter_horario_brasilia().date()
+        with col_filtro1:
+            data_inicio = st.date_input(
+                "De:", hoje - timedelta(days=dias_padrao), key=f"{chave}_inicio")
+        with col_filtro2:
+            data_fim = st.date_input("Até:", hoje, key=f"{chave}_fim")
+
+    prefixo_nome = ""
+    if nome_exato is None:
+        with col_filtro3:
+            prefixo_nome = st.text_input(
+                "Buscar funcionária:", key=f"{chave}_prefixo", placeholder="Início do nome")
+
+    # Filtros novos sempre começam da primeira página
+    filtros = (data_inicio, data_fim, prefixo_nome, nome_exato, apenas_abertos)
+    if st.session_state.get(f"{chave}_filtros") != filtros:
+        st.session_state[f"{chave}_filtros"] = filtros
+        st.session_state[chave_pagina] = 0
+
+    pagina = st.session_state[chave_pagina]
+    caixas = buscar_caixas_paginado(data_inicio, data_fim, prefixo_nome, nome_exato,
+                                    apenas_abertos, limite=limite, deslocamento=pagina * limite)
+    tem_proxima = len(caixas) > limite
+    caixas_por_id = {caixa['id']: caixa for caixa in caixas[:limite]}
+
+    if not caixas_por_id:
+        if pagina > 0:
+            st.session_state[chave_pagina] = 0
+            st.rerun()
+        return None
+
+    caixa_id = st.selectbox(rotulo, list(caixas_por_id),
+                            format_func=lambda id_caixa: rotulo_caixa(caixas_por_id[id_caixa]),
+                            key=f"{chave}_id")
+
+    if pagina > 0 or tem_proxima:
+        col_anterior, col_pagina, col_proxima = st.columns([1, 2, 1])
+        with col_anterior:
+            if st.button("⬅️ Anteriores", key=f"{chave}_anterior", disabled=pagina == 0):
+                st.session_state[chave_pagina] = pagina - 1
+                st.rerun()
+        with col_pagina:
+            st.caption(f"Página {pagina + 1}")
+        with col_proxima:
+            if st.button("Próximos ➡️", key=f"{chave}_proxima", disabled=not tem_proxima):
+                st.session_state[chave_pagina] = pagina + 1
+                st.rerun()
+
+    return caixas_por_id.get(caixa_id)
+
+# --- Importação de planilhas ---
+
+
+def painel_importacao(chave, instrucoes, validar, importar, rotulo_itens):
+    """
+    Envio de planilha com validação, relatório das linhas rejeitadas e gravação em lote.
+    validar(df) devolve (validos, rejeitados); importar(validos) devolve quantos foram gravados.
+    """
+    from importacao import ler_planilha
+
+    st.caption(instrucoes)
+    arquivo = st.file_uploader(
+        "Arquivo", type=["csv", "xlsx"], key=f"arquivo_{chave}")
+    if not arquivo:
+        return
+
+    try:
+        validos, rejeitados = validar(ler_planilha(arquivo))
+    except Exception as e:
+        st.error(f"❌ Não foi possível ler a planilha: {e}")
+        return
+
+    col_imp1, col_imp2 = st.columns(2)
+    with col_imp1:
+        st.metric("✅ Linhas válidas", len(validos))
+    with col_imp2:
+        st.metric("❌ Linhas rejeitadas", len(rejeitados))
+
+    if not rejeitados.empty:
+        st.write("**Linhas rejeitadas:**")
+        st.dataframe(rejeitados, use_container_width=True, height=200)
+        st.download_button("⬇️ Baixar linhas rejeitadas",
+                           rejeitados.to_csv(index=False, encoding='utf-8-sig'),
+                           file_name=f"{chave}_rejeitados.csv", key=f"baixar_rejeitados_{chave}")
+
+    if not validos.empty and st.button(f"📥 Importar {len(validos)} {rotulo_itens}", key=f"btn_importar_{chave}",
+                                       disabled=not banco_disponivel()):
+        with gravacao():
+            with st.spinner("Importando..."):
+                gravados = importar(validos)
+            st.success(f"✅ {gravados} {rotulo_itens} importados!")
+            time.sleep(1)
+            st.rerun()
+
+
+# --- FRAGMENTOS DE LANÇAMENTO ---
+# Digitar valores reexecuta só o fragmento; apenas o botão final grava no
+# banco e reexecuta a página inteira.
+
+
+@st.fragment
+def fragmento_fechamento_caixa(caixa):
+    """Valores, resumo e confirmação do fechamento de um caixa"""
+    col3, col4 = st.columns(2)
+
+    with col3:
+        st.write("### 💰 Valores de Fechamento")
+        dinheiro = entrada_monetaria(
+            "💵 Valor em dinheiro", "dinheiro_input")
+        maquineta = entrada_monetaria(
+            "💳 Valor na maquineta", "maquineta_input")
+        retiradas = entrada_monetaria(
+            "↗️ Retiradas do caixa", "retiradas_input")
+
+        if dinheiro > 0 or maquineta > 0:
+            st.info(
+                f"**Valor digitado:** {formatar_moeda(dinheiro + maquineta - retiradas)}")
+
+    with col4:
+        st.write("### 📊 Resumo")
+        if dinheiro > 0 or maquineta > 0:
+            col_a, col_b, col_c = st.columns(3)
+            with col_a:
+                st.metric("💵 Dinheiro", formatar_moeda(dinheiro))
+            with col_b:
+                st.metric("💳 Maquineta", formatar_moeda(maquineta))
+            with col_c:
+                st.metric("↗️ Retiradas",
+                          formatar_moeda(retiradas))
+
+            st.metric("💰 Total Líquido", formatar_moeda(dinheiro + maquineta - retiradas),
+                      delta=formatar_moeda(dinheiro + maquineta - retiradas))
+        else:
+            st.info("ℹ️ Digite os valores para ver o resumo")
+
+    observacoes = st.text_area("📝 Observações", key="obs_caixa")
+
+    fechar = st.button("🔒 Fechar Caixa", type="primary", key="fechar_caixa",
+                       disabled=not banco_disponivel())
+    envio = chave_envio(f"fechar_caixa_{caixa['id']}", fechar)
+    if fechar:
+        with gravacao():
+            if dinheiro == 0 and maquineta == 0:
+                st.warning(
+                    "⚠️ Valores zerados. Confirme se está correto.")
+            else:
+                hora_fechamento = formatar_hora_brasilia()
+                fechado = True
+                if not envio['gravada']:
+                    # Só fecha se ainda estiver aberto: um clique repetido não regrava os valores
+                    fechado = bool(executar_escrita(supabase.table('caixa').update({
+                        'dinheiro': dinheiro,
+                        'maquineta': maquineta,
+                        'retiradas': retiradas,
+                        'observacoes': observacoes,
+                        'hora_fechamento': hora_fechamento
+                    }).eq('id', caixa['id']).is_('hora_fechamento', 'null')).data)
+
+                    # Vincular estoque ao caixa, só se este envio o fechou, num único update;
+                    # a condição caixa_id nulo impede revincular itens de outro fechamento
+                    data_hoje = obter_horario_brasilia().date().isoformat()
+                    itens_nao_vinculados = filtrar(
+                        'estoque', data=data_hoje, responsavel=caixa['nome_funcionario'], caixa_id=None)
+
+                    if fechado and itens_nao_vinculados:
+                        executar_escrita(supabase.table('estoque').update(
+                            {'caixa_id': caixa['id']}).in_(
+                            'id', [item['id'] for item in itens_nao_vinculados]).is_('caixa_id', 'null'))
+                    envio['gravada'] = True
+
+                for key in ["dinheiro_input", "maquineta_input", "retiradas_input"]:
+                    if key in st.session_state:
+                        st.session_state[key] = ""
+
+                if fechado:
+                    st.success(f"✅ Caixa fechado às {hora_fechamento}!")
+                else:
+                    st.info("ℹ️ Este caixa já tinha sido fechado")
+                time.sleep(1)
+                st.rerun()
+
+
+@st.fragment
+def fragmento_deposito_bancario():
+    """Depósito na conta bancária, dividido entre os caixas do dia escolhido"""
+    data_selecionada = st.date_input(
+        "Selecione a data:", datetime.now().date(), key="data_conta_bancaria")
+
+    caixas_do_dia = filtrar('caixa', data=data_selecionada.isoformat())
+
+    if caixas_do_dia:
+        st.write(f"**Caixas encontrados para {data_selecionada}:**")
+        total_conta_dia = sum(caixa.conta_bancaria for caixa in caixas_do_dia)
+
+        col_bank1, col_bank2 = st.columns(2)
+
+        with col_bank1:
+            st.metric("💰 Total em Conta (Dia)",
+                      formatar_moeda(total_conta_dia))
+            valor_conta = entrada_monetaria(
+                "💳 Valor a adicionar à conta bancária", "valor_conta_bancaria")
+
+            if st.button("💾 Adicionar à Conta Bancária", key="add_conta_bancaria",
+                         disabled=not banco_disponivel()):
+                with gravacao():
+                    # Divide em centavos inteiros; a sobra vai para os primeiros caixas
+                    valor_por_caixa, sobra = divmod(valor_conta, len(caixas_do_dia))
+                    for indice, caixa in enumerate(caixas_do_dia):
+                        novo_valor = caixa.conta_bancaria + \
+                            valor_por_caixa + (1 if indice < sobra else 0)
+                        executar_escrita(supabase.table('caixa').update({'conta_bancaria': novo_valor}).eq(
+                            'id', caixa['id']))
+                    st.success(
+                        f"✅ Valor de {formatar_moeda(valor_conta)} adicionado à conta bancária!")
+                    time.sleep(1)
+                    st.rerun()
+
+        with col_bank2:
+            st.write("**Valores por caixa:**")
+            for caixa in caixas_do_dia:
+                st.write(
+                    f"{caixa['nome_funcionario']}: {formatar_moeda(caixa['conta_bancaria'])}")
+    else:
+        st.warning(
+            f"Nenhum caixa encontrado para {data_selecionada}. Abra caixas primeiro para adicionar valores bancários.")
+
+
+@st.fragment
+def fragmento_novo_investidor():
+    """Cadastro de um novo investidor"""
+    nome_investidor = st.text_input(
+        "Nome do Investidor", key="novo_investidor_nome", placeholder="Ex: João Silva")
+    valor_investido = entrada_monetaria(
+        "Valor Investido (R$)", "novo_investidor_valor_input", valor_minimo=1)
+
+    if st.button("💾 Adicionar Investidor", type="primary", key="adicionar_investidor",
+                 disabled=not banco_disponivel()):
+        if nome_investidor.strip() and valor_investido >= 1:
+            with gravacao():
+                executar_escrita(supabase.table('investidores').insert(com_evento({
+                    'nome': nome_investidor.strip(),
+                    'valor_investido': valor_investido,
+                    'valor_devolvido': 0,
+                    'devolvido': False
+                })))
+                st.success(
+                    f"✅ {nome_investidor} adicionado com investimento de {formatar_moeda(valor_investido)}!")
+                time.sleep(1)
+                st.rerun()
+        else:
+            st.error("❌ Preencha todos os campos corretamente")
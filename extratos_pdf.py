@@ -0,0 +1,221 @@
+"""Extratos em PDF: fechamento de caixa e pagamentos a fornecedor.
+
+As funções de geração recebem dicionários simples (linhas do banco) e
+devolvem os bytes do PDF, sem depender do Streamlit, para poderem rodar em
+outros processos. gerar_lote distribui os documentos por um pool de
+processos e empacota todos num único .zip.
+
+Cada extrato traz um código de verificação (sha256 dos dados usados) e
+linhas para assinatura.
+"""
+import hashlib
+import io
+import json
+import multiprocessing
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+from utilitarios import formatar_moeda
+
+# --- Documento base ---
+
+
+def codigo_verificacao(dados):
+    """Resumo curto e estável dos dados do extrato, impresso no rodapé"""
+    conteudo = json.dumps(dados, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()[:16].upper()
+
+
+def _texto(valor):
+    """As fontes padrão do PDF só cobrem latin-1; o resto vira '?'"""
+    return str("" if valor is None else valor).encode("latin-1", "replace").decode("latin-1")
+
+
+class _Extrato(FPDF):
+    def __init__(self, titulo, evento, codigo):
+        super().__init__(format="A4")
+        self.titulo, self.evento, self.codigo = titulo, evento, codigo
+        self.set_auto_page_break(auto=True, margin=20)
+        self.add_page()
+
+    def header(self):
+        self.set_font("Helvetica", "B", 14)
+        self.cell(0, 8, _texto(f"Sistema EventoCaixa - {self.titulo}"),
+                  new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.set_font("Helvetica", "", 10)
+        self.cell(0, 6, _texto(f"Evento: {self.evento}"), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.ln(4)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font("Helvetica", "I", 8)
+        self.cell(0, 5, _texto(f"Código de verificação: {self.codigo}"))
+        self.cell(0, 5, f"Página {self.page_no()}/{{nb}}", align="R")
+
+    def secao(self, titulo):
+        self.ln(3)
+        self.set_font("Helvetica", "B", 11)
+        self.cell(0, 7, _texto(titulo), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.set_font("Helvetica", "", 10)
+
+    def campo(self, rotulo, valor):
+        self.set_font("Helvetica", "B", 10)
+        self.cell(45, 6, _texto(rotulo))
+        self.set_font("Helvetica", "", 10)
+        self.cell(0, 6, _texto(valor), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    def tabela(self, cabecalho, linhas, larguras, alinhamentos=None):
+        alinhamentos = alinhamentos or ["L"] * len(cabecalho)
+        self.set_font("Helvetica", "B", 9)
+        for titulo, largura in zip(cabecalho, larguras):
+            self.cell(largura, 6, _texto(titulo), border=1)
+        self.ln()
+        self.set_font("Helvetica", "", 9)
+        for linha in linhas:
+            for valor, largura, alinhamento in zip(linha, larguras, alinhamentos):
+                self.cell(largura, 6, _texto(valor)[:60], border=1, align=alinhamento)
+            self.ln()
+
+    def assinaturas(self, *rotulos):
+        self.ln(18)
+        largura = (self.w - self.l_margin - self.r_margin) / len(rotulos)
+        for _ in rotulos:
+            self.cell(largura, 6, "_" * 35, align="C")
+        self.ln()
+        for rotulo in rotulos:
+            self.cell(largura, 6, _texto(rotulo), align="C")
+        self.ln()
+
+    def bytes(self):
+        return bytes(self.output())
+
+# --- Extratos ---
+
+
+def pdf_fechamento_caixa(dados):
+    """
+    Extrato de um caixa fechado.
+    dados: {'evento': nome, 'caixa': linha do caixa, 'estornos': [...], 'estoque': [...]}
+    """
+    caixa = dados['caixa']
+    pdf = _Extrato("Fechamento de Caixa", dados['evento'], codigo_verificacao(dados))
+
+    pdf.campo("Funcionária:", caixa['nome_funcionario'])
+    pdf.campo("Data:", caixa['data'])
+    pdf.campo("Abertura:", caixa['hora_abertura'])
+    pdf.campo("Fechamento:", caixa['hora_fechamento'])
+
+    pdf.secao("Valores")
+    dinheiro, maquineta = caixa['dinheiro'] or 0, caixa['maquineta'] or 0
+    retiradas, bancario = caixa['retiradas'] or 0, caixa['conta_bancaria'] or 0
+    pdf.tabela(["Lançamento", "Valor"], [
+        ["Dinheiro", formatar_moeda(dinheiro)],
+        ["Maquineta", formatar_moeda(maquineta)],
+        ["Retiradas", formatar_moeda(-retiradas)],
+        ["Total líquido", formatar_moeda(dinheiro + maquineta - retiradas)],
+        ["Conta bancária", formatar_moeda(bancario)],
+    ], [90, 50], ["L", "R"])
+
+    pdf.secao("Estornos")
+    if dados['estornos']:
+        pdf.tabela(["Data", "Hora", "Tipo", "Valor", "Motivo"], [
+            [e['data_estorno'], e['hora_estorno'], e['tipo_lancamento'],
+             formatar_moeda(e['valor_estorno']), e['motivo']]
+            for e in dados['estornos']
+        ], [25, 20, 25, 30, 90], ["L", "L", "L", "R", "L"])
+    else:
+        pdf.cell(0, 6, "Nenhum estorno registrado.", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    pdf.secao("Estoque vinculado")
+    if dados['estoque']:
+        pdf.tabela(["Produto", "Quantidade", "Responsável"], [
+            [item['produto'], item['quantidade'], item['responsavel']]
+            for item in dados['estoque']
+        ], [90, 30, 70], ["L", "R", "L"])
+        pdf.campo("Total de itens:", sum(item['quantidade'] for item in dados['estoque']))
+    else:
+        pdf.cell(0, 6, "Nenhum item de estoque vinculado.", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    if caixa.get('observacoes'):
+        pdf.secao("Observações")
+        pdf.multi_cell(0, 6, _texto(caixa['observacoes']))
+
+    pdf.assinaturas("Funcionária", "Conferido por")
+    return pdf.bytes()
+
+
+def pdf_extrato_fornecedor(dados):
+    """
+    Extrato de pagamentos de um fornecedor.
+    dados: {'evento': nome, 'fornecedor': linha do fornecedor, 'pagamentos': [...]}
+    """
+    fornecedor = dados['fornecedor']
+    pdf = _Extrato("Extrato de Fornecedor", dados['evento'], codigo_verificacao(dados))
+
+    valor, pago = fornecedor['valor'] or 0, fornecedor['valor_pago'] or 0
+    pdf.campo("Fornecedor:", fornecedor['nome'])
+    pdf.campo("Valor total:", formatar_moeda(valor))
+    pdf.campo("Total pago:", formatar_moeda(pago))
+    pdf.campo("Restante:", formatar_moeda(max(0, valor - pago)))
+    pdf.campo("Situação:", f"Pago em {fornecedor['data_pagamento']}" if fornecedor['pago']
+              else "Pendente")
+
+    pdf.secao("Pagamentos")
+    if dados['pagamentos']:
+        pdf.tabela(["Data", "Origem", "Valor", "Observação"], [
+            [p['data_pagamento'], p['origem_pagamento'], formatar_moeda(p['valor_pago']),
+             p['observacao']]
+            for p in sorted(dados['pagamentos'], key=lambda p: (p['data_pagamento'], p['id']))
+        ], [25, 35, 30, 100], ["L", "L", "R", "L"])
+    else:
+        pdf.cell(0, 6, "Nenhum pagamento registrado.", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    if fornecedor.get('observacoes'):
+        pdf.secao("Observações")
+        pdf.multi_cell(0, 6, _texto(fornecedor['observacoes']))
+
+    pdf.assinaturas("Fornecedor", "Responsável pelo evento")
+    return pdf.bytes()
+
+
+GERADORES = {
+    'caixa': pdf_fechamento_caixa,
+    'fornecedor': pdf_extrato_fornecedor,
+}
+
+
+def nome_arquivo(*partes):
+    """Nome de arquivo seguro a partir das partes (sem barras, espaços ou pontuação)"""
+    return re.sub(r'[^\w.-]+', '_', "_".join(str(parte) for parte in partes)).strip('_')
+
+# --- Lote ---
+
+
+def _gerar(documento):
+    tipo, caminho, dados = documento
+    return caminho, GERADORES[tipo](dados)
+
+
+def gerar_lote(documentos, max_processos=None, progresso=None):
+    """
+    Gera os PDFs num pool de processos e devolve os bytes de um .zip com todos.
+    documentos: [(tipo, caminho_no_zip, dados)], com tipo em GERADORES.
+    progresso(fracao), se informado, é chamado a cada documento pronto.
+    """
+    saida = io.BytesIO()
+    # spawn: o servidor tem várias threads, e fork copiaria travas em uso
+    contexto = multiprocessing.get_context("spawn")
+    with zipfile.ZipFile(saida, "w", zipfile.ZIP_DEFLATED) as pacote:
+        if documentos:
+            with ProcessPoolExecutor(max_workers=max_processos, mp_context=contexto) as executor:
+                futuros = [executor.submit(_gerar, documento) for documento in documentos]
+                for prontos, futuro in enumerate(as_completed(futuros), 1):
+                    caminho, conteudo = futuro.result()
+                    pacote.writestr(caminho, conteudo)
+                    if progresso:
+                        progresso(prontos / len(futuros))
+    return saida.getvalue()
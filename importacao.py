@@ -0,0 +1,221 @@
+"""Importação de planilhas (CSV/XLSX): leitura, validação vetorizada e gravação em lote.
+Importado só pelas telas que recebem planilhas, pois carrega pandas e numpy."""
+import numpy as np
+import pandas as pd
+
+from banco import dados_tabela, inserir_em_lotes, obter_caixa_aberto_hoje
+from catalogo import chave_produto, garantir_produtos, produto_correspondente
+from utilitarios import ORIGENS_PAGAMENTO, obter_horario_brasilia
+
+# --- Leitura e validação ---
+
+
+def ler_planilha(arquivo):
+    """Lê um CSV ou XLSX enviado como DataFrame de texto, com colunas em minúsculas"""
+    if arquivo.name.lower().endswith('.xlsx'):
+        df = pd.read_excel(arquivo, dtype=str)
+    else:
+        df = pd.read_csv(arquivo, dtype=str, sep=None,
+                         engine='python', encoding='utf-8-sig')
+    df.columns = [str(coluna).strip().lower() for coluna in df.columns]
+    # Número da linha como aparece na planilha (cabeçalho é a linha 1)
+    df.insert(0, 'linha', df.index + 2)
+    return df
+
+
+def converter_valores_monetarios(serie):
+    """
+    Versão vetorizada de texto_para_centavos ('1.234,56', 'R$ 10'): devolve os
+    valores em centavos (Int64, <NA> onde o texto não é um número). A conta é
+    feita sobre os dígitos, sem passar por float, com arredondamento meio para cima.
+    """
+    limpo = serie.fillna('').astype(str).str.replace(r'[^\d,.]', '', regex=True)
+    com_virgula = limpo.str.contains(',', regex=False)
+    limpo = limpo.where(~com_virgula, limpo.str.replace(
+        '.', '', regex=False).str.replace(',', '.', regex=False))
+
+    partes = limpo.str.extract(r'^(\d*)(?:\.(\d*))?$')
+    inteiro, fracao = partes[0].fillna(''), partes[1].fillna('')
+    valido = partes[0].notna() & ((inteiro != '') | (fracao != ''))
+    fracao = fracao.str.ljust(3, '0')
+    centavos = (pd.to_numeric(inteiro.where(inteiro != '', '0')) * 100
+                + pd.to_numeric(fracao.str[:2])
+                + (fracao.str[2] >= '5').astype('int64'))
+    return centavos.where(valido).astype('Int64')
+
+
+def _coluna_texto(df, coluna):
+    """Coluna de texto limpa (espaços extras removidos); vazia se não existir"""
+    if coluna not in df.columns:
+        return pd.Series('', index=df.index)
+    return df[coluna].fillna('').astype(str).str.strip().str.replace(r'\s+', ' ', regex=True)
+
+
+def _separar_rejeitados(df, validos, motivo):
+    rejeitados = df[motivo != ''].copy()
+    rejeitados['motivo'] = motivo[motivo != '']
+    return validos[motivo == ''], rejeitados
+
+
+def validar_importacao_estoque(df, responsavel_padrao):
+    """
+    Valida de uma vez todas as linhas da planilha de estoque (colunas produto,
+    quantidade e, opcionalmente, responsavel). Os produtos já vêm com o nome
+    do catálogo quando o digitado corresponde a um produto cadastrado.
+    Retorna (validos, rejeitados); rejeitados traz o motivo de cada linha.
+    """
+    faltando = {'produto', 'quantidade'} - set(df.columns)
+    if faltando:
+        raise ValueError(
+            f"Coluna(s) obrigatória(s) ausente(s): {', '.join(sorted(faltando))}")
+
+    produto = _coluna_texto(df, 'produto')
+    catalogados = {}
+    for nome in produto.unique():
+        correspondente = produto_correspondente(nome) if nome else None
+        catalogados[nome] = correspondente.nome if correspondente else nome
+    produto = produto.map(catalogados)
+    quantidade = pd.to_numeric(
+        _coluna_texto(df, 'quantidade').str.replace(',', '.'), errors='coerce')
+    responsavel = _coluna_texto(df, 'responsavel')
+    responsavel = responsavel.where(responsavel != '', responsavel_padrao)
+
+    motivo = np.select(
+        [produto == '', quantidade.isna(), quantidade <= 0, quantidade % 1 != 0],
+        ['Produto em branco', 'Quantidade inválida',
+            'Quantidade deve ser positiva', 'Quantidade deve ser inteira'],
+        default='')
+
+    validos, rejeitados = _separar_rejeitados(df, pd.DataFrame({
+        'linha': df['linha'], 'produto': produto,
+        'quantidade': quantidade, 'responsavel': responsavel}), motivo)
+    return validos.astype({'quantidade': int}), rejeitados
+
+
+def importar_estoque(validos):
+    """
+    Grava os itens válidos no estoque, vinculando-os ao caixa aberto de cada
+    responsável e ao produto do catálogo (cadastrado aqui se ainda não existir)
+    """
+    data_hoje = obter_horario_brasilia().date().isoformat()
+    produtos = garantir_produtos(validos['produto'].unique())
+    caixas_abertos = {}
+    for responsavel in validos['responsavel'].unique():
+        caixa_aberto = obter_caixa_aberto_hoje(responsavel)
+        caixas_abertos[responsavel] = caixa_aberto['id'] if caixa_aberto else None
+
+    registros = [
+        {
+            'data': data_hoje,
+            'produto': produtos[chave_produto(produto)].nome,
+            'produto_id': produtos[chave_produto(produto)].id,
+            'quantidade': int(quantidade),
+            'responsavel': responsavel,
+            'caixa_id': caixas_abertos[responsavel]
+        }
+        for produto, quantidade, responsavel in zip(
+            validos['produto'], validos['quantidade'], validos['responsavel'])
+    ]
+    return len(inserir_em_lotes('estoque', registros))
+
+
+def validar_importacao_fornecedores(df):
+    """
+    Valida a planilha de fornecedores (nome, valor e, opcionalmente, observacoes,
+    pagamento_inicial, origem_pagamento e obs_pagamento). Nomes já cadastrados
+    no evento ou repetidos na planilha são rejeitados.
+    """
+    faltando = {'nome', 'valor'} - set(df.columns)
+    if faltando:
+        raise ValueError(
+            f"Coluna(s) obrigatória(s) ausente(s): {', '.join(sorted(faltando))}")
+
+    nome = _coluna_texto(df, 'nome')
+    valor = converter_valores_monetarios(df['valor'])
+    pagamento = converter_valores_monetarios(
+        _coluna_texto(df, 'pagamento_inicial').replace('', '0'))
+    origens = {origem.casefold(): origem for origem in ORIGENS_PAGAMENTO}
+    origem = _coluna_texto(df, 'origem_pagamento').str.casefold().map(origens)
+
+    chave_nome = nome.str.casefold()
+    existentes = {f['nome'].strip().casefold()
+                  for f in dados_tabela('fornecedor')}
+
+    motivo = np.select(
+        [nome == '', valor.isna() | (valor <= 0), pagamento.isna() | (pagamento < 0),
+         (pagamento.fillna(0) > 0) & origem.isna(), chave_nome.isin(existentes),
+         chave_nome.duplicated()],
+        ['Nome em branco', 'Valor inválido', 'Pagamento inicial inválido',
+         f"Origem do pagamento deve ser: {', '.join(ORIGENS_PAGAMENTO)}",
+         'Fornecedor já cadastrado', 'Nome repetido na planilha'],
+        default='')
+
+    return _separar_rejeitados(df, pd.DataFrame({
+        'linha': df['linha'], 'nome': nome, 'valor': valor,
+        'observacoes': _coluna_texto(df, 'observacoes'),
+        'pagamento_inicial': pagamento, 'origem_pagamento': origem,
+        'obs_pagamento': _coluna_texto(df, 'obs_pagamento')}), motivo)
+
+
+def importar_fornecedores(validos):
+    """
+    Grava os fornecedores e seus pagamentos iniciais em lotes; o valor pago
+    de cada fornecedor é somado pelo banco a partir do histórico
+    """
+    data_hoje = obter_horario_brasilia().date().isoformat()
+    registros = [
+        {'nome': forn['nome'], 'valor': int(forn['valor']),
+            'observacoes': forn['observacoes'], 'valor_pago': 0, 'pago': False}
+        for forn in validos.to_dict('records')
+    ]
+    gravados = inserir_em_lotes('fornecedor', registros)
+
+    # Nomes são únicos no lote, então servem para achar o id gravado
+    ids = {forn['nome'].casefold(): forn['id'] for forn in gravados}
+    pagamentos = [
+        {
+            'fornecedor_id': ids[forn['nome'].casefold()],
+            'valor_pago': int(forn['pagamento_inicial']),
+            'origem_pagamento': forn['origem_pagamento'],
+            'data_pagamento': data_hoje,
+            'observacao': forn['obs_pagamento'] or None
+        }
+        for forn in validos.to_dict('records') if forn['pagamento_inicial'] > 0
+    ]
+    inserir_em_lotes('historico_pagamentos', pagamentos)
+    return len(gravados)
+
+
+def validar_importacao_investidores(df):
+    """Valida a planilha de investidores (nome e valor_investido); nomes já cadastrados são rejeitados"""
+    faltando = {'nome', 'valor_investido'} - set(df.columns)
+    if faltando:
+        raise ValueError(
+            f"Coluna(s) obrigatória(s) ausente(s): {', '.join(sorted(faltando))}")
+
+    nome = _coluna_texto(df, 'nome')
+    valor = converter_valores_monetarios(df['valor_investido'])
+    chave_nome = nome.str.casefold()
+    existentes = {inv['nome'].strip().casefold()
+                  for inv in dados_tabela('investidores')}
+
+    motivo = np.select(
+        [nome == '', valor.isna() | (valor < 1), chave_nome.isin(existentes),
+         chave_nome.duplicated()],
+        ['Nome em branco', 'Valor investido inválido',
+         'Investidor já cadastrado (use o formulário para novos aportes)',
+         'Nome repetido na planilha'],
+        default='')
+
+    return _separar_rejeitados(df, pd.DataFrame({
+        'linha': df['linha'], 'nome': nome, 'valor_investido': valor}), motivo)
+
+
+def importar_investidores(validos):
+    """Grava os investidores em lotes"""
+    registros = [
+        {'nome': nome, 'valor_investido': int(valor),
+            'valor_devolvido': 0, 'devolvido': False}
+        for nome, valor in zip(validos['nome'], validos['valor_investido'])
+    ]
+    return len(inserir_em_lotes('investidores', registros))
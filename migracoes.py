@@ -0,0 +1,827 @@
+"""Migrações versionadas do banco do Sistema EventoCaixa.
+
+Uso:
+    python migracoes.py aplicar            # aplica as migrações pendentes
+    python migracoes.py status             # lista migrações aplicadas/pendentes
+    python migracoes.py explicar           # mostra o plano das consultas quentes
+
+O destino vem de --destino ou da variável DATABASE_URL (.env). URLs
+postgres:// / postgresql:// usam o Postgres (o mesmo do Supabase); qualquer
+outro valor é tratado como caminho de um arquivo SQLite local, útil como
+substituto do banco em testes.
+"""
+import argparse
+import os
+import sqlite3
+
+from dotenv import load_dotenv
+
+from utilitarios import chave_produto
+
+DESTINO_PADRAO = "sistema_cis.db"
+
+# Colunas de dinheiro, gravadas como inteiros de centavos desde a versão 8
+COLUNAS_MONETARIAS = {
+    'caixa': ['dinheiro', 'maquineta', 'conta_bancaria', 'retiradas'],
+    'fornecedor': ['valor', 'valor_pago'],
+    'historico_pagamentos': ['valor_pago'],
+    'investidores': ['valor_investido', 'valor_devolvido'],
+    'estornos_caixa': ['valor_estorno'],
+}
+VERSAO_CENTAVOS = 8
+# Desde a versão 12, fornecedor.valor_pago é sempre a soma do histórico de pagamentos
+VERSAO_VALOR_PAGO = 12
+
+
+def _sql_rastreamento_alteracoes(tabelas):
+    """Gera, por dialeto, a coluna updated_at e os gatilhos de alteração/exclusão"""
+    postgres = ["""
+CREATE TABLE IF NOT EXISTS exclusoes (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    tabela TEXT NOT NULL,
+    registro_id BIGINT NOT NULL,
+    excluido_em TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+CREATE INDEX IF NOT EXISTS idx_exclusoes_tabela_data ON exclusoes (tabela, excluido_em);
+
+CREATE OR REPLACE FUNCTION definir_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = clock_timestamp();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION registrar_exclusao() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO exclusoes (tabela, registro_id) VALUES (TG_TABLE_NAME, OLD.id);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+"""]
+    sqlite = ["""
+CREATE TABLE IF NOT EXISTS exclusoes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tabela TEXT NOT NULL,
+    registro_id BIGINT NOT NULL,
+    excluido_em TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_exclusoes_tabela_data ON exclusoes (tabela, excluido_em);
+"""]
+    agora_sqlite = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+
+    for tabela in tabelas:
+        postgres.append(f"""
+ALTER TABLE {tabela} ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp();
+CREATE INDEX IF NOT EXISTS idx_{tabela}_updated_at ON {tabela} (updated_at);
+CREATE TRIGGER trg_{tabela}_updated_at BEFORE INSERT OR UPDATE ON {tabela}
+    FOR EACH ROW EXECUTE FUNCTION definir_updated_at();
+CREATE TRIGGER trg_{tabela}_exclusao AFTER DELETE ON {tabela}
+    FOR EACH ROW EXECUTE FUNCTION registrar_exclusao();
+""")
+        # SQLite não aceita default não constante em ADD COLUMN; os gatilhos
+        # preenchem a coluna depois de cada INSERT/UPDATE
+        sqlite.append(f"""
+ALTER TABLE {tabela} ADD COLUMN updated_at TEXT;
+UPDATE {tabela} SET updated_at = {agora_sqlite};
+CREATE INDEX IF NOT EXISTS idx_{tabela}_updated_at ON {tabela} (updated_at);
+CREATE TRIGGER trg_{tabela}_updated_at_insert AFTER INSERT ON {tabela} FOR EACH ROW
+BEGIN
+    UPDATE {tabela} SET updated_at = {agora_sqlite} WHERE id = NEW.id;
+END;
+CREATE TRIGGER trg_{tabela}_updated_at_update AFTER UPDATE ON {tabela} FOR EACH ROW
+    WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE {tabela} SET updated_at = {agora_sqlite} WHERE id = NEW.id;
+END;
+CREATE TRIGGER trg_{tabela}_exclusao AFTER DELETE ON {tabela} FOR EACH ROW
+BEGIN
+    INSERT INTO exclusoes (tabela, registro_id) VALUES ('{tabela}', OLD.id);
+END;
+""")
+
+    return {"postgres": "".join(postgres), "sqlite": "".join(sqlite)}
+
+
+def _sql_particao_evento(tabelas):
+    """Gera, por dialeto, a tabela evento e a coluna evento_id nas tabelas operacionais"""
+    comum = """
+CREATE TABLE IF NOT EXISTS evento (
+    id {pk},
+    nome TEXT NOT NULL,
+    data_inicio DATE,
+    data_fim DATE,
+    encerrado BOOLEAN DEFAULT FALSE
+);
+
+-- Dados anteriores à separação por evento ficam num evento inicial
+INSERT INTO evento (nome, data_inicio)
+    SELECT 'Evento inicial', (SELECT MIN(data) FROM caixa)
+    WHERE NOT EXISTS (SELECT 1 FROM evento);
+"""
+    postgres = [comum]
+    sqlite = [comum]
+    for tabela in tabelas:
+        atualizar = (f"UPDATE {tabela} SET evento_id = (SELECT MIN(id) FROM evento) "
+                     f"WHERE evento_id IS NULL;\n")
+        indice = f"CREATE INDEX IF NOT EXISTS idx_{tabela}_evento ON {tabela} (evento_id);\n"
+        postgres.append(f"ALTER TABLE {tabela} ADD COLUMN IF NOT EXISTS evento_id BIGINT "
+                        f"REFERENCES evento (id);\n" + atualizar + indice)
+        sqlite.append(f"ALTER TABLE {tabela} ADD COLUMN evento_id BIGINT "
+                      f"REFERENCES evento (id);\n" + atualizar + indice)
+
+    # Índices das consultas quentes passam a começar pelo evento
+    indices = """
+DROP INDEX IF EXISTS idx_caixa_aberto_data_funcionario;
+CREATE INDEX IF NOT EXISTS idx_caixa_aberto_evento_data_funcionario
+    ON caixa (evento_id, data, nome_funcionario) WHERE hora_fechamento IS NULL;
+
+DROP INDEX IF EXISTS idx_estoque_responsavel_data_caixa;
+CREATE INDEX IF NOT EXISTS idx_estoque_evento_responsavel_data_caixa
+    ON estoque (evento_id, responsavel, data, caixa_id);
+
+DROP INDEX IF EXISTS idx_caixa_data_abertura;
+CREATE INDEX IF NOT EXISTS idx_caixa_evento_data_abertura
+    ON caixa (evento_id, data DESC, hora_abertura DESC, id DESC);
+
+DROP INDEX IF EXISTS idx_caixa_funcionario_data_abertura;
+CREATE INDEX IF NOT EXISTS idx_caixa_evento_funcionario_data_abertura
+    ON caixa (evento_id, nome_funcionario, data DESC, hora_abertura DESC, id DESC);
+"""
+    for tabela in ["caixa", "estoque", "fornecedor", "investidores"]:
+        indices += (f"DROP INDEX IF EXISTS idx_{tabela}_updated_at;\n"
+                    f"CREATE INDEX IF NOT EXISTS idx_{tabela}_evento_updated_at "
+                    f"ON {tabela} (evento_id, updated_at);\n")
+
+    return {"postgres": "".join(postgres) + indices, "sqlite": "".join(sqlite) + indices}
+
+
+def _sql_valores_em_centavos(colunas_por_tabela):
+    """Gera, por dialeto, a conversão das colunas de reais (NUMERIC) para centavos inteiros"""
+    postgres = []
+    sqlite = []
+    for tabela, colunas in colunas_por_tabela.items():
+        for coluna in colunas:
+            postgres.append(f"""
+ALTER TABLE {tabela} ALTER COLUMN {coluna} DROP DEFAULT;
+ALTER TABLE {tabela} ALTER COLUMN {coluna} TYPE BIGINT USING ROUND({coluna} * 100)::BIGINT;
+ALTER TABLE {tabela} ALTER COLUMN {coluna} SET DEFAULT 0;
+""")
+        # SQLite não muda o tipo da coluna; com afinidade NUMERIC, inteiros
+        # já são gravados como INTEGER
+        atribuicoes = ", ".join(f"{coluna} = CAST(ROUND({coluna} * 100) AS INTEGER)"
+                                for coluna in colunas)
+        sqlite.append(f"UPDATE {tabela} SET {atribuicoes};\n")
+    return {"postgres": "".join(postgres), "sqlite": "".join(sqlite)}
+
+
+def _sql_contador_alteracoes(tabelas):
+    """Gera, por dialeto, a tabela de versões e os gatilhos que a incrementam a cada gravação"""
+    sementes = ", ".join(f"('{tabela}', 0)" for tabela in tabelas)
+    postgres = [f"""
+CREATE TABLE IF NOT EXISTS contador_alteracoes (
+    tabela TEXT PRIMARY KEY,
+    versao BIGINT NOT NULL DEFAULT 0
+);
+INSERT INTO contador_alteracoes (tabela, versao) VALUES {sementes}
+    ON CONFLICT (tabela) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION contar_alteracao() RETURNS trigger AS $$
+BEGIN
+    UPDATE contador_alteracoes SET versao = versao + 1 WHERE tabela = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""]
+    sqlite = [f"""
+CREATE TABLE IF NOT EXISTS contador_alteracoes (
+    tabela TEXT PRIMARY KEY,
+    versao BIGINT NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO contador_alteracoes (tabela, versao) VALUES {sementes};
+"""]
+
+    for tabela in tabelas:
+        # Um incremento por comando, não por linha: lotes grandes custam uma atualização
+        postgres.append(f"""
+CREATE TRIGGER trg_{tabela}_contador AFTER INSERT OR UPDATE OR DELETE ON {tabela}
+    FOR EACH STATEMENT EXECUTE FUNCTION contar_alteracao();
+""")
+        # SQLite só tem gatilhos por linha
+        for operacao in ["INSERT", "UPDATE", "DELETE"]:
+            sqlite.append(f"""
+CREATE TRIGGER trg_{tabela}_contador_{operacao.lower()} AFTER {operacao} ON {tabela} FOR EACH ROW
+BEGIN
+    UPDATE contador_alteracoes SET versao = versao + 1 WHERE tabela = '{tabela}';
+END;
+""")
+
+    return {"postgres": "".join(postgres), "sqlite": "".join(sqlite)}
+
+
+def _sql_ajustar_sequencias(tabelas):
+    """
+    Função (só Postgres) chamada pelo backup.py depois de restaurar linhas
+    com ids explícitos, que não avançam as sequências
+    """
+    lista = ", ".join(f"'{tabela}'" for tabela in tabelas)
+    return f"""
+CREATE OR REPLACE FUNCTION ajustar_sequencias() RETURNS void AS $$
+DECLARE
+    tabela TEXT;
+BEGIN
+    FOREACH tabela IN ARRAY ARRAY[{lista}] LOOP
+        EXECUTE format(
+            'SELECT setval(pg_get_serial_sequence(%L, ''id''), COALESCE((SELECT MAX(id) FROM %I), 0) + 1, false)',
+            tabela, tabela);
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+"""
+
+
+def _sql_catalogo_produtos():
+    """
+    Gera, por dialeto, o catálogo de produtos e a unificação dos nomes já
+    digitados no estoque: grafias com a mesma chave (sem espaços extras, em
+    minúsculas) viram um único produto, com o nome da grafia mais usada
+    """
+    nome_limpo = {
+        "postgres": r"regexp_replace(TRIM(produto), '\s+', ' ', 'g')",
+        # SQLite não tem expressões regulares; três trocas juntam até 8 espaços seguidos
+        "sqlite": "REPLACE(REPLACE(REPLACE(TRIM(produto), '  ', ' '), '  ', ' '), '  ', ' ')",
+    }
+    sql = {}
+    for dialeto, nome in nome_limpo.items():
+        coluna = ("ALTER TABLE estoque ADD COLUMN IF NOT EXISTS produto_id" if dialeto == "postgres"
+                  else "ALTER TABLE estoque ADD COLUMN produto_id")
+        sql[dialeto] = f"""
+CREATE TABLE IF NOT EXISTS produto (
+    id {{pk}},
+    nome TEXT NOT NULL,
+    chave TEXT NOT NULL UNIQUE
+);
+{coluna} BIGINT REFERENCES produto (id);
+
+INSERT INTO produto (nome, chave)
+    SELECT nome, chave FROM (
+        SELECT nome, chave,
+               ROW_NUMBER() OVER (PARTITION BY chave ORDER BY COUNT(*) DESC, nome) AS ordem
+        FROM (SELECT {nome} AS nome, LOWER({nome}) AS chave FROM estoque) AS grafias
+        WHERE chave <> ''
+        GROUP BY nome, chave
+    ) AS contagem
+    WHERE ordem = 1;
+
+UPDATE estoque SET
+    produto_id = (SELECT id FROM produto WHERE chave = LOWER({nome})),
+    produto = COALESCE((SELECT nome FROM produto WHERE chave = LOWER({nome})), produto);
+
+-- Somas de estoque por produto no evento lidas só do índice
+CREATE INDEX IF NOT EXISTS idx_estoque_evento_produto ON estoque (evento_id, produto_id, quantidade);
+"""
+    sql["postgres"] += _sql_ajustar_sequencias(['evento', 'produto', 'caixa', 'fornecedor',
+                                                'investidores', 'estoque', 'historico_pagamentos',
+                                                'estornos_caixa'])
+    contador = _sql_contador_alteracoes(["produto"])
+    return {dialeto: sql[dialeto] + contador[dialeto] for dialeto in sql}
+
+
+def _sql_recalcular_valor_pago(alvo):
+    """UPDATE que refaz valor_pago, pago e data_pagamento do fornecedor pela soma do histórico"""
+    total = (f"(SELECT COALESCE(SUM(h.valor_pago), 0) FROM historico_pagamentos h "
+             f"WHERE h.fornecedor_id = {alvo})")
+    return f"""UPDATE fornecedor SET
+        valor_pago = {total},
+        pago = {total} >= valor,
+        data_pagamento = CASE WHEN {total} >= valor THEN (SELECT MAX(h.data_pagamento)
+            FROM historico_pagamentos h WHERE h.fornecedor_id = {alvo}) END
+    WHERE id = {alvo};"""
+
+
+def _sql_valor_pago_pelo_historico():
+    """
+    Gera, por dialeto, os gatilhos que recalculam valor_pago, pago e
+    data_pagamento do fornecedor a partir do histórico, na mesma transação de
+    cada pagamento, e o lançamento no histórico dos valores pagos sem registro
+    """
+    # Pagamentos gravados só em fornecedor.valor_pago (pagamento inicial sem origem,
+    # importações) entram no histórico, para a soma continuar batendo
+    saldo = """
+INSERT INTO historico_pagamentos (fornecedor_id, valor_pago, origem_pagamento, data_pagamento,
+                                  observacao, evento_id)
+    SELECT f.id, f.valor_pago - COALESCE((SELECT SUM(h.valor_pago) FROM historico_pagamentos h
+                                          WHERE h.fornecedor_id = f.id), 0),
+           NULL, COALESCE(f.data_pagamento, CURRENT_DATE), 'Pago antes do histórico', f.evento_id
+    FROM fornecedor f
+    WHERE f.valor_pago > COALESCE((SELECT SUM(h.valor_pago) FROM historico_pagamentos h
+                                   WHERE h.fornecedor_id = f.id), 0);
+"""
+    postgres = f"""
+CREATE OR REPLACE FUNCTION recalcular_valor_pago(alvo BIGINT) RETURNS void AS $$
+BEGIN
+    -- Trava o fornecedor antes de somar: pagamentos simultâneos do mesmo
+    -- fornecedor esperam um pelo outro e a soma já inclui o anterior
+    PERFORM 1 FROM fornecedor WHERE id = alvo FOR UPDATE;
+    {_sql_recalcular_valor_pago('alvo')}
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION atualizar_valor_pago() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM recalcular_valor_pago(OLD.fornecedor_id);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM recalcular_valor_pago(NEW.fornecedor_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_historico_pagamentos_valor_pago
+    AFTER INSERT OR UPDATE OR DELETE ON historico_pagamentos
+    FOR EACH ROW EXECUTE FUNCTION atualizar_valor_pago();
+""" + saldo
+    sqlite = [saldo]
+    for operacao, alvos in [("INSERT", ["NEW"]), ("UPDATE", ["OLD", "NEW"]), ("DELETE", ["OLD"])]:
+        corpo = "\n    ".join(_sql_recalcular_valor_pago(f"{alvo}.fornecedor_id") for alvo in alvos)
+        sqlite.insert(0, f"""
+CREATE TRIGGER trg_historico_pagamentos_valor_pago_{operacao.lower()}
+    AFTER {operacao} ON historico_pagamentos FOR EACH ROW
+BEGIN
+    {corpo}
+END;
+""")
+    return {"postgres": postgres, "sqlite": "".join(sqlite)}
+
+
+def _sql_valor_pago_fora_do_arquivamento():
+    """
+    Gera, por dialeto, o gatilho de exclusão do histórico que não recalcula o
+    fornecedor quando o pagamento já está na cópia arquivada do evento: o
+    arquivamento leva o histórico, mas o fornecedor fica com os totais pagos
+    """
+    arquivado = ("EXISTS (SELECT 1 FROM arquivo_evento a WHERE a.evento_id = OLD.evento_id "
+                 "AND a.tabela = 'historico_pagamentos')")
+    postgres = f"""
+CREATE OR REPLACE FUNCTION atualizar_valor_pago() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' AND {arquivado} THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM recalcular_valor_pago(OLD.fornecedor_id);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM recalcular_valor_pago(NEW.fornecedor_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+    sqlite = f"""
+DROP TRIGGER IF EXISTS trg_historico_pagamentos_valor_pago_delete;
+CREATE TRIGGER trg_historico_pagamentos_valor_pago_delete
+    AFTER DELETE ON historico_pagamentos FOR EACH ROW
+    WHEN NOT {arquivado}
+BEGIN
+    {_sql_recalcular_valor_pago("OLD.fornecedor_id")}
+END;
+"""
+    return {"postgres": postgres, "sqlite": sqlite}
+
+
+def _unificar_chaves_produto(conexao, dialeto):
+    """
+    Regrava a chave de cada produto com chave_produto, a mesma do catálogo, e
+    junta os produtos que passam a ter a mesma chave. A chave da migração 11
+    era calculada em SQL, que não coincide com a do app: o LOWER do SQLite só
+    converte letras sem acento e as trocas de espaços não juntam qualquer
+    sequência. Fica o produto com mais itens de estoque; os itens dos demais
+    passam para ele.
+    """
+    marcador = "?" if dialeto == "sqlite" else "%s"
+    cursor = conexao.cursor()
+    cursor.execute("SELECT p.id, p.nome, p.chave, COUNT(e.id) FROM produto p "
+                   "LEFT JOIN estoque e ON e.produto_id = p.id "
+                   "GROUP BY p.id, p.nome, p.chave ORDER BY p.id")
+    grupos = {}
+    for produto in cursor.fetchall():
+        grupos.setdefault(chave_produto(produto[1]), []).append(produto)
+
+    trocas = []
+    for chave, produtos in grupos.items():
+        id_mantido, nome_mantido, chave_atual, _ = max(
+            produtos, key=lambda produto: (produto[3], -produto[0]))
+        for id_repetido, _, _, _ in produtos:
+            if id_repetido == id_mantido:
+                continue
+            cursor.execute(f"UPDATE estoque SET produto_id = {marcador}, produto = {marcador} "
+                           f"WHERE produto_id = {marcador}", (id_mantido, nome_mantido, id_repetido))
+            cursor.execute(f"DELETE FROM produto WHERE id = {marcador}", (id_repetido,))
+        if chave_atual != chave:
+            trocas.append((chave, id_mantido))
+    # Só depois das exclusões: a chave nova pode ser a de um produto removido
+    for chave, id_produto in trocas:
+        cursor.execute(f"UPDATE produto SET chave = {marcador} WHERE id = {marcador}",
+                       (chave, id_produto))
+    cursor.close()
+
+
+def _sql_arquivo_evento():
+    """
+    Gera, por dialeto, a cópia durável dos eventos arquivados: o .jsonl.gz de
+    cada tabela em base64, dividido em partes, gravado no banco antes de as
+    linhas saírem das tabelas operacionais
+    """
+    tabela = """
+CREATE TABLE IF NOT EXISTS arquivo_evento (
+    id {pk},
+    evento_id BIGINT NOT NULL REFERENCES evento (id),
+    tabela TEXT NOT NULL,
+    parte INTEGER NOT NULL,
+    linhas INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    conteudo TEXT NOT NULL,
+    arquivado_em TIMESTAMPTZ NOT NULL,
+    UNIQUE (evento_id, tabela, parte)
+);
+"""
+    return {
+        "postgres": tabela + _sql_ajustar_sequencias(
+            ['evento', 'arquivo_evento', 'produto', 'caixa', 'fornecedor', 'investidores',
+             'estoque', 'historico_pagamentos', 'estornos_caixa']),
+        "sqlite": tabela,
+    }
+
+
+# Cada migração é aplicada uma única vez, em ordem de versão. O SQL pode ser
+# um texto único (válido nos dois dialetos) ou um dict por dialeto. A marca
+# {pk} é trocada pela definição de chave primária de cada banco.
+MIGRACOES = [
+    {
+        "versao": 1,
+        "nome": "schema_inicial",
+        "sql": """
+CREATE TABLE IF NOT EXISTS caixa (
+    id {pk},
+    data DATE NOT NULL,
+    hora_abertura TIME,
+    hora_fechamento TIME,
+    nome_funcionario TEXT NOT NULL,
+    dinheiro NUMERIC(12, 2) DEFAULT 0,
+    maquineta NUMERIC(12, 2) DEFAULT 0,
+    conta_bancaria NUMERIC(12, 2) DEFAULT 0,
+    retiradas NUMERIC(12, 2) DEFAULT 0,
+    observacoes TEXT
+);
+
+CREATE TABLE IF NOT EXISTS estoque (
+    id {pk},
+    data DATE NOT NULL,
+    produto TEXT NOT NULL,
+    quantidade INTEGER NOT NULL DEFAULT 0,
+    responsavel TEXT,
+    caixa_id BIGINT REFERENCES caixa (id)
+);
+
+CREATE TABLE IF NOT EXISTS fornecedor (
+    id {pk},
+    nome TEXT NOT NULL,
+    valor NUMERIC(12, 2) NOT NULL DEFAULT 0,
+    valor_pago NUMERIC(12, 2) DEFAULT 0,
+    pago BOOLEAN DEFAULT FALSE,
+    data_pagamento DATE,
+    observacoes TEXT
+);
+
+CREATE TABLE IF NOT EXISTS historico_pagamentos (
+    id {pk},
+    fornecedor_id BIGINT NOT NULL REFERENCES fornecedor (id),
+    valor_pago NUMERIC(12, 2) NOT NULL,
+    origem_pagamento TEXT,
+    data_pagamento DATE NOT NULL,
+    observacao TEXT
+);
+
+CREATE TABLE IF NOT EXISTS investidores (
+    id {pk},
+    nome TEXT NOT NULL,
+    valor_investido NUMERIC(12, 2) NOT NULL DEFAULT 0,
+    valor_devolvido NUMERIC(12, 2) DEFAULT 0,
+    devolvido BOOLEAN DEFAULT FALSE,
+    data_devolucao DATE
+);
+
+CREATE TABLE IF NOT EXISTS estornos_caixa (
+    id {pk},
+    caixa_id BIGINT NOT NULL REFERENCES caixa (id),
+    valor_estorno NUMERIC(12, 2) NOT NULL,
+    tipo_lancamento TEXT NOT NULL,
+    motivo TEXT,
+    data_estorno DATE NOT NULL,
+    hora_estorno TIME
+);
+""",
+    },
+    {
+        "versao": 2,
+        "nome": "indices_consultas_quentes",
+        "sql": """
+-- Caixa aberto do dia por funcionária (abertura, fechamento, vínculo de estoque)
+CREATE INDEX IF NOT EXISTS idx_caixa_aberto_data_funcionario
+    ON caixa (data, nome_funcionario) WHERE hora_fechamento IS NULL;
+
+-- Itens de estoque ainda não vinculados no fechamento do caixa
+CREATE INDEX IF NOT EXISTS idx_estoque_responsavel_data_caixa
+    ON estoque (responsavel, data, caixa_id);
+
+-- Histórico de pagamentos de um fornecedor, mais recente primeiro
+CREATE INDEX IF NOT EXISTS idx_historico_fornecedor_data
+    ON historico_pagamentos (fornecedor_id, data_pagamento DESC);
+
+-- Estornos de um caixa
+CREATE INDEX IF NOT EXISTS idx_estornos_caixa
+    ON estornos_caixa (caixa_id, data_estorno DESC, hora_estorno DESC);
+""",
+    },
+    {
+        "versao": 3,
+        "nome": "indices_seletor_caixa",
+        "sql": """
+-- Seletor paginado: janela de datas, mais recentes primeiro
+CREATE INDEX IF NOT EXISTS idx_caixa_data_abertura
+    ON caixa (data DESC, hora_abertura DESC, id DESC);
+
+-- Seletor paginado da própria funcionária (Editar Caixa Existente)
+CREATE INDEX IF NOT EXISTS idx_caixa_funcionario_data_abertura
+    ON caixa (nome_funcionario, data DESC, hora_abertura DESC, id DESC);
+""",
+    },
+    {
+        "versao": 4,
+        "nome": "rastreamento_alteracoes",
+        "sql": _sql_rastreamento_alteracoes(["caixa", "estoque", "fornecedor", "investidores"]),
+    },
+    {
+        "versao": 5,
+        "nome": "particao_por_evento",
+        "sql": _sql_particao_evento(["caixa", "estoque", "fornecedor", "investidores",
+                                     "historico_pagamentos", "estornos_caixa"]),
+    },
+    {
+        "versao": 6,
+        "nome": "evento_arquivado",
+        "sql": """
+ALTER TABLE evento ADD COLUMN arquivado_em TIMESTAMPTZ;
+""",
+    },
+    {
+        "versao": 7,
+        "nome": "ajuste_sequencias_restauracao",
+        "sql": {
+            "postgres": _sql_ajustar_sequencias(['evento', 'caixa', 'fornecedor', 'investidores',
+                                                 'estoque', 'historico_pagamentos',
+                                                 'estornos_caixa']),
+            # AUTOINCREMENT já acompanha o maior id gravado
+            "sqlite": "",
+        },
+    },
+    {
+        "versao": VERSAO_CENTAVOS,
+        "nome": "valores_em_centavos",
+        "sql": _sql_valores_em_centavos(COLUNAS_MONETARIAS),
+    },
+    {
+        "versao": 9,
+        "nome": "contador_alteracoes",
+        "sql": _sql_contador_alteracoes(["caixa", "estoque", "fornecedor", "investidores",
+                                         "historico_pagamentos", "estornos_caixa"]),
+    },
+    {
+        "versao": 10,
+        "nome": "chaves_idempotencia",
+        "sql": """
+-- Chave gerada a cada envio de formulário: reenvios com a mesma chave (cliques
+-- repetidos durante uma execução lenta) são ignorados pelo upsert
+ALTER TABLE fornecedor ADD COLUMN chave_idempotencia TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_fornecedor_chave_idempotencia
+    ON fornecedor (chave_idempotencia);
+
+ALTER TABLE historico_pagamentos ADD COLUMN chave_idempotencia TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_historico_pagamentos_chave_idempotencia
+    ON historico_pagamentos (chave_idempotencia);
+""",
+    },
+    {
+        "versao": 11,
+        "nome": "catalogo_produtos",
+        "sql": _sql_catalogo_produtos(),
+    },
+    {
+        "versao": VERSAO_VALOR_PAGO,
+        "nome": "valor_pago_pelo_historico",
+        "sql": _sql_valor_pago_pelo_historico(),
+    },
+    {
+        "versao": 13,
+        "nome": "arquivo_evento",
+        "sql": _sql_arquivo_evento(),
+    },
+    {
+        "versao": 14,
+        "nome": "valor_pago_fora_do_arquivamento",
+        "sql": _sql_valor_pago_fora_do_arquivamento(),
+    },
+    {
+        "versao": 15,
+        "nome": "chaves_produto",
+        "sql": "",
+        # Passo em Python, na mesma transação, depois do SQL
+        "python": _unificar_chaves_produto,
+    },
+]
+
+# Consultas mais frequentes do app, usadas pelo comando "explicar".
+CONSULTAS_QUENTES = [
+    (
+        "caixa aberto hoje",
+        "SELECT id FROM caixa WHERE evento_id = %s AND data = %s "
+        "AND nome_funcionario = %s AND hora_fechamento IS NULL",
+        (1, "2025-08-01", "Maria"),
+    ),
+    (
+        "estoque não vinculado no fechamento",
+        "SELECT * FROM estoque WHERE evento_id = %s AND responsavel = %s "
+        "AND data = %s AND caixa_id IS NULL",
+        (1, "Maria", "2025-08-01"),
+    ),
+    (
+        "histórico de pagamentos do fornecedor",
+        "SELECT * FROM historico_pagamentos WHERE fornecedor_id = %s "
+        "ORDER BY data_pagamento DESC",
+        (1,),
+    ),
+    (
+        "estornos do caixa",
+        "SELECT * FROM estornos_caixa WHERE caixa_id = %s "
+        "ORDER BY data_estorno DESC, hora_estorno DESC",
+        (1,),
+    ),
+    (
+        "página de caixas da funcionária",
+        "SELECT * FROM caixa WHERE evento_id = %s AND nome_funcionario = %s "
+        "AND data >= %s ORDER BY data DESC, hora_abertura DESC, id DESC LIMIT 21 OFFSET 0",
+        (1, "Maria", "2025-07-01"),
+    ),
+    (
+        "estoque por produto",
+        "SELECT produto_id, SUM(quantidade) FROM estoque WHERE evento_id = %s "
+        "GROUP BY produto_id",
+        (1,),
+    ),
+]
+
+CHAVE_PRIMARIA = {
+    "postgres": "BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY",
+    "sqlite": "INTEGER PRIMARY KEY AUTOINCREMENT",
+}
+
+# --- Conexão ---
+
+
+def conectar(destino):
+    """Abre a conexão com o destino e retorna (conexao, dialeto)"""
+    if destino.startswith(("postgres://", "postgresql://")):
+        try:
+            import psycopg
+        except ImportError:
+            import psycopg2 as psycopg
+        return psycopg.connect(destino), "postgres"
+    return sqlite3.connect(destino), "sqlite"
+
+
+def sql_para_dialeto(sql, dialeto):
+    """Resolve o SQL da migração para o dialeto informado"""
+    if isinstance(sql, dict):
+        sql = sql[dialeto]
+    return sql.replace("{pk}", CHAVE_PRIMARIA[dialeto])
+
+
+def _executar_script(conexao, dialeto, sql):
+    if dialeto == "sqlite":
+        conexao.executescript(sql)
+    else:
+        with conexao.cursor() as cursor:
+            cursor.execute(sql)
+
+# --- Migrações ---
+
+
+def versoes_aplicadas(conexao, dialeto):
+    """Retorna o conjunto de versões já aplicadas no destino"""
+    _executar_script(conexao, dialeto, """
+CREATE TABLE IF NOT EXISTS schema_migracoes (
+    versao INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    aplicada_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+""")
+    conexao.commit()
+    cursor = conexao.cursor()
+    cursor.execute("SELECT versao FROM schema_migracoes")
+    versoes = {linha[0] for linha in cursor.fetchall()}
+    cursor.close()
+    return versoes
+
+
+def aplicar_migracoes(conexao, dialeto, ate=None):
+    """Aplica, em ordem, as migrações pendentes e retorna as versões aplicadas"""
+    aplicadas = versoes_aplicadas(conexao, dialeto)
+    novas = []
+
+    for migracao in sorted(MIGRACOES, key=lambda m: m["versao"]):
+        versao = migracao["versao"]
+        if versao in aplicadas or (ate is not None and versao > ate):
+            continue
+
+        sql = sql_para_dialeto(migracao["sql"], dialeto)
+        registro = (
+            f"INSERT INTO schema_migracoes (versao, nome) "
+            f"VALUES ({versao}, '{migracao['nome']}');"
+        )
+        try:
+            if dialeto == "sqlite":
+                # executescript faz commit implícito; o BEGIN explícito mantém
+                # a migração, o passo em Python e o registro na mesma transação
+                conexao.executescript(f"BEGIN;\n{sql}")
+            else:
+                _executar_script(conexao, dialeto, sql)
+            if "python" in migracao:
+                migracao["python"](conexao, dialeto)
+            cursor = conexao.cursor()
+            cursor.execute(registro)
+            cursor.close()
+            conexao.commit()
+        except Exception:
+            conexao.rollback()
+            raise
+        novas.append(versao)
+
+    return novas
+
+
+def explicar_consultas(conexao, dialeto):
+    """Retorna [(nome, plano)] com o plano de execução de cada consulta quente"""
+    planos = []
+    cursor = conexao.cursor()
+    for nome, sql, parametros in CONSULTAS_QUENTES:
+        if dialeto == "sqlite":
+            cursor.execute("EXPLAIN QUERY PLAN " + sql.replace("%s", "?"), parametros)
+            plano = "\n".join(linha[-1] for linha in cursor.fetchall())
+        else:
+            cursor.execute("EXPLAIN " + sql, parametros)
+            plano = "\n".join(linha[0] for linha in cursor.fetchall())
+        planos.append((nome, plano))
+    cursor.close()
+    return planos
+
+# --- Linha de comando ---
+
+
+def main(argv=None):
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Migrações do Sistema EventoCaixa")
+    parser.add_argument("comando", choices=["aplicar", "status", "explicar"])
+    parser.add_argument("--destino", default=os.environ.get("DATABASE_URL", DESTINO_PADRAO),
+                        help="URL do Postgres ou caminho do arquivo SQLite")
+    parser.add_argument("--ate", type=int, default=None,
+                        help="aplica somente até esta versão")
+    args = parser.parse_args(argv)
+
+    conexao, dialeto = conectar(args.destino)
+    try:
+        if args.comando == "aplicar":
+            novas = aplicar_migracoes(conexao, dialeto, ate=args.ate)
+            if novas:
+                print(f"Migrações aplicadas: {', '.join(map(str, novas))}")
+            else:
+                print("Nenhuma migração pendente.")
+
+        elif args.comando == "status":
+            aplicadas = versoes_aplicadas(conexao, dialeto)
+            for migracao in MIGRACOES:
+                situacao = "aplicada" if migracao["versao"] in aplicadas else "pendente"
+                print(f"{migracao['versao']:04d} {migracao['nome']}: {situacao}")
+
+        else:
+            # Em Postgres, rode ANALYZE com dados reais antes de ler os planos:
+            # em tabelas vazias o planejador prefere varredura sequencial.
+            for nome, plano in explicar_consultas(conexao, dialeto):
+                print(f"== {nome}\n{plano}\n")
+    finally:
+        conexao.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Linhas das tabelas como objetos compactos, no lugar de dicionários.
+
+As cópias locais e as cargas completas de banco.py guardam cada linha como
+instância de uma das classes abaixo. Com __slots__ não há um dicionário por
+linha, e os textos que se repetem (datas, nomes, produtos, origens) são
+compartilhados entre as linhas, então históricos grandes ocupam bem menos
+memória.
+
+Os nulos são normalizados uma única vez, na carga (de_linha): dinheiro e
+quantidade ausentes viram 0 e marcações ausentes viram False, então os
+somatórios não precisam de `or 0`. Nos laços de agregação prefira o acesso
+por atributo (caixa.dinheiro), que é o mais rápido.
+
+As linhas são somente leitura e continuam se comportando como dicionários
+(linha['coluna'], linha.get, {**linha}, dict(linha), pd.DataFrame(linhas)),
+então as páginas que as tratam assim não mudam.
+"""
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+
+from migracoes import COLUNAS_MONETARIAS
+
+
+class Linha(Mapping):
+    """Base dos modelos: acesso por atributo e pela interface de dicionário"""
+    __slots__ = ()
+
+    TABELA = None
+    ZERADAS = ()     # colunas numéricas além das de dinheiro em que nulo vale 0
+    FALSAS = ()      # colunas booleanas em que nulo vale False
+    INTERNADAS = ()  # textos repetidos entre linhas, guardados uma única vez
+
+    @classmethod
+    def de_linha(cls, linha):
+        """Modelo a partir da linha do banco, com os nulos normalizados; colunas desconhecidas são ignoradas"""
+        valores = [linha.get(coluna) for coluna in cls._colunas]
+        for indice in cls._indices_zerados:
+            if valores[indice] is None:
+                valores[indice] = 0
+        for indice in cls._indices_falsos:
+            if valores[indice] is None:
+                valores[indice] = False
+        for indice in cls._indices_internados:
+            if valores[indice] is not None:
+                valores[indice] = sys.intern(valores[indice])
+        return cls(*valores)
+
+    def __getitem__(self, coluna):
+        if coluna not in self._conjunto_colunas:
+            raise KeyError(coluna)
+        return getattr(self, coluna)
+
+    def __iter__(self):
+        return iter(self._colunas)
+
+    def __len__(self):
+        return len(self._colunas)
+
+
+def _modelo(cls):
+    """Transforma a classe num dataclass com __slots__ e prepara a normalização da carga"""
+    cls = dataclass(slots=True, frozen=True)(cls)
+    cls._colunas = tuple(campo.name for campo in fields(cls))
+    cls._conjunto_colunas = frozenset(cls._colunas)
+    zeradas = (*COLUNAS_MONETARIAS.get(cls.TABELA, []), *cls.ZERADAS)
+    cls._indices_zerados = tuple(cls._colunas.index(coluna) for coluna in zeradas)
+    cls._indices_falsos = tuple(cls._colunas.index(coluna) for coluna in cls.FALSAS)
+    cls._indices_internados = tuple(cls._colunas.index(coluna) for coluna in cls.INTERNADAS)
+    return cls
+
+# --- Modelos ---
+
+
+@_modelo
+class Caixa(Linha):
+    TABELA = 'caixa'
+    INTERNADAS = ('data', 'nome_funcionario')
+
+    id: int
+    data: str
+    hora_abertura: str | None
+    hora_fechamento: str | None
+    nome_funcionario: str
+    dinheiro: int
+    maquineta: int
+    conta_bancaria: int
+    retiradas: int
+    observacoes: str | None
+    updated_at: str | None
+    evento_id: int | None
+
+
+@_modelo
+class ItemEstoque(Linha):
+    TABELA = 'estoque'
+    ZERADAS = ('quantidade',)
+    INTERNADAS = ('data', 'produto', 'responsavel')
+
+    id: int
+    data: str
+    produto: str
+    quantidade: int
+    responsavel: str | None
+    caixa_id: int | None
+    updated_at: str | None
+    evento_id: int | None
+    produto_id: int | None
+
+
+@_modelo
+class Produto(Linha):
+    TABELA = 'produto'
+
+    id: int
+    nome: str
+    chave: str
+
+
+@_modelo
+class Fornecedor(Linha):
+    TABELA = 'fornecedor'
+    FALSAS = ('pago',)
+
+    id: int
+    nome: str
+    valor: int
+    valor_pago: int
+    pago: bool
+    data_pagamento: str | None
+    observacoes: str | None
+    updated_at: str | None
+    evento_id: int | None
+    chave_idempotencia: str | None
+
+
+@_modelo
+class Pagamento(Linha):
+    TABELA = 'historico_pagamentos'
+    INTERNADAS = ('origem_pagamento', 'data_pagamento')
+
+    id: int
+    fornecedor_id: int
+    valor_pago: int
+    origem_pagamento: str | None
+    data_pagamento: str
+    observacao: str | None
+    evento_id: int | None
+    chave_idempotencia: str | None
+
+
+@_modelo
+class Investidor(Linha):
+    TABELA = 'investidores'
+    FALSAS = ('devolvido',)
+
+    id: int
+    nome: str
+    valor_investido: int
+    valor_devolvido: int
+    devolvido: bool
+    data_devolucao: str | None
+    updated_at: str | None
+    evento_id: int | None
+
+
+@_modelo
+class Estorno(Linha):
+    TABELA = 'estornos_caixa'
+    INTERNADAS = ('tipo_lancamento', 'data_estorno')
+
+    id: int
+    caixa_id: int
+    valor_estorno: int
+    tipo_lancamento: str
+    motivo: str | None
+    data_estorno: str
+    hora_estorno: str | None
+    evento_id: int | None
+
+
+MODELOS = {modelo.TABELA: modelo for modelo in
+           (Caixa, ItemEstoque, Produto, Fornecedor, Pagamento, Investidor, Estorno)}
+
+
+def modelar(tabela, linhas):
+    """Linhas do banco (qualquer iterável de dicionários) como modelos da tabela"""
+    de_linha = MODELOS[tabela].de_linha
+    return [de_linha(linha) for linha in linhas]
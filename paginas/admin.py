@@ -0,0 +1,441 @@
+"""Área administrativa: login, painel financeiro, conta bancária,
+investimentos, fornecedores e arquivo de eventos"""
+import time
+
+import pandas as pd
+import streamlit as st
+
+import arquivamento
+from banco import (BancoIndisponivel, banco_disponivel, buscar_eventos, calcular_totais,
+                   com_evento, dados_tabela, evento_ativo_id, executar_escrita,
+                   executar_leitura, init_supabase, obter_historico_pagamentos,
+                   registrar_pagamento_fornecedor, supabase)
+from componentes import (chave_envio, fragmento_deposito_bancario, fragmento_novo_investidor,
+                         gravacao, painel_importacao)
+from importacao import (importar_fornecedores, importar_investidores,
+                        validar_importacao_fornecedores, validar_importacao_investidores)
+from utilitarios import (ORIGENS_PAGAMENTO, centavos_para_reais, formatar_moeda,
+                         obter_horario_brasilia, reais_para_centavos)
+
+st.header("👤 Área Administrativa")
+
+if not st.session_state.admin_logado:
+    st.subheader("🔐 Login Administrativo")
+
+    col_login1, col_login2 = st.columns(2)
+
+    with col_login1:
+        usuario = st.text_input("Usuário", key="admin_usuario_input")
+        senha = st.text_input("Senha", type="password",
+                              key="admin_senha_input")
+
+        if st.button("Entrar", key="btn_login"):
+            if usuario == "admin" and senha == "evento123":
+                st.session_state.admin_logado = True
+                st.session_state.admin_usuario = usuario
+                st.rerun()
+            else:
+                st.error("Credenciais inválidas!")
+
+    with col_login2:
+        st.info("""
+        **Insira suas credenciais administrativas.**
+        ⚠️ Em caso de esquecimento, contactar o suporte.
+        """)
+
+else:
+    st.success(f"👋 Bem-vindo(a), {st.session_state.admin_usuario}!")
+
+    if st.button("🚪 Sair", key="btn_logout"):
+        st.session_state.admin_logado = False
+        st.session_state.admin_usuario = ""
+        st.rerun()
+
+    st.divider()
+    st.subheader("📊 Dashboard Financeiro")
+    totais = calcular_totais()
+
+    col_metric1, col_metric2, col_metric3, col_metric4 = st.columns(4)
+    with col_metric1:
+        st.metric("💰 Caixa", formatar_moeda(totais['total_caixa']))
+        st.metric("🏦 Bancária", formatar_moeda(
+            totais['total_conta_bancaria']))
+
+    with col_metric2:
+        st.metric("📋 Fornecedores", formatar_moeda(
+            totais['total_fornecedores']))
+        st.metric("⏳ A Pagar", formatar_moeda(
+            totais['total_a_pagar']), delta=formatar_moeda(-totais['total_a_pagar']))
+
+    with col_metric3:
+        st.metric("🎯 A Devolver", formatar_moeda(
+            totais['total_a_devolver']), delta=formatar_moeda(-totais['total_a_devolver']))
+        st.metric("💵 Saldo", formatar_moeda(
+            totais['saldo_disponivel']), delta=formatar_moeda(totais['saldo_disponivel']))
+
+    with col_metric4:
+        st.metric("📊 Total Investido", formatar_moeda(
+            totais['total_investido']))
+        st.metric("💵 Devolvido", formatar_moeda(totais['total_devolvido']))
+
+    st.divider()
+    # Abas para os diferentes módulos administrativos
+    abas_admin = st.tabs(
+        ["🏦 Bancário", "🎯 Investimentos", "📋 Fornecedores", "🗄️ Arquivo"]
+    )
+
+    # --- ABA BANCÁRIO ---
+    with abas_admin[0]:
+        st.subheader("🏦 Controle de Conta Bancária")
+
+        fragmento_deposito_bancario()
+
+    # --- ABA INVESTIMENTOS ---
+    with abas_admin[1]:
+        st.subheader("🎯 Controle de Investimentos")
+        col_inv1, col_inv2 = st.columns(2)
+
+        with col_inv1:
+            st.write("### 👥 Investidores")
+            investidores_data = dados_tabela('investidores')
+
+            if investidores_data:
+                df_investidores = pd.DataFrame(investidores_data, columns=[
+                                               'nome', 'valor_investido', 'valor_devolvido'])
+                df_investidores[['valor_investido', 'valor_devolvido']] = df_investidores[
+                    ['valor_investido', 'valor_devolvido']].fillna(0).astype('int64')
+                totais_investidores = df_investidores.groupby('nome').agg(
+                    {'valor_investido': 'sum', 'valor_devolvido': 'sum'}).reset_index()
+
+                st.write("**📊 Totais por Investidor:**")
+                for _, total in totais_investidores.iterrows():
+                    nome = total['nome']
+                    total_investido = total['valor_investido']
+                    total_devolvido = total['valor_devolvido']
+                    restante = total_investido - total_devolvido
+
+                    col_total1, col_total2, col_total3 = st.columns(3)
+                    with col_total1:
+                        st.metric(f"💰 {nome}", formatar_moeda(
+                            total_investido))
+                    with col_total2:
+                        st.metric("💵 Devolvido",
+                                  formatar_moeda(total_devolvido))
+                    with col_total3:
+                        st.metric("⏳ Restante", formatar_moeda(restante))
+
+                st.divider()
+                investidores = sorted(
+                    investidores_data, key=lambda inv: (inv['nome'], inv['id']))
+
+                st.write("**📋 Investimentos Individuais:**")
+                for inv in investidores:
+                    with st.expander(f"{inv['nome']} - {formatar_moeda(inv['valor_investido'])} - {formatar_moeda(inv['valor_devolvido'])} devolvido"):
+                        st.write(
+                            f"**Investido:** {formatar_moeda(inv['valor_investido'])}")
+                        st.write(
+                            f"**Devolvido:** {formatar_moeda(inv['valor_devolvido'])}")
+                        st.write(
+                            f"**Restante:** {formatar_moeda(inv['valor_investido'] - inv['valor_devolvido'])}")
+                        st.write(
+                            f"**Status:** {'✅ Devolvido' if inv['devolvido'] else '⏳ Pendente'}")
+
+                        if inv['data_devolucao']:
+                            st.write(
+                                f"**Data de devolução:** {inv['data_devolucao']}")
+
+                        if not inv['devolvido']:
+                            valor_restante = inv['valor_investido'] - \
+                                inv['valor_devolvido']
+                            valor_devolucao = reais_para_centavos(st.number_input(
+                                "Valor a devolver", min_value=0.0, max_value=centavos_para_reais(valor_restante),
+                                value=centavos_para_reais(valor_restante), format="%.2f", key=f"devolucao_{inv['id']}"))
+
+                            if st.button("💵 Registrar Devolução", key=f"devolver_{inv['id']}",
+                                         disabled=not banco_disponivel()):
+                                with gravacao():
+                                    novo_valor_devolvido = inv['valor_devolvido'] + \
+                                        valor_devolucao
+                                    devolvido_completo = novo_valor_devolvido >= inv['valor_investido']
+                                    executar_escrita(supabase.table('investidores').update({
+                                        'valor_devolvido': novo_valor_devolvido,
+                                        'devolvido': devolvido_completo,
+                                        'data_devolucao': obter_horario_brasilia().date().isoformat() if devolvido_completo else None
+                                    }).eq('id', inv['id']))
+                                    st.success(
+                                        f"✅ Devolução de {formatar_moeda(valor_devolucao)} registrada!")
+                                    time.sleep(1)
+                                    st.rerun()
+            else:
+                st.info("ℹ️ Nenhum investidor cadastrado")
+
+        with col_inv2:
+            st.write("### ➕ Novo Investidor")
+            fragmento_novo_investidor()
+
+            with st.expander("📥 Importar Investidores (CSV/Excel)"):
+                painel_importacao(
+                    "investidores",
+                    "Colunas: **nome** e **valor_investido**.",
+                    validar_importacao_investidores, importar_investidores, "investidores")
+    # --- ABA FORNECEDORES ---
+    with abas_admin[2]:
+        st.subheader("📋 Contas a Pagar")
+        fornecedores = sorted(dados_tabela('fornecedor'),
+                              key=lambda f: (bool(f['pago']), f['nome']))
+
+        if fornecedores:
+            fornecedores_pagos = [f for f in fornecedores if f['pago']]
+            fornecedores_pendentes = [
+                f for f in fornecedores if not f['pago']]
+
+            if fornecedores_pendentes:
+                st.write("### ⏳ Pendentes de Pagamento")
+                for forn in fornecedores_pendentes:
+                    with st.expander(f"{forn['nome']} - {formatar_moeda(forn['valor'])}", expanded=True):
+                        col_f1, col_f2, col_f3 = st.columns([2, 2, 1])
+
+                        with col_f1:
+                            valor_restante = forn['valor'] - forn['valor_pago']
+                            st.write(
+                                f"**Valor total:** {formatar_moeda(forn['valor'])}")
+                            st.write(
+                                f"**Já pago:** {formatar_moeda(forn['valor_pago'])}")
+                            st.write(
+                                f"**Restante:** {formatar_moeda(valor_restante)}")
+
+                            historico = obter_historico_pagamentos(
+                                forn['id'])
+                            if historico:
+                                st.write("**📋 Histórico de Pagamentos:**")
+                                for pagamento in historico:
+                                    st.write(
+                                        f"- {formatar_moeda(pagamento['valor_pago'])} ({pagamento['origem_pagamento']}) - {pagamento['data_pagamento']}")
+
+                        with col_f2:
+                            valor_pagamento = reais_para_centavos(st.number_input(
+                                "Valor a pagar agora", min_value=0.0, max_value=centavos_para_reais(valor_restante),
+                                value=centavos_para_reais(valor_restante), format="%.2f", key=f"pagamento_{forn['id']}"))
+                            origem_pagamento = st.selectbox("Origem do pagamento:", [
+                                                            "Selecione...", *ORIGENS_PAGAMENTO], key=f"origem_{forn['id']}")
+                            observacao_pagamento = st.text_input(
+                                "Observação:", placeholder="Ex: Pagamento parcial", key=f"obs_{forn['id']}")
+
+                        with col_f3:
+                            st.write("")
+                            st.write("")
+                            pagar = st.button("💵 Registrar Pagamento", key=f"pagar_{forn['id']}",
+                                              disabled=not banco_disponivel())
+                            envio = chave_envio(f"pagamento_{forn['id']}", pagar)
+                            if pagar:
+                                if origem_pagamento != "Selecione...":
+                                    with gravacao():
+                                        # Clique repetido de um envio já gravado: nada a fazer
+                                        sucesso = envio['gravada'] or registrar_pagamento_fornecedor(
+                                            forn['id'], valor_pagamento, origem_pagamento, observacao_pagamento,
+                                            chave_idempotencia=envio['chave'])
+                                        if sucesso:
+                                            envio['gravada'] = True
+                                            st.success(
+                                                f"✅ Pagamento de {formatar_moeda(valor_pagamento)} registrado via {origem_pagamento}!")
+                                            time.sleep(1)
+                                            st.rerun()
+                                else:
+                                    st.error(
+                                        "❌ Selecione a origem do pagamento")
+
+                        if forn['observacoes']:
+                            st.write(
+                                f"*Observações:* {forn['observacoes']}")
+
+            if fornecedores_pagos:
+                st.write("### ✅ Pagas")
+                for forn in fornecedores_pagos:
+                    with st.expander(f"**{forn['nome']}** - {formatar_moeda(forn['valor'])} - 💰 Pago em {forn['data_pagamento']}"):
+                        historico = obter_historico_pagamentos(forn['id'])
+                        if historico:
+                            st.write("**📊 Detalhes dos Pagamentos:**")
+                            total_pago = 0
+                            for pagamento in historico:
+                                st.write(
+                                    f"- {formatar_moeda(pagamento['valor_pago'])} via {pagamento['origem_pagamento']} em {pagamento['data_pagamento']}")
+                                if pagamento['observacao']:
+                                    st.write(
+                                        f"  *Observação:* {pagamento['observacao']}")
+                                total_pago += pagamento['valor_pago']
+
+                            if total_pago > forn['valor']:
+                                st.write(
+                                    f"*Valor extra pago: {formatar_moeda(total_pago - forn['valor'])}*")
+                        else:
+                            st.write(
+                                "Sem histórico de pagamentos detalhado.")
+        else:
+            st.info("ℹ️ Nenhum fornecedor cadastrado")
+
+        st.divider()
+        st.subheader("➕ Novo Fornecedor")
+        col_novo1, col_novo2 = st.columns(2)
+
+        with col_novo1:
+            nome_novo_fornecedor = st.text_input(
+                "Nome do Fornecedor", key="novo_fornecedor_nome")
+            valor_novo_fornecedor = reais_para_centavos(st.number_input(
+                "Valor Total", 0.0, step=0.01, format="%.2f", key="novo_fornecedor_valor"))
+            observacoes_novo_fornecedor = st.text_area(
+                "Observações", key="novo_fornecedor_obs")
+
+        with col_novo2:
+            pagamento_inicial = reais_para_centavos(st.number_input(
+                "Pagamento Inicial (opcional)", 0.0, step=0.01, format="%.2f", key="pagamento_inicial"))
+            origem_pagamento_inicial = st.selectbox("Origem do Pagamento Inicial:", [
+                                                    "Selecione...", *ORIGENS_PAGAMENTO], key="origem_pagamento_inicial")
+            obs_pagamento_inicial = st.text_input(
+                "Observação do Pagamento:", key="obs_pagamento_inicial")
+
+        salvar_fornecedor = st.button("💾 Salvar Novo Fornecedor", key="salvar_novo_fornecedor",
+                                      disabled=not banco_disponivel())
+        envio = chave_envio("novo_fornecedor", salvar_fornecedor)
+        if salvar_fornecedor:
+            if nome_novo_fornecedor and valor_novo_fornecedor > 0:
+                with gravacao():
+                    if not envio['gravada']:
+                        response = executar_escrita(supabase.table('fornecedor').upsert(com_evento({
+                            'nome': nome_novo_fornecedor,
+                            'valor': valor_novo_fornecedor,
+                            'observacoes': observacoes_novo_fornecedor,
+                            'valor_pago': 0,
+                            'pago': False,
+                            'chave_idempotencia': envio['chave']
+                        }), on_conflict='chave_idempotencia', ignore_duplicates=True))
+
+                        # Sem linha devolvida, um envio anterior com a mesma chave já gravou o
+                        # fornecedor, mas o pagamento inicial pode ter falhado: busca o id pela chave
+                        if not response.data:
+                            response = executar_leitura(supabase.table('fornecedor').select('id').eq(
+                                'chave_idempotencia', envio['chave']))
+                        fornecedor_id = response.data[0]['id']
+
+                        # O pagamento inicial entra pelo histórico, que soma o valor pago;
+                        # a mesma chave faz um reenvio ignorar o pagamento já gravado
+                        origem = origem_pagamento_inicial if origem_pagamento_inicial != "Selecione..." else None
+                        envio['gravada'] = pagamento_inicial == 0 or registrar_pagamento_fornecedor(
+                            fornecedor_id, pagamento_inicial, origem,
+                            obs_pagamento_inicial or None, chave_idempotencia=envio['chave'])
+
+                    if envio['gravada']:
+                        st.success("✅ Fornecedor cadastrado!")
+                        time.sleep(1)
+                        st.rerun()
+            else:
+                st.error("❌ Preencha os campos obrigatórios")
+
+        with st.expander("📥 Importar Fornecedores (CSV/Excel)"):
+            painel_importacao(
+                "fornecedores",
+                "Colunas: **nome** e **valor**; opcionais: **observacoes**, "
+                "**pagamento_inicial**, **origem_pagamento** e **obs_pagamento**.",
+                validar_importacao_fornecedores, importar_fornecedores, "fornecedores")
+    # --- ABA ARQUIVO ---
+    with abas_admin[3]:
+        st.subheader("🗄️ Arquivo de Eventos")
+        st.caption(
+            "Eventos encerrados podem ser movidos para arquivos compactados, "
+            "deixando nas tabelas do sistema apenas os dados do evento em andamento.")
+
+        eventos = buscar_eventos()
+        eventos_por_id = {evento['id']: evento for evento in eventos}
+        evento_ativo = eventos_por_id[evento_ativo_id()]
+        col_arq1, col_arq2 = st.columns(2)
+
+        with col_arq1:
+            st.write("### 🔒 Encerrar Evento")
+            if evento_ativo['encerrado']:
+                st.info(f"ℹ️ O evento {evento_ativo['nome']} já está encerrado")
+            elif st.button(f"🔒 Encerrar {evento_ativo['nome']}", key="btn_encerrar_evento",
+                           disabled=not banco_disponivel()):
+                with gravacao():
+                    executar_escrita(supabase.table('evento').update({
+                        'encerrado': True,
+                        'data_fim': obter_horario_brasilia().date().isoformat()
+                    }).eq('id', evento_ativo['id']))
+                    st.success(f"✅ Evento {evento_ativo['nome']} encerrado!")
+                    time.sleep(1)
+                    st.rerun()
+
+        with col_arq2:
+            st.write("### 🗄️ Arquivar Evento")
+            eventos_arquivaveis = [e['id'] for e in eventos
+                                   if e['encerrado'] and not e.get('arquivado_em')]
+            if eventos_arquivaveis:
+                id_arquivar = st.selectbox("Evento encerrado:", eventos_arquivaveis,
+                                           format_func=lambda i: eventos_por_id[i]['nome'],
+                                           key="evento_arquivar")
+                st.warning(
+                    "⚠️ Caixas, estoque, estornos e histórico de pagamentos do evento "
+                    "serão removidos das tabelas após a cópia para o arquivo do banco.")
+                if st.button("🗄️ Arquivar Evento", key="btn_arquivar_evento",
+                             disabled=not banco_disponivel()):
+                    try:
+                        with st.spinner("Arquivando..."):
+                            manifesto = arquivamento.arquivar_evento(
+                                init_supabase(), eventos_por_id[id_arquivar])
+                        resumo = ", ".join(f"{tabela}: {info['linhas']}"
+                                           for tabela, info in manifesto['tabelas'].items())
+                        st.success(f"✅ Evento arquivado ({resumo})")
+                        time.sleep(2)
+                        st.rerun()
+                    except BancoIndisponivel as e:
+                        st.warning(f"⚠️ {e}")
+                    except Exception as e:
+                        st.error(f"❌ Erro ao arquivar evento: {e}")
+            else:
+                st.info("ℹ️ Nenhum evento encerrado aguardando arquivamento")
+
+        st.divider()
+        st.write("### 🔎 Consultar Arquivo")
+        # A lista vem do banco: só é buscada depois que a consulta é aberta
+        if st.button("🔎 Listar Eventos Arquivados", key="btn_listar_arquivo"):
+            st.session_state.consulta_arquivo_aberta = True
+
+        manifestos = None
+        if st.session_state.get("consulta_arquivo_aberta"):
+            try:
+                manifestos = arquivamento.listar_eventos_arquivados(init_supabase())
+            except BancoIndisponivel as e:
+                st.warning(f"⚠️ {e}")
+
+        if manifestos:
+            indice_manifesto = st.selectbox(
+                "Evento arquivado:", range(len(manifestos)),
+                format_func=lambda i: f"{manifestos[i]['evento']['nome']} - arquivado em {manifestos[i]['arquivado_em'][:10]}",
+                key="consulta_arquivo_evento")
+            manifesto = manifestos[indice_manifesto]
+            tabela_arquivada = st.selectbox(
+                "Tabela:", list(manifesto['tabelas']), key="consulta_arquivo_tabela")
+            info_tabela = manifesto['tabelas'][tabela_arquivada]
+            st.caption(f"{info_tabela['linhas']} registros · sha256 {info_tabela['sha256'][:12]}…")
+            if not manifesto.get('valores_em_centavos'):
+                st.caption("Arquivo anterior aos valores em centavos: valores em reais.")
+
+            if st.button("📂 Abrir Arquivo", key="btn_abrir_arquivo"):
+                st.session_state.arquivo_aberto = (manifesto['pasta'], tabela_arquivada)
+
+            if st.session_state.get("arquivo_aberto") == (manifesto['pasta'], tabela_arquivada):
+                try:
+                    linhas_arquivadas = arquivamento.ler_tabela_arquivada(
+                        init_supabase(), manifesto, tabela_arquivada)
+                except BancoIndisponivel as e:
+                    st.warning(f"⚠️ {e}")
+                    linhas_arquivadas = None
+                if linhas_arquivadas is not None:
+                    busca_arquivo = st.text_input(
+                        "Filtrar:", key="filtro_arquivo", placeholder="Texto em qualquer coluna")
+                    if busca_arquivo:
+                        termo = busca_arquivo.lower()
+                        linhas_arquivadas = [l for l in linhas_arquivadas
+                                             if any(termo in str(v).lower() for v in l.values())]
+                    st.dataframe(pd.DataFrame(linhas_arquivadas),
+                                 use_container_width=True, height=400)
+        elif manifestos is not None:
+            st.info("ℹ️ Nenhum evento arquivado")
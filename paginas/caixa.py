@@ -0,0 +1,138 @@
+"""Página de abertura, fechamento e edição de caixas"""
+import time
+
+import streamlit as st
+
+from banco import banco_disponivel, com_evento, dados_tabela, executar_escrita, supabase
+from componentes import fragmento_fechamento_caixa, gravacao, seletor_caixa
+from utilitarios import (centavos_para_reais, formatar_hora_brasilia, formatar_moeda,
+                         obter_horario_brasilia, reais_para_centavos)
+
+st.header("📋 Controle de Caixa")
+
+modo_caixa = st.radio("Modo de operação:", [
+                      "Abrir Novo Caixa", "Editar Caixa Existente"], horizontal=True, key="modo_caixa")
+
+if modo_caixa == "Abrir Novo Caixa":
+    col1, col2 = st.columns(2)
+
+    with col1:
+        nome_func = st.text_input(
+            "👤 Nome da Funcionária", key="nome_funcionaria")
+
+        if nome_func:
+            data_hoje = obter_horario_brasilia().date().isoformat()
+            caixa_aberto = [c for c in dados_tabela('caixa')
+                            if c['data'] == data_hoje and c['nome_funcionario'] == nome_func
+                            and c['hora_fechamento'] is None]
+
+            if not caixa_aberto:
+                if st.button("🟢 Abrir Caixa", type="primary", key="abrir_caixa",
+                             disabled=not banco_disponivel()):
+                    with gravacao():
+                        hora_abertura = formatar_hora_brasilia()
+                        executar_escrita(supabase.table('caixa').insert(com_evento({
+                            'data': data_hoje,
+                            'hora_abertura': hora_abertura,
+                            'nome_funcionario': nome_func,
+                            'dinheiro': 0,
+                            'maquineta': 0,
+                            'conta_bancaria': 0,
+                            'retiradas': 0
+                        })))
+                        st.success(f"✅ Caixa aberto às {hora_abertura}!")
+                        time.sleep(1)
+                        st.rerun()
+            else:
+                st.info("ℹ️ Você já tem a caixa aberto hoje")
+        else:
+            st.info("ℹ️ Digite seu nome para verificar caixas abertos")
+
+    with col2:
+        caixas_abertos = [c for c in dados_tabela('caixa')
+                          if c['hora_fechamento'] is None]
+
+        if caixas_abertos:
+            st.subheader("Caixas Abertos")
+            for caixa in caixas_abertos:
+                st.write(
+                    f"{caixa['nome_funcionario']} - {caixa['data']} ({caixa['hora_abertura']})")
+        else:
+            st.info("ℹ️ Nenhum caixa aberto no momento")
+
+    st.divider()
+
+    if caixas_abertos:
+        st.subheader("🔒 Fechamento de Caixa")
+        caixa_fechar = seletor_caixa(
+            "fechar_caixa", "Selecione o caixa para fechar", apenas_abertos=True, dias_padrao=None)
+
+        idx = caixa_fechar['id'] if caixa_fechar else None
+
+        if idx is None:
+            st.info("ℹ️ Nenhum caixa aberto encontrado para esta busca")
+        else:
+            fragmento_fechamento_caixa(caixa_fechar)
+
+else:  # Modo Editar Caixa Existente
+    st.subheader("✏️ Editar Caixa Existente")
+    nome_func_editar = st.text_input(
+        "👤 Seu nome para buscar caixas", key="nome_editar")
+
+    if nome_func_editar:
+        caixa_dados = seletor_caixa(
+            "editar_caixa", "Selecione o caixa para editar", nome_exato=nome_func_editar)
+
+        if caixa_dados:
+            idx = caixa_dados['id']
+
+            st.write("---")
+            st.write("### 📝 Editar Valores do Caixa")
+
+            col_edit1, col_edit2 = st.columns(2)
+
+            with col_edit1:
+                novo_dinheiro = reais_para_centavos(st.number_input(
+                    "💵 Valor em dinheiro", value=centavos_para_reais(caixa_dados['dinheiro']),
+                    format="%.2f", key="edit_dinheiro_user"))
+                novo_maquineta = reais_para_centavos(st.number_input(
+                    "💳 Valor na maquineta", value=centavos_para_reais(caixa_dados['maquineta']),
+                    format="%.2f", key="edit_maquineta_user"))
+                novas_retiradas = reais_para_centavos(st.number_input(
+                    "↗️ Retiradas do caixa", value=centavos_para_reais(caixa_dados['retiradas']),
+                    format="%.2f", key="edit_retiradas_user"))
+
+            with col_edit2:
+                st.metric("💰 Total Atual", formatar_moeda(
+                    caixa_dados['dinheiro'] + caixa_dados['maquineta'] - caixa_dados['retiradas']))
+                st.metric("💰 Total Novo", formatar_moeda(
+                    novo_dinheiro + novo_maquineta - novas_retiradas))
+                st.metric("📆 Data", caixa_dados['data'])
+                st.metric("⏰ Hora Abertura", caixa_dados['hora_abertura'])
+                if caixa_dados['hora_fechamento']:
+                    st.metric("🔒 Hora Fechamento",
+                              caixa_dados['hora_fechamento'])
+
+            nova_observacao = st.text_area(
+                "📝 Observações", value=caixa_dados['observacoes'] or "", key="edit_observacao_user")
+
+            col_btn_edit, col_btn_cancel = st.columns(2)
+            with col_btn_edit:
+                if st.button("💾 Salvar Alterações", type="primary", key="save_edit_caixa",
+                             disabled=not banco_disponivel()):
+                    with gravacao():
+                        executar_escrita(supabase.table('caixa').update({
+                            'dinheiro': novo_dinheiro,
+                            'maquineta': novo_maquineta,
+                            'retiradas': novas_retiradas,
+                            'observacoes': nova_observacao
+                        }).eq('id', idx))
+                        st.success("✅ Caixa atualizado com sucesso!")
+                        time.sleep(1)
+                        st.rerun()
+
+            with col_btn_cancel:
+                if st.button("❌ Cancelar Edição", key="cancel_edit_caixa"):
+                    st.rerun()
+        else:
+            st.info("ℹ️ Nenhum caixa encontrado para esta funcionária no período")
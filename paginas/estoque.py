@@ -0,0 +1,159 @@
+"""Página de entrada, consulta e edição do estoque"""
+import time
+
+import pandas as pd
+import streamlit as st
+
+from banco import (BancoIndisponivel, agrupar_por, banco_disponivel, dados_tabela,
+                   executar_escrita, supabase)
+from catalogo import (NAO_CATALOGADO, chave_produto, garantir_produtos, nomes_produtos,
+                      produtos_catalogo, produtos_parecidos)
+from componentes import gravacao, painel_importacao
+from importacao import importar_estoque, validar_importacao_estoque
+
+st.header("📦 Controle de Estoque")
+
+col5, col6 = st.columns(2)
+
+with col5:
+    nome_responsavel = st.text_input(
+        "👤 Nome da Funcionária", key="responsavel_estoque",
+        help="Os produtos ficam vinculados ao caixa aberto hoje por esta funcionária")
+    responsavel = nome_responsavel.strip() or "Não informado"
+
+    with st.expander("🏷️ Produto fora da lista? Cadastre aqui"):
+        novo_produto = st.text_input("📦 Nome do produto", key="novo_produto")
+        chave_novo = chave_produto(novo_produto)
+        cadastrado = next((p for p in produtos_catalogo() if chave_produto(p.nome) == chave_novo), None)
+        parecidos = produtos_parecidos(novo_produto) if chave_novo and not cadastrado else []
+        confirmado = True
+
+        if cadastrado:
+            st.info(f"ℹ️ **{cadastrado.nome}** já está no catálogo")
+        elif parecidos:
+            st.warning("⚠️ Já existe(m) no catálogo: " + ", ".join(f"**{p.nome}**" for p in parecidos))
+            confirmado = st.checkbox("É outro produto, cadastrar mesmo assim", key="confirmar_novo_produto")
+
+        if st.button("➕ Cadastrar Produto", key="cadastrar_produto",
+                     disabled=not chave_novo or bool(cadastrado) or not confirmado
+                     or not banco_disponivel()):
+            try:
+                garantir_produtos([novo_produto])
+                st.success(f"✅ Produto {novo_produto.strip()} cadastrado!")
+                time.sleep(1)
+                st.rerun()
+            except BancoIndisponivel as e:
+                st.warning(f"⚠️ {e}")
+            except Exception as e:
+                st.error(f"Erro ao cadastrar produto: {e}")
+
+    # Várias linhas digitadas de uma vez e gravadas num único insert
+    with st.form("form_estoque", clear_on_submit=True):
+        st.write("**📦 Produtos recebidos**")
+        itens_novos = st.data_editor(
+            pd.DataFrame({'produto': pd.Series(dtype=str),
+                          'quantidade': pd.Series(dtype='Int64')}),
+            num_rows="dynamic", use_container_width=True, key="grade_estoque",
+            column_config={
+                # Lista do catálogo com busca ao digitar
+                'produto': st.column_config.SelectboxColumn(
+                    "📦 Produto", options=[produto.nome for produto in produtos_catalogo()]),
+                'quantidade': st.column_config.NumberColumn("🔢 Quantidade", min_value=1, step=1)
+            })
+        adicionar_estoque = st.form_submit_button("➕ Adicionar ao Estoque",
+                                                  disabled=not banco_disponivel())
+
+    if adicionar_estoque:
+        itens_preenchidos = itens_novos.dropna(how='all')
+        if itens_preenchidos.empty:
+            st.error("❌ Preencha ao menos um produto")
+        else:
+            planilha = itens_preenchidos.astype(object).where(
+                itens_preenchidos.notna(), '').astype(str).reset_index(drop=True)
+            planilha.insert(0, 'linha', planilha.index + 1)
+            validos, rejeitados = validar_importacao_estoque(planilha, responsavel)
+
+            if not rejeitados.empty:
+                st.error("❌ Corrija as linhas: " + "; ".join(
+                    f"{linha}: {motivo}" for linha, motivo in zip(rejeitados['linha'], rejeitados['motivo'])))
+            else:
+                with gravacao():
+                    gravados = importar_estoque(validos)
+                    st.success(f"✅ {gravados} produtos adicionados ao estoque!")
+                    time.sleep(1)
+                    st.rerun()
+
+with col6:
+    st.info("📊 Estoque Atual")
+    estoque_atual = dados_tabela('estoque')
+
+    if estoque_atual:
+        quantidades = {}
+        for item in estoque_atual:
+            quantidades[item.produto_id] = quantidades.get(item.produto_id, 0) + item.quantidade
+        nomes = nomes_produtos()
+        totais = sorted((nomes.get(produto_id, NAO_CATALOGADO), quantidade)
+                        for produto_id, quantidade in quantidades.items())
+
+        for produto, quantidade in totais:
+            st.write(f"**{produto}:** {quantidade} unidades")
+    else:
+        st.info("ℹ️ Nenhum produto em estoque")
+
+with st.expander("📥 Importar Estoque (CSV/Excel)"):
+    responsavel_importacao = st.text_input(
+        "👤 Responsável pelos itens sem responsável na planilha", key="responsavel_importacao")
+    painel_importacao(
+        "estoque",
+        "A planilha deve ter as colunas **produto** e **quantidade**; "
+        "a coluna **responsavel** é opcional.",
+        lambda df: validar_importacao_estoque(
+            df, responsavel_importacao.strip() or "Não informado"),
+        importar_estoque, "itens")
+
+st.divider()
+st.subheader("✏️ Editar Estoque")
+
+# Escolha entre as responsáveis já gravadas: o nome digitado teria de bater letra a letra
+itens_por_responsavel = agrupar_por('estoque', 'responsavel')
+nome_resp_estoque = st.selectbox(
+    "👤 Responsável pelos itens", sorted(nome for nome in itens_por_responsavel if nome),
+    index=None, placeholder="Escolha o seu nome", key="nome_estoque_edit")
+
+if nome_resp_estoque:
+    itens_estoque = sorted(itens_por_responsavel.get(nome_resp_estoque, []),
+                           key=lambda item: item['data'], reverse=True)
+    nomes = nomes_produtos()
+
+    if itens_estoque:
+        for item in itens_estoque:
+            produto = nomes.get(item['produto_id'], NAO_CATALOGADO)
+            with st.expander(f"{item['data']} - {produto} - {item['quantidade']} unidades"):
+                col_item1, col_item2 = st.columns([3, 1])
+
+                with col_item1:
+                    nova_qtd = st.number_input(
+                        "Nova quantidade", value=item['quantidade'], min_value=0, key=f"edit_qtd_{item['id']}")
+
+                with col_item2:
+                    st.write("")
+                    st.write("")
+                    if st.button("💾 Atualizar", key=f"update_estoque_{item['id']}",
+                                 disabled=not banco_disponivel()):
+                        with gravacao():
+                            executar_escrita(supabase.table('estoque').update(
+                                {'quantidade': nova_qtd}).eq('id', item['id']))
+                            st.success("✅ Quantidade atualizada!")
+                            time.sleep(1)
+                            st.rerun()
+
+        if st.button("🗑️ Limpar Todos os Itens", type="secondary", key="clear_all_estoque",
+                     disabled=not banco_disponivel()):
+            with gravacao():
+                executar_escrita(supabase.table('estoque').delete().in_(
+                    'id', [item['id'] for item in itens_estoque]))
+                st.success("✅ Todos os itens do estoque foram removidos!")
+                time.sleep(1)
+                st.rerun()
+    else:
+        st.info("ℹ️ Nenhum item encontrado para esta responsável")
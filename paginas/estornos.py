@@ -0,0 +1,99 @@
+"""Página de estornos de lançamentos de caixa (somente administradores)"""
+import time
+
+import streamlit as st
+
+from banco import banco_disponivel, buscar_estornos_caixa, registrar_estorno_caixa
+from componentes import gravacao, seletor_caixa
+from utilitarios import centavos_para_reais, formatar_moeda, reais_para_centavos
+
+st.subheader("🔄 Sistema de Estornos")
+
+st.warning("""
+**⚠️ USE COM CAUTELA!**
+Esta funcionalidade deve ser utilizada apenas para corrigir lançamentos incorretos.
+Cada estorno fica registrado no histórico para auditoria.
+""")
+
+# Selecionar caixa para estorno
+caixa_dados = seletor_caixa(
+    "estorno", "Selecione o caixa para estorno:")
+
+if caixa_dados:
+    idx = caixa_dados['id']
+
+    st.write("---")
+    st.write("### 📝 Registrar Estorno")
+
+    col_est1, col_est2 = st.columns(2)
+
+    with col_est1:
+        tipo_estorno = st.selectbox(
+            "Tipo de lançamento a estornar:",
+            ["dinheiro", "maquineta", "retiradas"],
+            key="tipo_estorno"
+        )
+
+        valor_atual = caixa_dados[tipo_estorno]
+        st.write(
+            f"**Valor atual em {tipo_estorno}:** {formatar_moeda(valor_atual)}")
+
+        valor_estorno = reais_para_centavos(st.number_input(
+            "Valor a estornar:",
+            min_value=0.0,
+            max_value=centavos_para_reais(valor_atual),
+            value=0.0,
+            format="%.2f",
+            key="valor_estorno"
+        ))
+
+    with col_est2:
+        motivo_estorno = st.text_area(
+            "Motivo do estorno:",
+            placeholder="Ex: Lançamento duplicado, valor digitado incorretamente...",
+            height=100,
+            key="motivo_estorno"
+        )
+
+        if valor_estorno > 0:
+            novo_valor = valor_atual - valor_estorno
+            st.metric("💰 Valor após estorno",
+                      formatar_moeda(novo_valor))
+            st.metric("📉 Valor estornado",
+                      formatar_moeda(-valor_estorno))
+
+    if st.button("🔄 Registrar Estorno", type="secondary", key="btn_registrar_estorno",
+                 disabled=not banco_disponivel()):
+        if valor_estorno > 0 and motivo_estorno.strip():
+            with gravacao():
+                sucesso, mensagem = registrar_estorno_caixa(
+                    idx, valor_estorno, motivo_estorno, tipo_estorno
+                )
+                if sucesso:
+                    st.success(f"✅ {mensagem}")
+                    time.sleep(2)
+                    st.rerun()
+                else:
+                    st.error(f"❌ {mensagem}")
+        else:
+            st.error("❌ Preencha todos os campos corretamente")
+
+    st.write("---")
+    st.write("### 📋 Histórico de Estornos")
+
+    estornos = buscar_estornos_caixa(idx)
+    if estornos:
+        for estorno in estornos:
+            with st.expander(f"{estorno['data_estorno']} - {formatar_moeda(estorno['valor_estorno'])} - {estorno['tipo_lancamento']}"):
+                st.write(f"**Motivo:** {estorno['motivo']}")
+                st.write(
+                    f"**Valor:** {formatar_moeda(estorno['valor_estorno'])}")
+                st.write(
+                    f"**Tipo:** {estorno['tipo_lancamento']}")
+                st.write(
+                    f"**Data/Hora:** {estorno['data_estorno']} {estorno['hora_estorno']}")
+    else:
+        st.info("ℹ️ Nenhum estorno registrado para este caixa")
+
+else:
+    st.info("ℹ️ Nenhum caixa encontrado no período para realizar estornos")
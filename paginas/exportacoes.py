@@ -0,0 +1,108 @@
+"""Página de exportações e relatórios em segundo plano (somente administradores)"""
+from datetime import datetime
+
+import streamlit as st
+
+import tarefas
+from banco import evento_ativo_id
+
+st.subheader("📥 Exportações")
+st.caption(
+    "Relatórios longos e exportações rodam em segundo plano: você pode continuar "
+    "usando o sistema e voltar aqui para baixar o arquivo quando estiver pronto.")
+
+if "tarefas" not in st.session_state:
+    st.session_state.tarefas = []
+
+# --- Nova tarefa ---
+tipo_tarefa = st.radio("O que gerar:", [
+    "📊 Relatório de caixas por período", "📗 Planilha completa do evento", "📑 Extratos em PDF",
+    "📄 Exportar tabela", "💾 Backup completo"],
+    horizontal=True, key="tipo_tarefa")
+
+if tipo_tarefa == "📊 Relatório de caixas por período":
+    col_exp1, col_exp2 = st.columns(2)
+    with col_exp1:
+        data_inicio = st.date_input("Data início:", datetime.now().date().replace(
+            day=1), key="tarefa_data_inicio")
+    with col_exp2:
+        data_fim = st.date_input("Data fim:", datetime.now().date(), key="tarefa_data_fim")
+    descricao = f"Relatório de caixas {data_inicio:%d/%m/%Y} a {data_fim:%d/%m/%Y}"
+    funcao, argumentos = tarefas.relatorio_caixas, (evento_ativo_id(), data_inicio, data_fim)
+
+elif tipo_tarefa == "📗 Planilha completa do evento":
+    st.caption("Um único Excel com uma aba por tabela do evento e abas de resumo por dia, "
+               "por origem de pagamento e por produto.")
+    descricao = "Planilha completa do evento"
+    funcao, argumentos = tarefas.planilha_evento, (evento_ativo_id(),)
+
+elif tipo_tarefa == "📑 Extratos em PDF":
+    col_exp1, col_exp2 = st.columns(2)
+    with col_exp1:
+        data_inicio = st.date_input("Data início:", datetime.now().date().replace(
+            day=1), key="extratos_data_inicio")
+    with col_exp2:
+        data_fim = st.date_input("Data fim:", datetime.now().date(), key="extratos_data_fim")
+    incluir_fornecedores = st.checkbox(
+        "Incluir um extrato por fornecedor", value=True, key="extratos_fornecedores")
+    st.caption("Um PDF por caixa fechado no período, com valores, estornos, estoque "
+               "vinculado e linhas para assinatura, todos num único .zip.")
+    descricao = f"Extratos em PDF {data_inicio:%d/%m/%Y} a {data_fim:%d/%m/%Y}"
+    funcao, argumentos = tarefas.extratos_em_pdf, (
+        evento_ativo_id(), data_inicio, data_fim, incluir_fornecedores)
+
+elif tipo_tarefa == "📄 Exportar tabela":
+    col_exp1, col_exp2 = st.columns(2)
+    with col_exp1:
+        tabela = st.selectbox("Tabela:", tarefas.TABELAS_EXPORTAVEIS, key="tarefa_tabela")
+    with col_exp2:
+        formato = st.radio("Formato:", ["xlsx", "csv"], horizontal=True, key="tarefa_formato")
+    descricao = f"Exportação de {tabela} ({formato.upper()})"
+    funcao, argumentos = tarefas.exportar_tabela, (evento_ativo_id(), tabela, formato)
+
+else:
+    st.info("ℹ️ Copia todas as tabelas, de todos os eventos, no formato do backup.py.")
+    descricao = "Backup completo"
+    funcao, argumentos = tarefas.backup_completo, ()
+
+if st.button("⏳ Gerar em segundo plano", type="primary", key="btn_enviar_tarefa"):
+    st.session_state.tarefas.append(tarefas.enviar_tarefa(descricao, funcao, *argumentos))
+
+# --- Acompanhamento ---
+
+
+def painel_tarefas(em_andamento):
+    """Situação das tarefas desta sessão, com o download das concluídas"""
+    lista = tarefas.situacao_tarefas(st.session_state.tarefas)
+    if not lista:
+        st.info("ℹ️ Nenhuma tarefa enviada nesta sessão")
+        return
+
+    for tarefa in lista:
+        with st.container(border=True):
+            col_tarefa1, col_tarefa2 = st.columns([3, 1])
+            with col_tarefa1:
+                st.write(f"**{tarefa['descricao']}** · {tarefa['situacao']}")
+                if tarefa['situacao'] in ('na fila', 'executando'):
+                    st.progress(tarefa['progresso'], text=tarefa['etapa'] or None)
+                elif tarefa['situacao'] == 'erro':
+                    st.error(f"❌ {tarefa['erro']}")
+            with col_tarefa2:
+                if tarefa['arquivo']:
+                    nome_arquivo, conteudo = tarefa['arquivo']
+                    st.download_button(
+                        "⬇️ Baixar", conteudo, file_name=nome_arquivo,
+                        mime=tarefas.MIME.get(nome_arquivo.rsplit('.', 1)[-1]),
+                        key=f"baixar_tarefa_{tarefa['id']}")
+
+    # O painel se atualiza sozinho enquanto há tarefas em andamento; quando a
+    # última termina, a página é refeita uma vez para parar a atualização
+    if em_andamento and not any(t['situacao'] in ('na fila', 'executando') for t in lista):
+        st.rerun()
+
+
+st.divider()
+st.write("### 📋 Minhas Tarefas")
+em_andamento = any(t['situacao'] in ('na fila', 'executando')
+                   for t in tarefas.situacao_tarefas(st.session_state.tarefas))
+st.fragment(painel_tarefas, run_every=2 if em_andamento else None)(em_andamento)
@@ -0,0 +1,499 @@
+"""Página de relatórios detalhados (somente administradores)"""
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import streamlit as st
+
+from banco import buscar_caixas_com_estoque, calcular_fluxo_caixa, relatorio_em_cache
+from colunar import (em_reais, moeda_em_texto, no_periodo, para_arrow, soma, somar_por,
+                     somar_por_produto, tabela_colunar)
+from utilitarios import formatar_moeda
+
+COLUNAS_VALOR_CAIXA = ['dinheiro', 'maquineta', 'retiradas', 'conta_bancaria']
+
+
+def montar_relatorio_caixa(data_inicio, data_fim):
+    """Tabela formatada, somas e série diária do relatório de caixa; None sem caixas"""
+    caixas = no_periodo(tabela_colunar('caixa'), 'data', data_inicio, data_fim)
+    if not caixas.num_rows:
+        return None
+
+    caixas = caixas.sort_by([('data', 'descending')])
+    total = pc.subtract(pc.add(caixas['dinheiro'], caixas['maquineta']), caixas['retiradas'])
+    caixas = caixas.append_column('Total', total).append_column(
+        'Total Geral', pc.add(total, caixas['conta_bancaria']))
+
+    diario = somar_por(caixas, 'data', ['Total'])
+    diario = pa.table({'Data': diario['data'], 'Total': em_reais(diario['Total'])})
+
+    exibicao = moeda_em_texto(
+        caixas.select(['data', 'nome_funcionario', 'hora_abertura', 'hora_fechamento',
+                       *COLUNAS_VALOR_CAIXA, 'Total', 'Total Geral']),
+        [*COLUNAS_VALOR_CAIXA, 'Total', 'Total Geral'])
+
+    return {'tabela': exibicao, 'diario': diario,
+            'somas': {col: soma(caixas[col]) for col in COLUNAS_VALOR_CAIXA}}
+
+
+def montar_relatorio_bancario(data_inicio, data_fim):
+    """Totais, evolução diária e tabela formatada do relatório bancário; None sem caixas"""
+    caixas = no_periodo(tabela_colunar('caixa'), 'data', data_inicio, data_fim)
+    if not caixas.num_rows:
+        return None
+
+    agrupado = somar_por(caixas, 'data', ['conta_bancaria', 'dinheiro', 'maquineta', 'retiradas'])
+    totais = {col: soma(agrupado[col]) for col in COLUNAS_VALOR_CAIXA}
+
+    return {
+        'totais': totais,
+        'total_liquido': totais['conta_bancaria'] + totais['dinheiro'] +
+        totais['maquineta'] - totais['retiradas'],
+        'evolucao': pa.table({'data': agrupado['data'],
+                              'conta_bancaria': em_reais(agrupado['conta_bancaria'])}),
+        'tabela': moeda_em_texto(agrupado, COLUNAS_VALOR_CAIXA),
+        'dias': agrupado.num_rows,
+        'media_diaria': round(pc.mean(caixas['conta_bancaria']).as_py()),
+        'maior_valor': pc.max(caixas['conta_bancaria']).as_py(),
+    }
+
+
+def montar_relatorio_fornecedores():
+    """Tabela formatada dos fornecedores e total pago por origem; None sem fornecedores"""
+    fornecedores = tabela_colunar('fornecedor')
+    if not fornecedores.num_rows:
+        return None
+
+    tabela = pa.table({
+        'nome': fornecedores['nome'],
+        'valor': fornecedores['valor'],
+        'valor_pago': fornecedores['valor_pago'],
+        'Restante': pc.subtract(fornecedores['valor'], fornecedores['valor_pago']),
+        'pago': fornecedores['pago'],
+        'data_pagamento': fornecedores['data_pagamento'],
+    })
+
+    pagamentos = tabela_colunar('historico_pagamentos')
+    com_origem = pagamentos.filter(pc.is_valid(pagamentos['origem_pagamento']))
+    return {'tabela': moeda_em_texto(tabela, ['valor', 'valor_pago', 'Restante']),
+            'por_origem': somar_por(com_origem, 'origem_pagamento', ['valor_pago'])}
+
+
+def montar_relatorio_investimentos():
+    """Tabela formatada, somas e situação de devolução dos investidores; None sem investidores"""
+    investidores = tabela_colunar('investidores')
+    if not investidores.num_rows:
+        return None
+
+    investido, devolvido = investidores['valor_investido'], investidores['valor_devolvido']
+    percentual = pc.if_else(
+        pc.greater(investido, 0),
+        pc.round(pc.multiply(pc.divide(pc.cast(devolvido, pa.float64()), investido), 100), 2),
+        None)
+    tabela = pa.table({
+        'nome': investidores['nome'],
+        'valor_investido': investido,
+        'valor_devolvido': devolvido,
+        'Restante': pc.subtract(investido, devolvido),
+        '% Devolvido': percentual,
+        'devolvido': investidores['devolvido'],
+        'data_devolucao': investidores['data_devolucao'],
+    })
+
+    situacao = pc.value_counts(investidores['devolvido'])
+    return {
+        'tabela': moeda_em_texto(tabela, ['valor_investido', 'valor_devolvido', 'Restante']),
+        'somas': {'valor_investido': soma(investido), 'valor_devolvido': soma(devolvido)},
+        'situacao': pa.table({
+            'Situação': ['Devolvido' if valor else 'Pendente'
+                         for valor in situacao.field('values').to_pylist()],
+            'Investidores': situacao.field('counts'),
+        }),
+    }
+
+
+def relatorio_gerado(chave, parametros):
+    """
+    O botão Gerar guarda os parâmetros do relatório; enquanto os filtros não
+    mudarem, as reexecuções seguintes continuam exibindo o relatório (vindo
+    do cache) sem novo clique.
+    """
+    return st.session_state.get(chave) == parametros
+
+
+st.subheader("📊 Relatórios Detalhados")
+tab_relatorios = st.tabs(
+    ["Caixa", "Fornecedores", "Investimentos", "Fluxo de Caixa", "Estoque", "Bancário"])
+
+# --- RELATÓRIO DE CAIXA ---
+with tab_relatorios[0]:
+    st.subheader("📊 Relatório de Caixa")
+    col_filtro1, col_filtro2 = st.columns(2)
+    with col_filtro1:
+        data_inicio = st.date_input("Data início:", datetime.now(
+        ).date().replace(day=1), key="data_inicio_caixa")
+    with col_filtro2:
+        data_fim = st.date_input(
+            "Data fim:", datetime.now().date(), key="data_fim_caixa")
+
+    if st.button("📈 Gerar Relatório de Caixa", key="btn_relatorio_caixa"):
+        st.session_state.relatorio_caixa_gerado = (data_inicio, data_fim)
+
+    if relatorio_gerado("relatorio_caixa_gerado", (data_inicio, data_fim)):
+        relatorio = relatorio_em_cache(
+            'caixa', (data_inicio.isoformat(), data_fim.isoformat()), ('caixa',),
+            lambda: montar_relatorio_caixa(data_inicio, data_fim))
+
+        if relatorio:
+            st.dataframe(relatorio['tabela'], use_container_width=True, height=400)
+
+            st.subheader("📈 Estatísticas")
+            col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(
+                4)
+            somas = relatorio['somas']
+
+            with col_stat1:
+                st.metric("💵 Total Dinheiro",
+                          formatar_moeda(somas['dinheiro']))
+
+            with col_stat2:
+                st.metric("💳 Total Maquineta",
+                          formatar_moeda(somas['maquineta']))
+
+            with col_stat3:
+                st.metric("↗️ Total Retiradas",
+                          formatar_moeda(somas['retiradas']))
+
+            with col_stat4:
+                st.metric("🏦 Total Bancário",
+                          formatar_moeda(somas['conta_bancaria']))
+
+            st.line_chart(relatorio['diario'], x="Data",
+                          y="Total", height=300)
+        else:
+            st.info(
+                "ℹ️ Nenhum caixa encontrado para o período selecionado")
+
+# --- RELATÓRIO DE FORNECEDORES ---
+with tab_relatorios[1]:
+    st.subheader("📋 Relatório de Fornecedores")
+    relatorio = relatorio_em_cache('fornecedores', (), ('fornecedor', 'historico_pagamentos'),
+                                   montar_relatorio_fornecedores)
+
+    if relatorio:
+        st.dataframe(relatorio['tabela'], use_container_width=True, height=400)
+
+        st.subheader("📊 Estatísticas de Pagamentos por Origem")
+        total_por_origem = relatorio['por_origem']
+
+        if total_por_origem.num_rows:
+            col_orig1, col_orig2 = st.columns(2)
+
+            with col_orig1:
+                st.write("**💰 Total Pago por Origem:**")
+                for origem in total_por_origem.to_pylist():
+                    st.write(
+                        f"- {origem['origem_pagamento']}: {formatar_moeda(origem['valor_pago'])}")
+
+            with col_orig2:
+                st.bar_chart(pa.table({
+                    'origem_pagamento': total_por_origem['origem_pagamento'],
+                    'valor_pago': em_reais(total_por_origem['valor_pago']),
+                }), x='origem_pagamento', y='valor_pago')
+        else:
+            st.info("ℹ️ Nenhum pagamento registrado com origem")
+    else:
+        st.info("ℹ️ Nenhum fornecedor cadastrado")
+# --- RELATÓRIO DE INVESTIMENTOS ---
+with tab_relatorios[2]:
+    st.subheader("📊 Relatório de Investimentos")
+    relatorio = relatorio_em_cache('investimentos', (), ('investidores',),
+                                   montar_relatorio_investimentos)
+
+    if relatorio:
+        somas = relatorio['somas']
+        st.dataframe(relatorio['tabela'], use_container_width=True, height=400,
+                     column_config={'% Devolvido': st.column_config.NumberColumn(
+                         format="%.2f%%")})
+
+        st.subheader("📈 Estatísticas de Investimentos")
+        col_istat1, col_istat2, col_istat3, col_istat4 = st.columns(
+            4)
+
+        with col_istat1:
+            total_investido = somas['valor_investido']
+            st.metric("💰 Total Investido",
+                      formatar_moeda(total_investido))
+
+        with col_istat2:
+            total_devolvido = somas['valor_devolvido']
+            st.metric("💵 Devolvido",
+                      formatar_moeda(total_devolvido))
+
+        with col_istat3:
+            total_restante = total_investido - total_devolvido
+            st.metric("⏳ A Devolver",
+                      formatar_moeda(total_restante))
+
+        with col_istat4:
+            percentual = (
+                total_devolvido / total_investido * 100) if total_investido > 0 else 0
+            st.metric("📊 % Devolvido", f"{percentual:.2f}%")
+
+        # Gráfico de barras para status de devolução
+        st.bar_chart(relatorio['situacao'], x='Situação', y='Investidores')
+    else:
+        st.info("ℹ️ Nenhum investidor cadastrado")
+
+# --- RELATÓRIO DE FLUXO DE CAIXA ---
+with tab_relatorios[3]:
+    st.subheader("📈 Fluxo de Caixa Consolidado")
+    col_periodo1, col_periodo2 = st.columns(2)
+    with col_periodo1:
+        data_inicio_fluxo = st.date_input(
+            "Data início:", datetime.now().date().replace(day=1), key="data_inicio_fluxo")
+    with col_periodo2:
+        data_fim_fluxo = st.date_input(
+            "Data fim:", datetime.now().date(), key="data_fim_fluxo")
+
+    if st.button("📊 Gerar Fluxo de Caixa", key="btn_fluxo_caixa"):
+        st.session_state.relatorio_fluxo_gerado = (data_inicio_fluxo, data_fim_fluxo)
+
+    if relatorio_gerado("relatorio_fluxo_gerado", (data_inicio_fluxo, data_fim_fluxo)):
+        fluxo = calcular_fluxo_caixa(data_inicio_fluxo, data_fim_fluxo)
+
+        st.subheader("💰 Situação Financeira do Período")
+        col_fluxo1, col_fluxo2, col_fluxo3, col_fluxo4 = st.columns(
+            4)
+
+        with col_fluxo1:
+            st.metric("Entradas Caixa", formatar_moeda(
+                fluxo['entradas_caixa']))
+            st.metric("🏦 Conta Bancária", formatar_moeda(
+                fluxo['conta_bancaria']))
+
+        with col_fluxo2:
+            st.metric("Saídas (Pagas)", formatar_moeda(
+                fluxo['saidas']))
+            st.metric("Obrigações Pendentes", formatar_moeda(
+                fluxo['obrigacoes']))
+
+        with col_fluxo3:
+            st.metric("Saldo do Período", formatar_moeda(
+                fluxo['saldo_periodo']))
+            st.metric("Saldo Final Projetado", formatar_moeda(
+                fluxo['saldo_projetado']), delta=formatar_moeda(fluxo['saldo_projetado']))
+
+        with col_fluxo4:
+            if fluxo['dias_com_movimento']:
+                st.metric("📊 Fluxo Médio Diário",
+                          formatar_moeda(fluxo['fluxo_medio_diario']))
+
+                if fluxo['dias_para_zerar'] is not None:
+                    st.metric(
+                        "⏳ Dias para Zerar Obrigações", f"{fluxo['dias_para_zerar']:.1f}")
+
+        st.caption("Obrigações pendentes são as de hoje; os demais valores se referem ao período.")
+
+        st.subheader("🔮 Projeção Financeira")
+        col_proj1, col_proj2 = st.columns(2)
+
+        with col_proj1:
+            st.info(f"""
+            **Situação no período:**
+            - 💰 Saldo: {formatar_moeda(fluxo['saldo_periodo'])}
+            - ⏳ A pagar (fornecedores): {formatar_moeda(fluxo['a_pagar'])}
+            - 🎯 A devolver (investidores): {formatar_moeda(fluxo['a_devolver'])}
+            - 📊 Saldo final projetado: {formatar_moeda(fluxo['saldo_projetado'])}
+            """)
+
+        with col_proj2:
+            st.warning(f"""
+            **Recomendações:**
+            - {'✅ Saldo positivo' if fluxo['saldo_periodo'] > 0 else '⚠️ Saldo negativo'}
+            - {'✅ Obrigações cobertas' if fluxo['saldo_periodo'] >= fluxo['obrigacoes'] else '⚠️ Obrigações não cobertas'}
+            - {'✅ Fluxo saudável' if fluxo['saldo_projetado'] > 0 else '⚠️ Atenção ao fluxo'}
+            """)
+
+        if fluxo['dias_com_movimento']:
+            st.subheader("📊 Composição do Fluxo")
+            composicao = fluxo['composicao']
+            st.bar_chart(pa.table({
+                'Categoria': ['Dinheiro', 'Maquineta', 'Bancário', 'Retiradas'],
+                'Valor': em_reais(pa.array([
+                    composicao['dinheiro'], composicao['maquineta'],
+                    composicao['conta_bancaria'], -composicao['retiradas']]))
+            }), x='Categoria', y='Valor')
+
+# --- RELATÓRIO DE ESTOQUE ---
+with tab_relatorios[4]:
+    st.subheader("📦 Relatório de Estoque por Caixa")
+    modo_visualizacao = st.radio("Modo de visualização:", [
+                                 "Por Caixa", "Por Produto", "Por Data"], horizontal=True, key="modo_estoque")
+
+    if modo_visualizacao == "Por Caixa":
+        st.write("### 📊 Estoque Organizado por Caixa")
+        caixas_com_estoque = buscar_caixas_com_estoque()
+
+        if caixas_com_estoque:
+            for caixa in caixas_com_estoque:
+                with st.expander(f"📦 Caixa {caixa['data']} - {caixa['nome_funcionario']} - {caixa['total_itens']} itens"):
+                    col_caixa1, col_caixa2, col_caixa3 = st.columns([
+                                                                    2, 1, 1])
+
+                    with col_caixa1:
+                        st.write(f"**Data:** {caixa['data']}")
+                        st.write(
+                            f"**Funcionária:** {caixa['nome_funcionario']}")
+                        st.write(
+                            f"**Total de itens:** {caixa['total_itens']}")
+                        st.write(
+                            f"**Horário:** {caixa['hora_abertura']} - {caixa['hora_fechamento']}")
+
+                    with col_caixa2:
+                        total_caixa = caixa['dinheiro'] + caixa['maquineta'] - caixa['retiradas']
+                        st.metric("💰 Total Caixa",
+                                  formatar_moeda(total_caixa))
+
+                    with col_caixa3:
+                        st.metric(
+                            "📦 Itens/Venda", formatar_moeda(round(total_caixa / caixa['total_itens'])) if caixa['total_itens'] > 0 else "N/A")
+
+                    st.write("**📋 Itens do Estoque:**")
+                    itens = para_arrow('estoque', caixa['itens_estoque'])
+                    st.dataframe(itens.select(['produto', 'quantidade', 'responsavel']),
+                                 use_container_width=True, height=200)
+
+                    if itens.num_rows > 1:
+                        st.write("**📊 Distribuição de Produtos:**")
+                        st.bar_chart(somar_por_produto(itens, ['quantidade']),
+                                     x='produto', y='quantidade')
+        else:
+            st.info("ℹ️ Nenhum caixa com estoque registrado")
+
+    elif modo_visualizacao == "Por Produto":
+        st.write("### 📊 Estoque Agrupado por Produto")
+        estoque = tabela_colunar('estoque')
+
+        if estoque.num_rows:
+            agrupado = somar_por_produto(estoque, ['quantidade'], contar='data').rename_columns(
+                ['Produto', 'Quantidade Total', 'Nº de Registros'])
+
+            st.dataframe(
+                agrupado, use_container_width=True, height=300)
+            st.bar_chart(agrupado, x='Produto', y='Quantidade Total')
+        else:
+            st.info("ℹ️ Nenhum produto em estoque")
+
+    else:
+        st.write("### 📊 Estoque por Data")
+        estoque = tabela_colunar('estoque')
+
+        if estoque.num_rows:
+            agrupado = somar_por(estoque, 'data', ['quantidade'], contar='produto').rename_columns(
+                ['Data', 'Total Itens', 'Tipos de Produtos'])
+
+            col_data1, col_data2 = st.columns(2)
+
+            with col_data1:
+                st.dataframe(
+                    agrupado, use_container_width=True, height=300)
+
+            with col_data2:
+                st.line_chart(agrupado, x='Data', y='Total Itens')
+        else:
+            st.info("ℹ️ Nenhum registro de estoque por data")
+
+    st.divider()
+    st.subheader("📈 Estatísticas Gerais de Estoque")
+    estoque_geral = tabela_colunar('estoque')
+
+    if estoque_geral.num_rows:
+        col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
+
+        with col_stat1:
+            total_itens = soma(estoque_geral['quantidade'])
+            st.metric("📦 Total de Itens", total_itens)
+
+        with col_stat2:
+            # Itens sem produto_id (backups anteriores ao catálogo) contam como um tipo, como no gráfico
+            tipos_produtos = pc.count_distinct(estoque_geral['produto_id'], mode='all').as_py()
+            st.metric("🏷️ Tipos de Produtos", tipos_produtos)
+
+        with col_stat3:
+            dias_registrados = pc.count_distinct(estoque_geral['data']).as_py()
+            st.metric("📅 Dias com Registro", dias_registrados)
+
+        with col_stat4:
+            caixas_com_estoque = pc.count_distinct(estoque_geral['caixa_id']).as_py()
+            st.metric("💰 Caixas com Estoque", caixas_com_estoque)
+
+# --- RELATÓRIO BANCÁRIO ---
+with tab_relatorios[5]:
+    st.subheader("📊 Relatório de Conta Bancária")
+    col_periodo1, col_periodo2 = st.columns(2)
+    with col_periodo1:
+        data_inicio = st.date_input("Data início:", datetime.now(
+        ).date().replace(day=1), key="data_inicio_bancario")
+    with col_periodo2:
+        data_fim = st.date_input(
+            "Data fim:", datetime.now().date(), key="data_fim_bancario")
+
+    if st.button("📈 Gerar Relatório Bancário", key="btn_relatorio_bancario"):
+        st.session_state.relatorio_bancario_gerado = (data_inicio, data_fim)
+
+    if relatorio_gerado("relatorio_bancario_gerado", (data_inicio, data_fim)):
+        relatorio = relatorio_em_cache(
+            'bancario', (data_inicio.isoformat(), data_fim.isoformat()), ('caixa',),
+            lambda: montar_relatorio_bancario(data_inicio, data_fim))
+
+        if relatorio:
+            totais = relatorio['totais']
+
+            st.subheader("📈 Métricas do Período")
+            col_metric1, col_metric2, col_metric3, col_metric4 = st.columns(
+                4)
+            with col_metric1:
+                st.metric("🏦 Total Bancário",
+                          formatar_moeda(totais['conta_bancaria']))
+            with col_metric2:
+                st.metric("💵 Total Dinheiro",
+                          formatar_moeda(totais['dinheiro']))
+            with col_metric3:
+                st.metric("💳 Total Maquineta",
+                          formatar_moeda(totais['maquineta']))
+            with col_metric4:
+                st.metric("💰 Total Líquido",
+                          formatar_moeda(relatorio['total_liquido']))
+
+            st.subheader("📊 Evolução da Conta Bancária")
+            st.line_chart(relatorio['evolucao'], x='data', y='conta_bancaria')
+
+            st.subheader("📋 Detalhes por Data")
+            st.dataframe(
+                relatorio['tabela'], use_container_width=True, height=300)
+
+            st.subheader("📈 Análise de Tendência")
+            if relatorio['dias'] > 1:
+                col_tend1, col_tend2 = st.columns(2)
+
+                with col_tend1:
+                    st.metric("📊 Média Diária",
+                              formatar_moeda(relatorio['media_diaria']))
+
+                with col_tend2:
+                    st.metric("🚀 Maior Valor",
+                              formatar_moeda(relatorio['maior_valor']))
+
+                st.info("""
+                **💡 Recomendações:**
+                - Mantenha registros diários consistentes
+                - Compare com períodos anteriores
+                - Estabeleça metas de crescimento
+                """)
+            else:
+                st.info(
+                    "ℹ️ Dados insuficientes para análise de tendência")
+        else:
+            st.info(
+                "Nenhum dado encontrado para o período selecionado.")
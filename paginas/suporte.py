@@ -0,0 +1,195 @@
+"""Página de suporte: contatos, tutoriais, perguntas frequentes e relato de problemas"""
+import streamlit as st
+
+st.header("🆘 Suporte e Ajuda")
+tab_suporte = st.tabs(
+    ["📞 Contatos", "📚 Tutoriais", "❓ FAQ", "🐛 Reportar Bug"])
+
+with tab_suporte[0]:
+    col_contato1, col_contato2 = st.columns(2)
+
+    with col_contato1:
+        st.subheader("📞 Contato de Suporte")
+        st.info("""
+        **Thalita Amorim**  
+        📧 thalita.muniz.amorim@gmail.com  
+        📞 (98) 98110-4216  
+        🕐 Horário: 9h às 17h (Segunda a Sexta)
+        """)
+
+        if st.button("📧 Copiar Email", key="btn_email"):
+            st.success("Email thalita.muniz.amorim@gmail.com copiado!")
+
+        if st.button("📱 Copiar Telefone", key="btn_ligar"):
+            st.success("Número (98) 98110-4216 copiado!")
+
+    with col_contato2:
+        st.subheader("🚨 Suporte Emergencial")
+        st.warning("""
+        **Para problemas urgentes durante o evento:**
+        - 📞 Ligação prioritária
+        - 📱 WhatsApp com resposta rápida
+        - 🆘 Plantão para emergências
+        - ⏰ Plantão 24h para críticas
+        """)
+
+        st.error("""
+        **⛔ Problemas Críticos:**
+        - Sistema fora do ar
+        - Perda de dados
+        - Erros graves de cálculo
+        """)
+
+with tab_suporte[1]:
+    st.subheader("📚 Tutoriais e Guias Passo a Passo")
+    col_tutorial1, col_tutorial2 = st.columns(2)
+
+    with col_tutorial1:
+        with st.expander("📋 Como Abrir e Fechar Caixa", expanded=True):
+            st.write("""
+            **🔹 ABRIR CAIXA:**
+            1. Abra a página 'Caixa' no menu lateral
+            2. Digite seu nome no campo 'Nome da Funcionária'
+            3. Clique em 'Abrir Caixa'
+            4. O sistema registra automaticamente data e hora
+
+            **🔹 FECHAR CAIXA:**
+            1. Preencha os valores ao final do dia:
+               - 💵 Valor em dinheiro
+               - 💳 Valor na maquineta  
+               - ↗️ Retiradas do caixa
+            2. Adicione observações se necessário
+            3. Clique em 'Fechar Caixa'
+            4. Confirme os valores antes de finalizar
+
+            **⚠️ IMPORTANTE:** Só é possível fechar caixas abertos no mesmo dia
+            """)
+
+        with st.expander("📦 Controle de Estoque"):
+            st.write("""
+            **🔹 ADICIONAR PRODUTOS:**
+            1. Abra a página 'Estoque' e digite seu nome
+            2. Preencha uma linha por produto na tabela: escolha o produto na lista (digite para buscar) e a quantidade
+            3. Adicione quantas linhas precisar
+            4. Clique em 'Adicionar ao Estoque' para gravar todas de uma vez
+            5. Produto que não está na lista? Cadastre-o antes em 'Produto fora da lista?'
+
+            **🔹 EDITAR ESTOQUE:**
+            1. Na página 'Estoque', digite seu nome no campo 'Nome da Funcionária'
+            2. Expanda o item desejado
+            3. Ajuste a quantidade
+            4. Clique em 'Atualizar'
+
+            **👀 MONITORAMENTO:**
+            - Visualize o estoque atual na seção 'Estoque Atual'
+            - Acompanhe por responsável
+            - Verifique histórico por data
+            """)
+
+    with col_tutorial2:
+        with st.expander("👤 Área Administrativa"):
+            st.write("""
+            **🔹 ACESSO ADMIN:**
+            - Login: admin
+            - Senha: evento123
+
+            **🔹 RELATÓRIOS COMPLETOS:**
+            1. Abra a página 'Admin'
+            2. Faça login com credenciais
+            3. Use as abas da página Admin:
+               - 🏦 Bancário
+               - 🎯 Investimentos  
+               - 📋 Fornecedores
+               - 🗄️ Arquivo
+            4. Após o login, o menu lateral mostra também
+               as páginas 📊 Relatórios e 🔄 Estornos
+
+            **🔹 EXPORTAR DADOS:**
+            - Use o menu lateral para exportar
+            - Escolha entre CSV ou Excel
+            - Selecione a tabela desejada
+            """)
+
+        with st.expander("📊 Como Gerar Relatórios"):
+            st.write("""
+            **🔹 RELATÓRIOS DETALHADOS:**
+            1. Faça login no Admin e abra a página 'Relatórios'
+            2. Selecione o tipo de relatório:
+               - Caixa: Controle diário de entradas/saídas
+               - Fornecedores: Contas a pagar
+               - Investimentos: Devoluções e saldos
+               - Fluxo de Caixa: Visão consolidada
+               - Estoque: Controle de produtos
+               - Bancário: Movimentação financeira
+
+            **🔹 FILTROS POR PERÍODO:**
+            - Selecione datas inicial e final
+            - Aplique filtros específicos
+            - Visualize gráficos e estatísticas
+
+            **📈 DICAS:**
+            - Use períodos mensais para análise
+            - Compare com meses anteriores
+            - Exporte dados para planilhas
+            """)
+
+with tab_suporte[2]:
+    st.subheader("❓ Perguntas Frequentes")
+    faq_items = [
+        {"pergunta": "Digitei um valor errado no caixa, e agora?",
+            "resposta": "Use a opção 'Editar Caixa Existente' para corrigir. Selecione seu nome, escolha o caixa e ajuste os valores."},
+        {"pergunta": "Registrei a quantidade errada no estoque?",
+            "resposta": "Na página 'Estoque', digite seu nome, use a seção 'Editar Estoque' e ajuste as quantidades dos itens."},
+        {"pergunta": "Posso editar caixas de outros dias?",
+            "resposta": "Sim, basta selecionar a data desejada no modo 'Editar Caixa Existente'."},
+        {"pergunta": "Como visualizar relatórios completos?",
+            "resposta": "Faça login no Admin e abra a página 'Relatórios' para uma visão detalhada de todos os dados."},
+        {"pergunta": "Esqueci minhas credenciais administrativas?",
+            "resposta": "Entre em contato com o suporte pelo email thalita.muniz.amorim@gmail.com"},
+        {"pergunta": "Como fechar o caixa corretamente?",
+            "resposta": "Preencha todos os valores (dinheiro, maquineta, retiradas) e confirme antes de finalizar."},
+        {"pergunta": "O que fazer se o sistema travar?",
+            "resposta": "Recarregue a página e verifique se os dados foram salvos. Em caso de perda, contate o suporte."}
+    ]
+
+    for faq in faq_items:
+        with st.expander(f"❔ {faq['pergunta']}"):
+            st.write(f"**✅ Resposta:** {faq['resposta']}")
+
+with tab_suporte[3]:
+    st.subheader("🐛 Reportar Problema")
+    col_bug1, col_bug2 = st.columns(2)
+
+    with col_bug1:
+        st.write("**Descreva o problema detalhadamente:**")
+        problema = st.text_area(
+            "Descrição:", placeholder="Ex: Ao tentar editar o caixa, o sistema apresentou erro...\n\nPassos para reproduzir:\n1. ...\n2. ...\n3. ...", height=150, key="problema_desc")
+        tipo_problema = st.selectbox("Tipo de problema:", [
+                                     "Selecione...", "Erro no sistema", "Dúvida funcional", "Melhoria", "Outro"], key="tipo_problema")
+
+    with col_bug2:
+        st.write("**Seus dados para contato:**")
+        contato_nome = st.text_input("Seu nome:", key="contato_nome")
+        contato_email = st.text_input("Seu e-mail:", key="contato_email")
+        contato_telefone = st.text_input(
+            "Seu telefone:", key="contato_telefone")
+        urgencia = st.slider("Nível de urgência:", 1, 5, 3,
+                             help="1 = Pouco urgente, 5 = Muito urgente", key="urgencia")
+
+    if st.button("📨 Enviar Relatório de Problema", type="primary", key="btn_report_bug"):
+        if problema and contato_email and tipo_problema != "Selecione...":
+            st.success(
+                "✅ Relatório enviado com sucesso! Entraremos em contato em breve.")
+            st.info(f"""
+            **📋 Resumo do Report:**
+            - **Tipo:** {tipo_problema}
+            - **Urgência:** {urgencia}/5
+            - **Contato:** {contato_nome} | {contato_email} | {contato_telefone}
+            - **Descrição:** {problema[:100]}...
+            """)
+            st.session_state.problema_desc = ""
+            st.session_state.contato_nome = ""
+            st.session_state.contato_email = ""
+            st.session_state.contato_telefone = ""
+        else:
+            st.error("❌ Preencha todos os campos obrigatórios.")
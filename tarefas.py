@@ -0,0 +1,377 @@
+"""Fila de tarefas em segundo plano para relatórios e exportações pesados.
+
+As tarefas rodam num pool de threads compartilhado pelo servidor, fora da
+execução do script, então a sessão de quem pediu continua respondendo e os
+caixas não esperam. A página acompanha a situação e o progresso de cada
+tarefa e oferece o arquivo gerado para download. Como não há sessão na thread
+da tarefa, o evento é passado na criação e as consultas não usam
+st.session_state.
+"""
+import io
+import itertools
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import streamlit as st
+
+from banco import (buscar_em_paginas, executar_leitura, init_supabase, paginas_consulta,
+                   supabase, valores_corrigidos)
+from migracoes import COLUNAS_MONETARIAS
+from modelos import MODELOS, modelar
+from utilitarios import obter_horario_brasilia
+
+# Poucas tarefas ao mesmo tempo, para não disputar o pool de conexões com os caixas
+MAX_TAREFAS_SIMULTANEAS = 2
+LIMITE_TAREFAS_GUARDADAS = 50
+RETENCAO_TAREFAS = 3600  # segundos que um resultado fica disponível para download
+
+TABELAS_EXPORTAVEIS = ['caixa', 'estoque', 'fornecedor', 'historico_pagamentos',
+                       'investidores', 'estornos_caixa']
+
+MIME = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'tar': 'application/x-tar',
+    'zip': 'application/zip',
+}
+
+# --- Fila ---
+
+
+@st.cache_resource
+def _fila():
+    """Executor e registro das tarefas, compartilhados por todas as sessões do servidor"""
+    return {
+        'executor': ThreadPoolExecutor(max_workers=MAX_TAREFAS_SIMULTANEAS,
+                                       thread_name_prefix="tarefa"),
+        'trava': threading.Lock(),
+        'tarefas': {},
+        'ids': itertools.count(1),
+    }
+
+
+def _descartar_antigas(fila):
+    """Remove tarefas terminadas há mais de RETENCAO_TAREFAS e mantém o registro limitado"""
+    agora = time.time()
+    terminadas = sorted((t for t in fila['tarefas'].values() if t['concluida_em']),
+                        key=lambda t: t['concluida_em'])
+    excesso = len(fila['tarefas']) - LIMITE_TAREFAS_GUARDADAS
+    for tarefa in terminadas:
+        if agora - tarefa['concluida_em'] > RETENCAO_TAREFAS or excesso > 0:
+            del fila['tarefas'][tarefa['id']]
+            excesso -= 1
+
+
+def enviar_tarefa(descricao, funcao, *args):
+    """
+    Coloca funcao(progresso, *args) na fila e retorna o id da tarefa.
+    A função chama progresso(fracao, etapa) para informar o andamento e
+    devolve (nome_arquivo, conteudo_bytes).
+    """
+    fila = _fila()
+    with fila['trava']:
+        _descartar_antigas(fila)
+        tarefa = {
+            'id': next(fila['ids']), 'descricao': descricao, 'situacao': 'na fila',
+            'progresso': 0.0, 'etapa': '', 'criada_em': time.time(),
+            'concluida_em': None, 'arquivo': None, 'erro': None,
+        }
+        fila['tarefas'][tarefa['id']] = tarefa
+
+    # A thread da tarefa só altera o registro sob a trava, e cada mudança de
+    # situação grava todos os campos juntos: quem lê vê um estado completo
+    def atualizar(**campos):
+        with fila['trava']:
+            tarefa.update(campos)
+
+    def progresso(fracao, etapa=""):
+        atualizar(progresso=min(max(fracao, 0.0), 1.0), etapa=etapa)
+
+    def executar():
+        atualizar(situacao='executando')
+        try:
+            arquivo = funcao(progresso, *args)
+        except Exception as e:
+            atualizar(situacao='erro', erro=str(e), concluida_em=time.time())
+        else:
+            atualizar(situacao='concluída', arquivo=arquivo, progresso=1.0,
+                      concluida_em=time.time())
+
+    fila['executor'].submit(executar)
+    return tarefa['id']
+
+
+def situacao_tarefas(ids):
+    """Cópias das tarefas informadas que ainda estão no registro, da mais recente à mais antiga"""
+    fila = _fila()
+    with fila['trava']:
+        return [dict(fila['tarefas'][i]) for i in sorted(ids, reverse=True)
+                if i in fila['tarefas']]
+
+# --- Consultas sem sessão ---
+
+
+def _consulta_evento(tabela, evento_id, filtrar=lambda query: query):
+    return lambda: filtrar(supabase.table(tabela).select('*').eq('evento_id', evento_id)).order('id')
+
+
+def _linhas_evento(tabela, evento_id, filtrar=lambda query: query):
+    """Todas as linhas da tabela no evento, buscadas em páginas, como modelos (modelos.py)"""
+    return modelar(tabela, (linha for pagina in paginas_consulta(
+        _consulta_evento(tabela, evento_id, filtrar)) for linha in pagina))
+
+
+def _agrupar(linhas, coluna):
+    grupos = {}
+    for linha in linhas:
+        grupos.setdefault(getattr(linha, coluna), []).append(linha)
+    return grupos
+
+
+def _quadro_em_reais(tabela, linhas):
+    """DataFrame das linhas com as colunas de dinheiro convertidas de centavos para reais"""
+    import pandas as pd
+
+    df = pd.DataFrame(linhas)
+    for coluna in COLUNAS_MONETARIAS.get(tabela, []):
+        if coluna in df.columns:
+            df[coluna] = df[coluna].fillna(0) / 100
+    return df
+
+# --- Planilhas em memória constante ---
+
+
+def _nova_planilha(saida):
+    """
+    Pasta de trabalho do xlsxwriter em modo de memória constante: cada linha vai
+    para um arquivo temporário assim que a seguinte começa, então as linhas de
+    cada aba precisam ser gravadas em ordem. Retorna (planilha, formato_moeda).
+    """
+    import xlsxwriter
+
+    planilha = xlsxwriter.Workbook(saida, {'constant_memory': True})
+    return planilha, planilha.add_format({'num_format': '"R$" #,##0.00'})
+
+
+def _gravar_aba(aba, paginas, monetarias=(), formato_moeda=None):
+    """
+    Grava as páginas de linhas (dicionários) na aba, na ordem em que chegam, com
+    as colunas de dinheiro convertidas de centavos para reais. Retorna a quantidade
+    de linhas gravadas.
+    """
+    colunas = None
+    numero = 0
+    for pagina in paginas:
+        for linha in pagina:
+            if colunas is None:
+                colunas = list(linha)
+                aba.write_row(0, 0, colunas)
+            numero += 1
+            for indice, coluna in enumerate(colunas):
+                valor = linha.get(coluna)
+                if valor is None:
+                    continue
+                if coluna in monetarias:
+                    aba.write_number(numero, indice, valor / 100, formato_moeda)
+                else:
+                    aba.write(numero, indice, valor)
+    if colunas is None:
+        aba.write(0, 0, "Sem registros")
+    return numero
+
+
+def _acumulando(tabela, paginas, acumular):
+    """Repassa as páginas, chamando acumular(modelo da linha) em cada linha pelo caminho"""
+    de_linha = MODELOS[tabela].de_linha
+    for pagina in paginas:
+        for linha in pagina:
+            acumular(de_linha(linha))
+        yield pagina
+
+# --- Tarefas disponíveis ---
+
+
+def relatorio_caixas(progresso, evento_id, data_inicio, data_fim):
+    """Planilha com os caixas do período (valores corrigidos pelos estornos) e o resumo diário"""
+    import pandas as pd
+
+    inicio, fim = data_inicio.isoformat(), data_fim.isoformat()
+    progresso(0.1, "Buscando caixas")
+    caixas = _linhas_evento('caixa', evento_id,
+                            lambda query: query.gte('data', inicio).lte('data', fim))
+    progresso(0.4, "Buscando estornos")
+    estornos_por_caixa = _agrupar(_linhas_evento('estornos_caixa', evento_id), 'caixa_id')
+
+    progresso(0.6, "Montando planilha")
+    linhas = []
+    for caixa in sorted(caixas, key=lambda c: (c.data, c.hora_abertura or '')):
+        valores = valores_corrigidos(caixa, estornos_por_caixa)
+        linhas.append({
+            'data': caixa.data,
+            'funcionaria': caixa.nome_funcionario,
+            'abertura': caixa.hora_abertura,
+            'fechamento': caixa.hora_fechamento,
+            'dinheiro': valores['dinheiro'],
+            'maquineta': valores['maquineta'],
+            'retiradas': valores['retiradas'],
+            'conta_bancaria': caixa.conta_bancaria,
+            'estornos': len(estornos_por_caixa.get(caixa.id, [])),
+            'total_liquido': valores['dinheiro'] + valores['maquineta'] - valores['retiradas'],
+        })
+    colunas_valor = ['dinheiro', 'maquineta', 'retiradas', 'conta_bancaria', 'total_liquido']
+    df_caixas = pd.DataFrame(linhas, columns=['data', 'funcionaria', 'abertura', 'fechamento',
+                                              *colunas_valor, 'estornos'])
+    df_diario = df_caixas.groupby('data')[colunas_valor].sum().reset_index()
+    df_caixas[colunas_valor] = df_caixas[colunas_valor] / 100
+    df_diario[colunas_valor] = df_diario[colunas_valor] / 100
+
+    progresso(0.8, "Gravando planilha")
+    saida = io.BytesIO()
+    with pd.ExcelWriter(saida, engine='openpyxl') as writer:
+        df_caixas.to_excel(writer, sheet_name='Caixas', index=False)
+        df_diario.to_excel(writer, sheet_name='Resumo diário', index=False)
+    return f"relatorio_caixas_{inicio}_{fim}.xlsx", saida.getvalue()
+
+
+def exportar_tabela(progresso, evento_id, tabela, formato):
+    """Todas as linhas da tabela no evento, em CSV ou Excel, com valores em reais"""
+    progresso(0.1, f"Buscando {tabela}")
+    nome = f"{tabela}_{obter_horario_brasilia().strftime('%Y%m%d_%H%M%S')}.{formato}"
+    if formato == "csv":
+        df = _quadro_em_reais(tabela, buscar_em_paginas(_consulta_evento(tabela, evento_id)))
+        progresso(0.7, "Gravando arquivo")
+        return nome, df.to_csv(index=False).encode('utf-8-sig')
+
+    # Excel: as páginas são gravadas na planilha à medida que chegam do banco
+    saida = io.BytesIO()
+    planilha, moeda = _nova_planilha(saida)
+    _gravar_aba(planilha.add_worksheet(tabela),
+                paginas_consulta(_consulta_evento(tabela, evento_id)),
+                COLUNAS_MONETARIAS.get(tabela, []), moeda)
+    progresso(0.9, "Gravando arquivo")
+    planilha.close()
+    return nome, saida.getvalue()
+
+
+def planilha_evento(progresso, evento_id):
+    """
+    Pasta de trabalho do evento inteiro numa única passada: uma aba por tabela,
+    gravada página a página conforme chega do banco, e abas de resumo (por dia,
+    por origem de pagamento e por produto) somadas pelo caminho.
+    """
+    progresso(0.05, "Buscando estornos")
+    estornos = _linhas_evento('estornos_caixa', evento_id)
+    estornos_por_caixa = _agrupar(estornos, 'caixa_id')
+    por_dia, por_origem, por_produto = {}, {}, {}
+
+    def somar_caixa(caixa):
+        valores = valores_corrigidos(caixa, estornos_por_caixa)
+        dia = por_dia.setdefault(caixa.data, {
+            'data': caixa.data, 'caixas': 0, 'dinheiro': 0, 'maquineta': 0,
+            'retiradas': 0, 'conta_bancaria': 0, 'total_liquido': 0})
+        dia['caixas'] += 1
+        for chave in ('dinheiro', 'maquineta', 'retiradas'):
+            dia[chave] += valores[chave]
+        dia['conta_bancaria'] += caixa.conta_bancaria
+        dia['total_liquido'] += valores['dinheiro'] + valores['maquineta'] - valores['retiradas']
+
+    def somar_pagamento(pagamento):
+        origem = pagamento.origem_pagamento or 'Não informada'
+        grupo = por_origem.setdefault(origem, {'origem_pagamento': origem, 'pagamentos': 0,
+                                               'valor_pago': 0})
+        grupo['pagamentos'] += 1
+        grupo['valor_pago'] += pagamento.valor_pago
+
+    def somar_estoque(item):
+        # Pelo id do catálogo; linhas sem produto_id (backups antigos) ficam pelo nome
+        chave = item.produto if item.produto_id is None else item.produto_id
+        grupo = por_produto.setdefault(chave, {'produto': item.produto,
+                                               'lancamentos': 0, 'quantidade': 0})
+        grupo['lancamentos'] += 1
+        grupo['quantidade'] += item.quantidade
+
+    acumuladores = {'caixa': somar_caixa, 'historico_pagamentos': somar_pagamento,
+                    'estoque': somar_estoque}
+
+    saida = io.BytesIO()
+    planilha, moeda = _nova_planilha(saida)
+    # Abas de resumo criadas primeiro, para abrirem na frente; são preenchidas no fim
+    aba_dia = planilha.add_worksheet('Resumo diário')
+    aba_origem = planilha.add_worksheet('Pagamentos por origem')
+    aba_produto = planilha.add_worksheet('Estoque por produto')
+
+    for numero, tabela in enumerate(TABELAS_EXPORTAVEIS):
+        progresso(0.1 + 0.8 * numero / len(TABELAS_EXPORTAVEIS), f"Gravando {tabela}")
+        if tabela == 'estornos_caixa':
+            paginas = [estornos]
+        else:
+            paginas = paginas_consulta(_consulta_evento(tabela, evento_id))
+        if tabela in acumuladores:
+            paginas = _acumulando(tabela, paginas, acumuladores[tabela])
+        _gravar_aba(planilha.add_worksheet(tabela), paginas,
+                    COLUNAS_MONETARIAS.get(tabela, []), moeda)
+
+    progresso(0.9, "Gravando resumos")
+    _gravar_aba(aba_dia, [[por_dia[dia] for dia in sorted(por_dia)]],
+                ['dinheiro', 'maquineta', 'retiradas', 'conta_bancaria', 'total_liquido'], moeda)
+    _gravar_aba(aba_origem, [sorted(por_origem.values(), key=lambda g: -g['valor_pago'])],
+                ['valor_pago'], moeda)
+    _gravar_aba(aba_produto, [sorted(por_produto.values(), key=lambda g: -g['quantidade'])])
+    planilha.close()
+    return f"evento_{evento_id}_{obter_horario_brasilia().strftime('%Y%m%d_%H%M%S')}.xlsx", \
+        saida.getvalue()
+
+
+def backup_completo(progresso):
+    """Backup de todas as tabelas (mesmo formato de backup.py)"""
+    import backup
+
+    progresso(0.1, "Copiando tabelas")
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = Path(pasta) / "backup.tar"
+        backup.gerar_backup(init_supabase(), caminho)
+        return (f"backup_{obter_horario_brasilia().strftime('%Y%m%d_%H%M%S')}.tar",
+                caminho.read_bytes())
+
+
+def extratos_em_pdf(progresso, evento_id, data_inicio, data_fim, incluir_fornecedores):
+    """Zip com o extrato de cada caixa fechado no período e, se pedido, de cada fornecedor"""
+    import extratos_pdf
+
+    inicio, fim = data_inicio.isoformat(), data_fim.isoformat()
+    progresso(0.05, "Buscando caixas")
+    evento = executar_leitura(supabase.table('evento').select('nome').eq('id', evento_id)).data
+    nome_evento = evento[0]['nome'] if evento else ""
+    caixas = [c for c in _linhas_evento('caixa', evento_id,
+                                        lambda query: query.gte('data', inicio).lte('data', fim))
+              if c.hora_fechamento]
+    estornos_por_caixa = _agrupar(_linhas_evento('estornos_caixa', evento_id), 'caixa_id')
+    estoque_por_caixa = _agrupar(_linhas_evento('estoque', evento_id), 'caixa_id')
+
+    # Os geradores recebem dicionários simples, que vão para outros processos
+    documentos = [
+        ('caixa',
+         f"caixas/{extratos_pdf.nome_arquivo(c.data, c.nome_funcionario, c.id)}.pdf",
+         {'evento': nome_evento, 'caixa': dict(c),
+          'estornos': [dict(e) for e in estornos_por_caixa.get(c.id, [])],
+          'estoque': [dict(item) for item in estoque_por_caixa.get(c.id, [])]})
+        for c in caixas
+    ]
+
+    if incluir_fornecedores:
+        progresso(0.15, "Buscando fornecedores")
+        pagamentos = _agrupar(_linhas_evento('historico_pagamentos', evento_id), 'fornecedor_id')
+        documentos += [
+            ('fornecedor', f"fornecedores/{extratos_pdf.nome_arquivo(f.nome, f.id)}.pdf",
+             {'evento': nome_evento, 'fornecedor': dict(f),
+              'pagamentos': [dict(p) for p in pagamentos.get(f.id, [])]})
+            for f in _linhas_evento('fornecedor', evento_id)
+        ]
+
+    progresso(0.3, f"Gerando {len(documentos)} PDFs")
+    conteudo = extratos_pdf.gerar_lote(documentos, progresso=lambda fracao: progresso(
+        0.3 + 0.7 * fracao, f"Gerando {len(documentos)} PDFs"))
+    return f"extratos_{inicio}_{fim}.zip", conteudo
@@ -0,0 +1,65 @@
+"""Arquivamento de eventos sobre o banco SQLite local"""
+import shutil
+
+import pytest
+
+import arquivamento
+from arquivamento import arquivar_evento, ler_tabela_arquivada, listar_eventos_arquivados
+from banco_local import ClienteLocal
+
+
+@pytest.fixture
+def cliente():
+    cliente = ClienteLocal()
+    cliente.table('evento').update({'encerrado': True}).eq('id', 1).execute()
+    cliente.table('caixa').insert([
+        {'data': '2025-08-01', 'nome_funcionario': f'Caixa {numero}', 'observacoes': 'x' * 300,
+         'evento_id': 1} for numero in range(200)]).execute()
+    cliente.table('estornos_caixa').insert({
+        'caixa_id': 1, 'valor_estorno': 500, 'tipo_lancamento': 'dinheiro',
+        'data_estorno': '2025-08-01', 'evento_id': 1}).execute()
+    cliente.table('fornecedor').insert({
+        'nome': 'Gelo', 'valor': 1000, 'evento_id': 1}).execute()
+    cliente.table('historico_pagamentos').insert({
+        'fornecedor_id': 1, 'valor_pago': 1000, 'data_pagamento': '2025-08-02',
+        'evento_id': 1}).execute()
+    return cliente
+
+
+def test_so_eventos_encerrados(cliente):
+    with pytest.raises(ValueError):
+        arquivar_evento(cliente, {'id': 1, 'encerrado': False})
+
+
+def test_arquivo_fica_no_banco(cliente, tmp_path, monkeypatch):
+    # Partes pequenas: o arquivo de caixas ocupa várias linhas de arquivo_evento
+    monkeypatch.setattr(arquivamento, "TAMANHO_PARTE", 1000)
+    evento = cliente.table('evento').select('*').execute().data[0]
+    manifesto = arquivar_evento(cliente, evento, pasta=tmp_path)
+
+    assert manifesto['tabelas']['caixa']['linhas'] == 200
+    assert cliente.table('caixa').select('*').execute().data == []
+    assert cliente.table('estornos_caixa').select('*').execute().data == []
+    assert cliente.table('evento').select('*').execute().data[0]['arquivado_em']
+    partes = cliente.table('arquivo_evento').select('parte').eq('tabela', 'caixa').execute().data
+    assert len(partes) > 1
+
+    # Sem a pasta local (servidor reiniciado), o arquivo é refeito a partir do banco
+    shutil.rmtree(tmp_path / "evento_1")
+    arquivados = listar_eventos_arquivados(cliente, pasta=tmp_path)
+    assert [arquivado['evento']['id'] for arquivado in arquivados] == [1]
+    linhas = ler_tabela_arquivada(cliente, arquivados[0], 'caixa')
+    assert [linha['nome_funcionario'] for linha in linhas] == [f'Caixa {numero}' for numero in range(200)]
+    assert ler_tabela_arquivada(cliente, arquivados[0], 'estornos_caixa')[0]['valor_estorno'] == 500
+
+
+def test_fornecedor_mantem_totais_pagos(cliente, tmp_path):
+    antes = cliente.table('fornecedor').select('valor_pago, pago, data_pagamento').execute().data
+    assert antes == [{'valor_pago': 1000, 'pago': True, 'data_pagamento': '2025-08-02'}]
+
+    evento = cliente.table('evento').select('*').execute().data[0]
+    arquivar_evento(cliente, evento, pasta=tmp_path)
+
+    assert cliente.table('historico_pagamentos').select('*').execute().data == []
+    assert cliente.table('fornecedor').select(
+        'valor_pago, pago, data_pagamento').execute().data == antes
@@ -0,0 +1,139 @@
+"""Backup e restauração de ponta a ponta sobre o banco SQLite local"""
+import json
+import tarfile
+
+import pytest
+
+from arquivamento import gravar_jsonl_gz
+from backup import TABELAS_BACKUP, gerar_backup, restaurar_backup
+from banco_local import ClienteLocal
+
+
+def _linhas(cliente, tabela):
+    """Linhas da tabela por id, sem updated_at (regravado pelos gatilhos na restauração)"""
+    return [{coluna: valor for coluna, valor in linha.items() if coluna != 'updated_at'}
+            for linha in cliente.table(tabela).select('*').order('id').execute().data]
+
+
+@pytest.fixture
+def origem():
+    cliente = ClienteLocal()
+    caixa = cliente.table('caixa').insert({
+        'data': '2025-08-01', 'hora_abertura': '08:00:00', 'nome_funcionario': 'Maria',
+        'dinheiro': 10050, 'maquineta': 20000, 'evento_id': 1}).execute().data[0]
+    produto = cliente.table('produto').insert({'nome': 'Gelo', 'chave': 'gelo'}).execute().data[0]
+    cliente.table('estoque').insert({
+        'data': '2025-08-01', 'produto': 'Gelo', 'produto_id': produto['id'], 'quantidade': 3,
+        'responsavel': 'Maria', 'caixa_id': caixa['id'], 'evento_id': 1}).execute()
+    cliente.table('estornos_caixa').insert({
+        'caixa_id': caixa['id'], 'valor_estorno': 500, 'tipo_lancamento': 'dinheiro',
+        'data_estorno': '2025-08-01', 'evento_id': 1}).execute()
+    fornecedor = cliente.table('fornecedor').insert({
+        'nome': 'Distribuidora', 'valor': 30000, 'evento_id': 1}).execute().data[0]
+    cliente.table('historico_pagamentos').insert({
+        'fornecedor_id': fornecedor['id'], 'valor_pago': 12000, 'data_pagamento': '2025-08-02',
+        'origem_pagamento': 'Dinheiro', 'evento_id': 1}).execute()
+    cliente.table('investidores').insert({
+        'nome': 'João', 'valor_investido': 5000, 'evento_id': 1}).execute()
+    # Mais linhas que uma página da leitura do backup
+    cliente.table('caixa').insert([
+        {'data': '2025-08-03', 'nome_funcionario': f'Caixa {numero}', 'evento_id': 1}
+        for numero in range(1200)]).execute()
+    return cliente
+
+
+def test_backup_e_restauracao(origem, tmp_path):
+    caminho = tmp_path / "backup.tar"
+    manifesto = gerar_backup(origem, caminho)
+    assert list(manifesto['tabelas']) == TABELAS_BACKUP
+    assert manifesto['tabelas']['caixa']['linhas'] == 1201
+
+    destino = ClienteLocal()
+    restauradas = restaurar_backup(destino, caminho)
+
+    assert restauradas == {tabela: info['linhas'] for tabela, info in manifesto['tabelas'].items()}
+    for tabela in TABELAS_BACKUP:
+        assert _linhas(destino, tabela) == _linhas(origem, tabela), tabela
+    fornecedor = destino.table('fornecedor').select('*').execute().data[0]
+    assert (fornecedor['valor_pago'], fornecedor['pago']) == (12000, False)
+
+
+def test_checksum_invalido_nao_restaura_nada(origem, tmp_path):
+    caminho = tmp_path / "backup.tar"
+    gerar_backup(origem, caminho)
+    with tarfile.open(caminho) as pacote:
+        pacote.extractall(tmp_path / "extraido", filter="data")
+    manifesto_path = tmp_path / "extraido" / "manifesto.json"
+    manifesto = json.loads(manifesto_path.read_text(encoding="utf-8"))
+    manifesto['tabelas']['caixa']['sha256'] = "0" * 64
+    manifesto_path.write_text(json.dumps(manifesto), encoding="utf-8")
+    adulterado = tmp_path / "adulterado.tar"
+    with tarfile.open(adulterado, "w") as pacote:
+        for arquivo in (tmp_path / "extraido").iterdir():
+            pacote.add(arquivo, arcname=arquivo.name)
+
+    destino = ClienteLocal()
+    with pytest.raises(IOError):
+        restaurar_backup(destino, adulterado)
+    assert destino.table('caixa').select('*').execute().data == []
+
+
+def test_backup_antigo_em_reais(tmp_path):
+    """Backups anteriores às versões 8 e 12: valores em reais e valor pago fora do histórico"""
+    tabelas = {
+        'evento': [{'id': 1, 'nome': 'Evento inicial', 'encerrado': False}],
+        'caixa': [{'id': 1, 'data': '2025-08-01', 'nome_funcionario': 'Maria',
+                   'dinheiro': 100.5, 'maquineta': 0.1, 'evento_id': 1}],
+        'fornecedor': [{'id': 1, 'nome': 'Gelo', 'valor': 300, 'valor_pago': 250.75, 'pago': False,
+                        'data_pagamento': '2025-08-02', 'evento_id': 1}],
+        'historico_pagamentos': [{'id': 1, 'fornecedor_id': 1, 'valor_pago': 50.25,
+                                  'data_pagamento': '2025-08-01', 'evento_id': 1}],
+    }
+    manifesto = {'versao_schema': 7, 'tabelas': {}}
+    for tabela, linhas in tabelas.items():
+        quantidade, sha256 = gravar_jsonl_gz(tmp_path / f"{tabela}.jsonl.gz", linhas)
+        manifesto['tabelas'][tabela] = {'arquivo': f"{tabela}.jsonl.gz", 'linhas': quantidade,
+                                        'sha256': sha256}
+    (tmp_path / "manifesto.json").write_text(json.dumps(manifesto), encoding="utf-8")
+    caminho = tmp_path / "antigo.tar"
+    with tarfile.open(caminho, "w") as pacote:
+        for nome in ["manifesto.json", *(info['arquivo'] for info in manifesto['tabelas'].values())]:
+            pacote.add(tmp_path / nome, arcname=nome)
+
+    destino = ClienteLocal()
+    restaurar_backup(destino, caminho)
+
+    caixa = destino.table('caixa').select('*').execute().data[0]
+    assert (caixa['dinheiro'], caixa['maquineta']) == (10050, 10)
+    fornecedor = destino.table('fornecedor').select('*').execute().data[0]
+    assert (fornecedor['valor'], fornecedor['valor_pago']) == (30000, 25075)
+    historico = destino.table('historico_pagamentos').select('*').order('id').execute().data
+    assert [(linha['valor_pago'], linha['observacao']) for linha in historico] == [
+        (5025, None), (20050, 'Pago antes do histórico')]
+
+
+def test_linhas_inseridas_durante_o_backup_ficam_de_fora(origem, tmp_path, monkeypatch):
+    import backup
+
+    maior_id = backup._maior_id
+
+    def inserir_depois_das_marcas(cliente, tabela):
+        marca = maior_id(cliente, tabela)
+        if tabela == TABELAS_BACKUP[-1]:
+            # Todas as marcas já foram anotadas; nenhuma tabela foi lida ainda
+            cliente.table('caixa').insert({'data': '2025-08-04', 'nome_funcionario': 'Nova',
+                                           'evento_id': 1}).execute()
+            cliente.table('historico_pagamentos').insert({
+                'fornecedor_id': 1, 'valor_pago': 100, 'data_pagamento': '2025-08-04',
+                'evento_id': 1}).execute()
+        return marca
+
+    monkeypatch.setattr(backup, "_maior_id", inserir_depois_das_marcas)
+    manifesto = gerar_backup(origem, tmp_path / "backup.tar")
+
+    assert manifesto['tabelas']['caixa']['linhas'] == 1201
+    assert manifesto['tabelas']['historico_pagamentos']['linhas'] == 1
+    assert manifesto['tabelas']['caixa']['ate_id'] == 1201
+    # Tabela vazia no início do backup: nada é lido
+    assert (manifesto['tabelas']['arquivo_evento']['linhas'],
+            manifesto['tabelas']['arquivo_evento']['ate_id']) == (0, None)
@@ -0,0 +1,46 @@
+"""Correspondência de nomes digitados com os produtos do catálogo"""
+import pytest
+
+import catalogo
+from catalogo import SEMELHANCA_MINIMA, chave_produto, produto_correspondente, produtos_parecidos
+from modelos import Produto
+
+
+@pytest.fixture(autouse=True)
+def catalogo_fixo(monkeypatch):
+    produtos = [Produto(id=indice, nome=nome, chave=chave_produto(nome))
+                for indice, nome in enumerate(["Cerveja", "Refri 1L", "Água de coco", "Gelo"], 1)]
+    cache = {'produtos': produtos, 'por_chave': {produto.chave: produto for produto in produtos}}
+    monkeypatch.setattr(catalogo, "_carregar_catalogo", lambda: cache)
+
+
+def test_chave_produto_ignora_espacos_e_maiusculas():
+    assert chave_produto("  CERVEJA   Lata ") == "cerveja lata"
+
+
+@pytest.mark.parametrize("nome", ["Cerveja", "cerveja ", "  CERVEJA"])
+def test_mesma_chave(nome):
+    assert produto_correspondente(nome).id == 1
+
+
+def test_erro_de_digitacao():
+    assert produto_correspondente("Cervja").nome == "Cerveja"
+    assert produto_correspondente("agua de coco").nome == "Água de coco"
+
+
+def test_numeros_diferentes_nunca_correspondem():
+    assert produto_correspondente("Refri 2L") is None
+    assert produto_correspondente("Refri 1L").id == 2
+
+
+def test_nome_sem_semelhanca():
+    assert produto_correspondente("Pastel") is None
+
+
+def test_semelhanca_minima(monkeypatch):
+    # difflib: "gel" e "gelo" têm semelhança 2 * 3 / 7 ≈ 0,857
+    assert SEMELHANCA_MINIMA <= 6 / 7
+    assert produto_correspondente("Gel").nome == "Gelo"
+    assert produtos_parecidos("Cerva") == []
+    monkeypatch.setattr(catalogo, "SEMELHANCA_MINIMA", 0.9)
+    assert produto_correspondente("Gel") is None
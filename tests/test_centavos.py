@@ -0,0 +1,56 @@
+"""Conversão de valores digitados ou importados para centavos"""
+import pandas as pd
+import pytest
+
+from importacao import converter_valores_monetarios
+from utilitarios import formatar_moeda, reais_para_centavos, texto_para_centavos
+
+CASOS = [
+    ("1.234,56", 123456),
+    ("1234,56", 123456),
+    ("1234.56", 123456),
+    ("R$ 10", 1000),
+    ("R$ 1.000,00", 100000),
+    ("0,005", 1),
+    ("0,004", 0),
+    ("10,5", 1050),
+    (",50", 50),
+]
+
+INVALIDOS = ["", "abc", "R$", "1,2,3", "1.234.567"]
+
+
+@pytest.mark.parametrize("texto, centavos", CASOS)
+def test_texto_para_centavos(texto, centavos):
+    assert texto_para_centavos(texto) == centavos
+
+
+@pytest.mark.parametrize("texto", INVALIDOS)
+def test_texto_para_centavos_invalido(texto):
+    assert texto_para_centavos(texto) is None
+
+
+def test_converter_valores_monetarios_igual_ao_texto():
+    textos = [texto for texto, _ in CASOS] + INVALIDOS
+    convertidos = converter_valores_monetarios(pd.Series(textos))
+    esperados = [texto_para_centavos(texto) for texto in textos]
+    assert [None if pd.isna(valor) else valor for valor in convertidos] == esperados
+
+
+def test_converter_valores_monetarios_nulos_e_numeros():
+    convertidos = converter_valores_monetarios(pd.Series([None, 12.5, 3]))
+    assert str(convertidos.dtype) == "Int64"
+    assert pd.isna(convertidos[0])
+    assert convertidos[1:].tolist() == [1250, 300]
+
+
+def test_reais_para_centavos_arredonda_meio_para_cima():
+    assert reais_para_centavos("0.005") == 1
+    assert reais_para_centavos(0.1 + 0.2) == 30
+    assert reais_para_centavos("19.99") == 1999
+
+
+def test_formatar_moeda():
+    assert formatar_moeda(123456) == "R$ 1.234,56"
+    assert formatar_moeda(-5) == "R$ -0,05"
+    assert formatar_moeda(0) == "R$ 0,00"
@@ -0,0 +1,65 @@
+"""Disjuntor de banco.py: quais falhas o abrem"""
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+
+import banco
+from banco import BancoIndisponivel, banco_disponivel, executar_leitura
+
+
+class ConsultaComErro:
+    """Query cuja execução sempre levanta o erro informado"""
+
+    def __init__(self, erro):
+        self.erro = erro
+        self.execucoes = 0
+
+    def execute(self):
+        self.execucoes += 1
+        raise self.erro
+
+
+@pytest.fixture(autouse=True)
+def disjuntor_fechado(monkeypatch):
+    monkeypatch.setattr(banco, "config_http", lambda: {
+        **banco.CONFIG_HTTP_PADRAO, "tentativas": 2, "espera_base": 0})
+    # Sem sonda em segundo plano: o disjuntor fica aberto até o fim do teste
+    monkeypatch.setattr(banco, "init_supabase", lambda: None)
+    monkeypatch.setattr(banco, "_sondar_banco", lambda cliente: None)
+    banco._disjuntor.clear()
+    yield
+    banco._disjuntor.clear()
+
+
+@pytest.mark.parametrize("erro", [
+    httpx.ConnectError("offline"),
+    # Gateway fora do ar: resposta sem JSON, o código é o status HTTP
+    APIError({"message": "JSON could not be generated", "code": 503}),
+    APIError({"message": "connection refused", "code": "PGRST000"}),
+    APIError({"message": "canceling statement due to statement timeout", "code": "57014"}),
+])
+def test_falhas_do_servidor_abrem_o_disjuntor(erro):
+    consulta = ConsultaComErro(erro)
+    for _ in range(banco.CONFIG_HTTP_PADRAO["falhas_para_abrir"]):
+        with pytest.raises(type(erro)):
+            executar_leitura(consulta)
+
+    assert not banco_disponivel()
+    assert consulta.execucoes == 2 * banco.CONFIG_HTTP_PADRAO["falhas_para_abrir"]
+    with pytest.raises(BancoIndisponivel):
+        executar_leitura(consulta)
+
+
+@pytest.mark.parametrize("erro", [
+    APIError({"message": "duplicate key value", "code": "23505"}),
+    APIError({"message": "column does not exist", "code": "42703"}),
+    APIError({"message": "JSON could not be generated", "code": 404}),
+])
+def test_erros_da_requisicao_nao_abrem_o_disjuntor(erro):
+    consulta = ConsultaComErro(erro)
+    for _ in range(5):
+        with pytest.raises(APIError):
+            executar_leitura(consulta)
+
+    assert banco_disponivel()
+    assert consulta.execucoes == 5
@@ -0,0 +1,150 @@
+"""Migrações aplicadas num SQLite em memória, com dados gravados entre as versões"""
+import sqlite3
+
+import pytest
+
+from migracoes import (MIGRACOES, VERSAO_CENTAVOS, VERSAO_VALOR_PAGO, aplicar_migracoes,
+                       sql_para_dialeto, versoes_aplicadas)
+from utilitarios import chave_produto
+
+
+@pytest.fixture
+def conexao():
+    conexao = sqlite3.connect(":memory:")
+    yield conexao
+    conexao.close()
+
+
+def test_versoes_unicas_e_em_ordem():
+    versoes = [migracao["versao"] for migracao in MIGRACOES]
+    assert versoes == sorted(set(versoes))
+
+
+@pytest.mark.parametrize("dialeto", ["postgres", "sqlite"])
+def test_sql_resolvido_para_os_dois_dialetos(dialeto):
+    for migracao in MIGRACOES:
+        assert "{pk}" not in sql_para_dialeto(migracao["sql"], dialeto)
+
+
+def test_aplica_cada_migracao_uma_vez(conexao):
+    todas = [migracao["versao"] for migracao in MIGRACOES]
+    assert aplicar_migracoes(conexao, "sqlite") == todas
+    assert aplicar_migracoes(conexao, "sqlite") == []
+    assert versoes_aplicadas(conexao, "sqlite") == set(todas)
+
+
+def test_aplica_ate_uma_versao(conexao):
+    assert aplicar_migracoes(conexao, "sqlite", ate=3) == [1, 2, 3]
+    assert aplicar_migracoes(conexao, "sqlite")[0] == 4
+
+
+def test_valores_em_centavos(conexao):
+    aplicar_migracoes(conexao, "sqlite", ate=VERSAO_CENTAVOS - 1)
+    conexao.execute("INSERT INTO caixa (data, nome_funcionario, dinheiro, maquineta, retiradas) "
+                    "VALUES ('2025-08-01', 'Maria', 10.5, 1234.56, 0.1)")
+    conexao.execute("INSERT INTO fornecedor (nome, valor, valor_pago) VALUES ('Gelo', 99.99, 0)")
+    conexao.commit()
+
+    aplicar_migracoes(conexao, "sqlite", ate=VERSAO_CENTAVOS)
+
+    assert conexao.execute("SELECT dinheiro, maquineta, retiradas, conta_bancaria FROM caixa").fetchone() \
+        == (1050, 123456, 10, 0)
+    assert conexao.execute("SELECT valor, valor_pago FROM fornecedor").fetchone() == (9999, 0)
+
+
+def test_linhas_antigas_vao_para_o_evento_inicial(conexao):
+    aplicar_migracoes(conexao, "sqlite", ate=4)
+    conexao.execute("INSERT INTO caixa (data, nome_funcionario) VALUES ('2025-07-30', 'Ana')")
+    conexao.commit()
+
+    aplicar_migracoes(conexao, "sqlite", ate=5)
+
+    assert conexao.execute("SELECT nome, data_inicio FROM evento").fetchall() == [
+        ("Evento inicial", "2025-07-30")]
+    assert conexao.execute("SELECT evento_id FROM caixa").fetchone() == (1,)
+
+
+def test_catalogo_unifica_grafias(conexao):
+    aplicar_migracoes(conexao, "sqlite", ate=10)
+    for produto in ["Cerveja", "cerveja ", "CERVEJA", "Cerveja", "  Gelo  ", ""]:
+        conexao.execute("INSERT INTO estoque (data, produto, quantidade, evento_id) "
+                        "VALUES ('2025-08-01', ?, 1, 1)", (produto,))
+    conexao.commit()
+
+    aplicar_migracoes(conexao, "sqlite", ate=11)
+
+    assert conexao.execute("SELECT id, nome, chave FROM produto ORDER BY id").fetchall() == [
+        (1, "Cerveja", "cerveja"), (2, "Gelo", "gelo")]
+    assert conexao.execute("SELECT produto, produto_id FROM estoque ORDER BY id").fetchall() == [
+        ("Cerveja", 1)] * 4 + [("Gelo", 2), ("", None)]
+
+
+def test_chaves_do_catalogo_iguais_as_do_app(conexao):
+    aplicar_migracoes(conexao, "sqlite", ate=10)
+    for produto in ["Açaí", "AÇAÍ", "açaí", "Pão  de   queijo", "pão de    queijo",
+                    "PÃO DE QUEIJO", "Água"]:
+        conexao.execute("INSERT INTO estoque (data, produto, quantidade, evento_id) "
+                        "VALUES ('2025-08-01', ?, 1, 1)", (produto,))
+    conexao.commit()
+
+    aplicar_migracoes(conexao, "sqlite")
+
+    produtos = conexao.execute("SELECT id, nome, chave FROM produto ORDER BY id").fetchall()
+    assert [chave for _, _, chave in produtos] == ["açaí", "pão de queijo", "água"]
+    assert all(chave == chave_produto(nome) for _, nome, chave in produtos)
+    ids = {chave: id_produto for id_produto, _, chave in produtos}
+    assert conexao.execute("SELECT produto_id FROM estoque ORDER BY id").fetchall() == [
+        (ids["açaí"],)] * 3 + [(ids["pão de queijo"],)] * 3 + [(ids["água"],)]
+    nomes = {id_produto: nome for id_produto, nome, _ in produtos}
+    assert all(nome == nomes[id_produto] for nome, id_produto in
+               conexao.execute("SELECT produto, produto_id FROM estoque"))
+
+
+def test_contador_alteracoes(conexao):
+    aplicar_migracoes(conexao, "sqlite")
+
+    def versao(tabela):
+        return conexao.execute("SELECT versao FROM contador_alteracoes WHERE tabela = ?",
+                               (tabela,)).fetchone()[0]
+
+    antes = versao("caixa")
+    conexao.execute("INSERT INTO caixa (data, nome_funcionario, evento_id) VALUES ('2025-08-01', 'Maria', 1)")
+    conexao.execute("UPDATE caixa SET dinheiro = 100")
+    conexao.execute("DELETE FROM caixa")
+    assert versao("caixa") > antes
+    assert versao("estoque") == 0
+
+
+def test_valor_pago_pelo_historico(conexao):
+    aplicar_migracoes(conexao, "sqlite", ate=VERSAO_VALOR_PAGO - 1)
+    conexao.execute("INSERT INTO fornecedor (nome, valor, valor_pago, pago, evento_id) "
+                    "VALUES ('A', 1000, 300, 0, 1)")
+    conexao.execute("INSERT INTO fornecedor (nome, valor, valor_pago, pago, data_pagamento, evento_id) "
+                    "VALUES ('B', 500, 500, 1, '2025-01-02', 1)")
+    conexao.execute("INSERT INTO historico_pagamentos (fornecedor_id, valor_pago, origem_pagamento, "
+                    "data_pagamento, evento_id) VALUES (2, 200, 'Pix', '2025-01-01', 1)")
+    conexao.commit()
+
+    aplicar_migracoes(conexao, "sqlite", ate=VERSAO_VALOR_PAGO)
+
+    # O valor pago que não estava no histórico entra como pagamento anterior
+    assert conexao.execute(
+        "SELECT fornecedor_id, valor_pago, data_pagamento FROM historico_pagamentos "
+        "WHERE observacao = 'Pago antes do histórico' ORDER BY fornecedor_id").fetchall()[1] \
+        == (2, 300, "2025-01-02")
+    assert conexao.execute("SELECT valor_pago, pago FROM fornecedor ORDER BY id").fetchall() == [
+        (300, 0), (500, 1)]
+
+    def fornecedor_a():
+        return conexao.execute("SELECT valor_pago, pago, data_pagamento FROM fornecedor "
+                               "WHERE id = 1").fetchone()
+
+    conexao.execute("INSERT INTO historico_pagamentos (fornecedor_id, valor_pago, data_pagamento, "
+                    "evento_id) VALUES (1, 700, '2025-02-01', 1)")
+    # Quitado: data do pagamento mais recente (o anterior ao histórico é datado de hoje)
+    assert fornecedor_a() == (1000, 1, conexao.execute(
+        "SELECT MAX(data_pagamento) FROM historico_pagamentos WHERE fornecedor_id = 1").fetchone()[0])
+    conexao.execute("UPDATE historico_pagamentos SET valor_pago = 600 WHERE valor_pago = 700")
+    assert fornecedor_a() == (900, 0, None)
+    conexao.execute("DELETE FROM historico_pagamentos WHERE fornecedor_id = 1")
+    assert fornecedor_a() == (0, 0, None)
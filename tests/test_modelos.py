@@ -0,0 +1,59 @@
+"""Modelos de linha: normalização dos nulos na carga e interface de dicionário"""
+import dataclasses
+
+import pandas as pd
+import pytest
+
+from migracoes import COLUNAS_MONETARIAS
+from modelos import MODELOS, Caixa, Fornecedor, Investidor, ItemEstoque, modelar
+
+
+def test_dinheiro_nulo_vira_zero():
+    caixa = Caixa.de_linha({'id': 1, 'data': '2025-08-01', 'nome_funcionario': 'Maria',
+                            'dinheiro': None, 'maquineta': 1500})
+    assert (caixa.dinheiro, caixa.maquineta, caixa.conta_bancaria, caixa.retiradas) == (0, 1500, 0, 0)
+    assert caixa.hora_fechamento is None
+    assert caixa.observacoes is None
+
+
+@pytest.mark.parametrize("tabela", sorted(COLUNAS_MONETARIAS))
+def test_todas_as_colunas_monetarias_zeradas(tabela):
+    linha = MODELOS[tabela].de_linha({'id': 1})
+    assert all(linha[coluna] == 0 for coluna in COLUNAS_MONETARIAS[tabela])
+
+
+def test_quantidade_e_marcacoes_nulas():
+    assert ItemEstoque.de_linha({'id': 1, 'quantidade': None}).quantidade == 0
+    assert Fornecedor.de_linha({'id': 1, 'pago': None}).pago is False
+    assert Investidor.de_linha({'id': 1, 'devolvido': None}).devolvido is False
+    assert Investidor.de_linha({'id': 1, 'devolvido': True}).devolvido is True
+
+
+def test_colunas_desconhecidas_ignoradas():
+    caixa = Caixa.de_linha({'id': 1, 'coluna_nova': 'x'})
+    assert 'coluna_nova' not in caixa
+    with pytest.raises(KeyError):
+        caixa['coluna_nova']
+
+
+def test_textos_repetidos_compartilhados():
+    primeira, segunda = modelar('caixa', [
+        {'id': 1, 'nome_funcionario': ''.join(['Ma', 'ria'])},
+        {'id': 2, 'nome_funcionario': ''.join(['Mar', 'ia'])}])
+    assert primeira.nome_funcionario is segunda.nome_funcionario
+
+
+def test_interface_de_dicionario():
+    caixa = Caixa.de_linha({'id': 7, 'dinheiro': 100})
+    assert caixa['dinheiro'] == caixa.get('dinheiro') == 100
+    assert caixa.get('inexistente', 'padrao') == 'padrao'
+    assert dict(caixa)['id'] == 7
+    assert list(caixa) == [campo.name for campo in dataclasses.fields(Caixa)]
+    assert pd.DataFrame([caixa]).loc[0, 'dinheiro'] == 100
+
+
+def test_somente_leitura():
+    caixa = Caixa.de_linha({'id': 1})
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        caixa.dinheiro = 10
+    assert not hasattr(caixa, '__dict__')
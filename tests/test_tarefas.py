@@ -0,0 +1,53 @@
+"""Fila de tarefas em segundo plano"""
+import threading
+import time
+
+from tarefas import enviar_tarefa, situacao_tarefas
+
+
+def _esperar(id_tarefa, limite=5):
+    fim = time.time() + limite
+    while time.time() < fim:
+        tarefa = situacao_tarefas([id_tarefa])[0]
+        if tarefa['concluida_em']:
+            return tarefa
+        time.sleep(0.01)
+    raise TimeoutError(id_tarefa)
+
+
+def test_tarefa_concluida_com_progresso():
+    liberar = threading.Event()
+
+    def gerar(progresso):
+        progresso(0.5, "Metade")
+        liberar.wait(5)
+        return "arquivo.csv", b"a;b\n"
+
+    id_tarefa = enviar_tarefa("Teste", gerar)
+    while situacao_tarefas([id_tarefa])[0]['etapa'] != "Metade":
+        time.sleep(0.01)
+    em_andamento = situacao_tarefas([id_tarefa])[0]
+    assert (em_andamento['situacao'], em_andamento['progresso']) == ('executando', 0.5)
+    liberar.set()
+
+    tarefa = _esperar(id_tarefa)
+    assert tarefa['situacao'] == 'concluída'
+    assert tarefa['progresso'] == 1.0
+    assert tarefa['arquivo'] == ("arquivo.csv", b"a;b\n")
+
+
+def test_tarefa_com_erro():
+    def falhar(progresso):
+        raise RuntimeError("sem conexão")
+
+    tarefa = _esperar(enviar_tarefa("Falha", falhar))
+    assert (tarefa['situacao'], tarefa['erro'], tarefa['arquivo']) == ('erro', "sem conexão", None)
+
+
+def test_copias_nao_mudam_depois_de_lidas():
+    liberar = threading.Event()
+    id_tarefa = enviar_tarefa("Cópia", lambda progresso: (liberar.wait(5), ("x.csv", b""))[1])
+    copia = situacao_tarefas([id_tarefa])[0]
+    liberar.set()
+    _esperar(id_tarefa)
+    assert copia['concluida_em'] is None
@@ -0,0 +1,71 @@
+"""Funções auxiliares sem dependências pesadas, usadas por todas as páginas"""
+import re
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from zoneinfo import ZoneInfo
+
+# --- Funções de horário de Brasília ---
+
+
+def obter_horario_brasilia():
+    """Retorna o horário atual no fuso de Brasília"""
+    return datetime.now(ZoneInfo("America/Sao_Paulo"))
+
+
+def formatar_hora_brasilia(dt=None):
+    """Formata datetime para string no formato HH:MM:SS"""
+    if dt is None:
+        dt = obter_horario_brasilia()
+    return dt.strftime("%H:%M:%S")
+
+# --- Funções auxiliares ---
+
+
+def formatar_moeda(centavos):
+    """Formata um valor em centavos como R$ 1.234,56"""
+    sinal = "-" if centavos < 0 else ""
+    reais, resto = divmod(abs(int(centavos)), 100)
+    return f"R$ {sinal}{reais:,}".replace(",", ".") + f",{resto:02d}"
+
+# --- Valores monetários em centavos ---
+# Todo valor em dinheiro é um inteiro de centavos, do banco aos relatórios;
+# a conversão para reais só acontece na digitação e na exibição.
+
+
+def reais_para_centavos(valor):
+    """Converte reais (número, Decimal ou texto com ponto decimal) em centavos"""
+    return int((Decimal(str(valor)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def centavos_para_reais(centavos):
+    """Valor em reais para widgets numéricos (st.number_input)"""
+    return (centavos or 0) / 100
+
+
+def texto_para_centavos(texto):
+    """
+    Interpreta um valor digitado (1.234,56 / 1234,56 / 1234.56 / R$ 10) em centavos.
+    Retorna None se o texto não for um número.
+    """
+    limpo = re.sub(r'[^\d,.]', '', str(texto))
+    if not limpo:
+        return None
+    if ',' in limpo and '.' in limpo:
+        limpo = limpo.replace('.', '').replace(',', '.')
+    elif ',' in limpo:
+        limpo = limpo.replace(',', '.')
+    try:
+        return reais_para_centavos(limpo)
+    except InvalidOperation:
+        return None
+
+
+ORIGENS_PAGAMENTO = ["Dinheiro", "Maquineta",
+                     "Conta Bancária", "Transferência", "Outro"]
+
+# --- Nomes de produtos ---
+
+
+def chave_produto(nome):
+    """Chave de comparação do nome: espaços extras removidos e minúsculas"""
+    return " ".join(str(nome).split()).lower()